@@ -62,6 +62,9 @@ class DeveloperProfile(models.Model):
     # Past projects for ML matching
     past_projects = models.JSONField(default=list, blank=True)
     
+    # Version of the profile for cached match results
+    updated_at = models.DateTimeField(auto_now=True)
+    
     def __str__(self):
         return f"{self.user.get_full_name()} - {self.title}"
 
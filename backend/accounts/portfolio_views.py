@@ -5,6 +5,7 @@ Portfolio API views for developer portfolio projects.
 from django.http import JsonResponse
 from django.views.decorators.csrf import csrf_exempt
 import json
+from projects.apply_scoring import notify_developer_changed
 from .supabase_client import get_supabase_client
 
 
@@ -90,6 +91,8 @@ def create_portfolio_project(request):
         result = supabase.table('portfolio_projects').insert(project_data).execute()
         
         if result.data:
+            # Portfolio descriptions feed the developer's application scores
+            notify_developer_changed(developer_id)
             return JsonResponse({
                 'message': 'Portfolio project created successfully',
                 'project': result.data[0]
@@ -127,7 +130,7 @@ def update_portfolio_project(request, project_id):
         developer_id = user_response.user.id
         
         # Verify ownership
-        project_result = supabase.table('portfolio_projects').select('developer_id').eq(
+        project_result = supabase.table('portfolio_projects').select('developer_id,description').eq(
             'id', project_id
         ).execute()
         
@@ -154,6 +157,8 @@ def update_portfolio_project(request, project_id):
         ).execute()
         
         if result.data:
+            if update_data.get('description', project_result.data[0]['description']) != project_result.data[0]['description']:
+                notify_developer_changed(developer_id)
             return JsonResponse({
                 'message': 'Portfolio project updated successfully',
                 'project': result.data[0]
@@ -198,6 +203,7 @@ def delete_portfolio_project(request, project_id):
         
         # Delete project
         supabase.table('portfolio_projects').delete().eq('id', project_id).execute()
+        notify_developer_changed(developer_id)
         
         return JsonResponse({'message': 'Portfolio project deleted successfully'})
     
@@ -17,6 +17,7 @@ urlpatterns = [
     path('company/projects/<str:project_id>/applications/', views.get_project_applications, name='get_project_applications'),
     path('projects/<str:project_id>/apply/', views.apply_to_project, name='apply_to_project'),
     path('developers/', views.get_developers, name='get_developers'),
+    path('developers/search/', views.search_developers, name='search_developers'),
     path('developer/<str:developer_email>/profile/', views.get_developer_profile, name='get_developer_profile'),
     
     # Portfolio endpoints
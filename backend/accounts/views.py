@@ -4,6 +4,11 @@ from django.views.decorators.csrf import csrf_exempt
 from django.views.decorators.http import require_http_methods
 import json
 from datetime import datetime
+
+import numpy as np
+
+from projects.apply_scoring import enqueue_application_scoring, notify_project_changed
+from projects.skills import parse_skill_filter, skill_filter_mask, skill_vocabulary
 from .supabase_client import get_supabase_client
 from .supabase_service import SupabaseService
 
@@ -55,6 +60,12 @@ def register_developer(request):
                 }
                 
                 supabase.table('developer_profiles').insert(profile_data).execute()
+
+                try:
+                    from projects.developer_index import get_developer_index
+                    get_developer_index().upsert_profiles([profile_data])
+                except Exception as e:
+                    print(f"⚠ Could not index developer {auth_response.user.id}: {e}")
                 
                 return JsonResponse({
                     'message': 'Developer registered successfully',
@@ -249,8 +260,24 @@ def get_user_profile(request):
     
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
+def _get_browsing_developer_profile(request, supabase):
+    """Developer profile of the caller when a developer token is sent, else None."""
+    auth_header = request.headers.get('Authorization')
+    if not auth_header:
+        return None
+    try:
+        user_response = supabase.auth.get_user(auth_header.replace('Bearer ', ''))
+    except Exception as e:
+        print(f"Ignoring invalid browse token: {e}")
+        return None
+    if not user_response.user or (user_response.user.user_metadata or {}).get('user_type') != 'developer':
+        return None
+    profile_response = supabase.table('developer_profiles').select('*').eq('user_id', user_response.user.id).execute()
+    return profile_response.data[0] if profile_response.data else None
+
 @csrf_exempt
 def get_projects(request):
+    """List open projects; with a developer token they are sorted by personalised fit."""
     if request.method == 'GET':
         try:
             supabase = get_supabase_client()
@@ -265,17 +292,47 @@ def get_projects(request):
             
             # Filter for open projects
             projects = [p for p in all_projects if p.get('status') in ['open', 'active', 'published']]
+            open_project_ids = [p['id'] for p in projects]
+
+            # Optional ?skills=react,django&match=any|all filter on tech_stack
+            skill_filter = parse_skill_filter(request.GET.get('skills'))
+            if skill_filter:
+                mask = skill_filter_mask(
+                    [skill_vocabulary.project_skills(p.get('tech_stack')) for p in projects],
+                    skill_filter, request.GET.get('match', 'any'),
+                )
+                projects = [p for p, keep in zip(projects, mask) if keep]
+
+            fit_scores = None
+            developer_profile = _get_browsing_developer_profile(request, supabase)
+            if developer_profile and projects:
+                try:
+                    from projects.project_fit import get_project_fit_index
+                    fit_index = get_project_fit_index()
+                    # Every open project, not just this page's skill matches, stays indexed
+                    fit_index.retain(open_project_ids)
+                    fit_scores = fit_index.score(developer_profile, projects)
+                    order = np.argsort(-fit_scores, kind='stable')
+                    projects = [projects[i] for i in order]
+                    fit_scores = fit_scores[order]
+                except Exception as e:
+                    print(f"⚠ Personalised ranking unavailable: {e}")
+                    fit_scores = None
             
             projects_data = []
-            for project in projects:
-                # Get company info
-                try:
-                    company_response = supabase.auth.admin.get_user_by_id(project['company_id'])
-                    company_name = "Company"
-                    if company_response.user and company_response.user.user_metadata:
-                        company_name = company_response.user.user_metadata.get('first_name', 'Company')
-                except:
-                    company_name = "Company"
+            company_names = {}
+            for i, project in enumerate(projects):
+                # Get company info (once per company)
+                company_name = company_names.get(project['company_id'])
+                if company_name is None:
+                    try:
+                        company_response = supabase.auth.admin.get_user_by_id(project['company_id'])
+                        company_name = "Company"
+                        if company_response.user and company_response.user.user_metadata:
+                            company_name = company_response.user.user_metadata.get('first_name', 'Company')
+                    except:
+                        company_name = "Company"
+                    company_names[project['company_id']] = company_name
                 
                 projects_data.append({
                     'id': project['id'],
@@ -290,9 +347,11 @@ def get_projects(request):
                     'created_at': project['created_at'],
                     'company': company_name
                 })
+                if fit_scores is not None:
+                    projects_data[-1]['fit_score'] = round(float(fit_scores[i]), 1)
             
             print(f"Returning {len(projects_data)} visible projects from Supabase")
-            return JsonResponse({'projects': projects_data})
+            return JsonResponse({'projects': projects_data, 'personalised': fit_scores is not None})
         except Exception as e:
             print(f"Get projects error: {str(e)}")
             import traceback
@@ -435,6 +494,7 @@ def edit_project(request, project_id):
             # Remove None values
             update_data = {k: v for k, v in update_data.items() if v is not None}
             
+            previous_response = supabase.table('projects').select('*').eq('id', project_id).execute()
             response = supabase.table('projects').update(update_data).eq('id', project_id).eq('company_id', user_response.user.id).execute()
             
             if not response.data:
@@ -442,6 +502,11 @@ def edit_project(request, project_id):
             
             project = response.data[0]
             
+            # Re-score this project's applications if a scoring input changed
+            notify_project_changed(
+                project['id'], project, previous_response.data[0] if previous_response.data else None
+            )
+            
             return JsonResponse({
                 'message': 'Project updated successfully',
                 'project': {
@@ -509,27 +574,16 @@ def apply_to_project(request, project_id):
             
             application = app_response.data[0]
             
-            # Set basic ML scores
-            match_score = 75  # Default score
-            skill_match = 80
-            experience_fit = 70
-            portfolio_quality = 75
-            
-            # Update application with scores
-            supabase.table('project_applications').update({
-                'match_score': match_score,
-                'skill_match_score': skill_match,
-                'experience_fit_score': experience_fit,
-                'portfolio_quality_score': portfolio_quality,
-                'ai_reasoning': f"Overall match: {match_score}%. Good skill alignment and experience fit."
-            }).eq('id', application['id']).execute()
+            # Scores are computed off the request path and written back to the row
+            enqueue_application_scoring(application, project_response.data[0])
             
             return JsonResponse({
                 'message': 'Application submitted successfully',
                 'application': {
                     'id': application['id'],
                     'project_id': project_id,
-                    'match_score': match_score,
+                    'match_score': None,
+                    'scoring_status': 'pending',
                     'status': application['status'],
                     'applied_at': application['applied_at']
                 }
@@ -631,8 +685,10 @@ def get_project_applications(request, project_id):
                     print(f"Error processing application {app.get('id')}: {e}")
                     continue
             
-            # Sort by match score descending
-            applications_data.sort(key=lambda x: x.get('match_score', 0), reverse=True)
+            # Sort by stored match score descending; applications still being scored go last
+            applications_data.sort(
+                key=lambda x: x['match_score'] if x['match_score'] is not None else -1, reverse=True
+            )
             
             return JsonResponse({'applications': applications_data})
             
@@ -653,6 +709,15 @@ def get_developers(request):
             # Get all developer profiles from Supabase
             profiles_response = supabase.table('developer_profiles').select('*').execute()
             profiles = profiles_response.data if profiles_response.data else []
+
+            # Optional ?skills=react,django&match=any|all filter, applied before user lookups
+            skill_filter = parse_skill_filter(request.GET.get('skills'))
+            if skill_filter:
+                mask = skill_filter_mask(
+                    [skill_vocabulary.developer_skills(p.get('skills')) for p in profiles],
+                    skill_filter, request.GET.get('match', 'any'),
+                )
+                profiles = [p for p, keep in zip(profiles, mask) if keep]
             
             developers_data = []
             for profile in profiles:
@@ -688,6 +753,88 @@ def get_developers(request):
     
     return JsonResponse({'error': 'Method not allowed'}, status=405)
 
+@csrf_exempt
+def search_developers(request):
+    """
+    Semantic talent search: top-k developers for a project or a free-text query.
+
+    Query params: ``project_id`` or ``q``, and optional ``k`` (default 20, max 100).
+    """
+    if request.method == 'GET':
+        try:
+            from projects.developer_index import get_developer_index
+
+            query = request.GET.get('q', '').strip()
+            project_id = request.GET.get('project_id')
+            try:
+                k = min(max(int(request.GET.get('k', 20)), 1), 100)
+            except ValueError:
+                return JsonResponse({'error': 'k must be an integer'}, status=400)
+
+            if not query and not project_id:
+                return JsonResponse({'error': 'Provide project_id or q'}, status=400)
+
+            supabase = get_supabase_client()
+            index = get_developer_index()
+
+            if project_id:
+                project_response = supabase.table('projects').select('*').eq('id', project_id).execute()
+                if not project_response.data:
+                    return JsonResponse({'error': 'Project not found'}, status=404)
+                hits = index.search_project(project_response.data[0], k=k)
+            else:
+                hits = index.search_text(query, k=k)
+
+            if not hits:
+                return JsonResponse({'developers': []})
+
+            profiles_response = supabase.table('developer_profiles').select('*').in_(
+                'user_id', [user_id for user_id, _ in hits]
+            ).execute()
+            profiles = {str(p['user_id']): p for p in (profiles_response.data or [])}
+
+            developers_data = []
+            for user_id, similarity in hits:
+                profile = profiles.get(user_id)
+                if not profile:
+                    # Deleted since it was indexed
+                    continue
+                name, email, location = 'Developer', None, ''
+                try:
+                    user_response = supabase.auth.admin.get_user_by_id(user_id)
+                    if user_response.user:
+                        user_meta = user_response.user.user_metadata or {}
+                        name = f"{user_meta.get('first_name', '')} {user_meta.get('last_name', '')}".strip() or name
+                        email = user_response.user.email
+                        location = f"{user_meta.get('city', '')}, {user_meta.get('country', '')}".strip(', ')
+                except Exception as e:
+                    print(f"Error loading user {user_id}: {e}")
+
+                developers_data.append({
+                    'id': user_id,
+                    'name': name,
+                    'email': email,
+                    'title': profile.get('title', 'Developer'),
+                    'skills': profile.get('skills', '').split(',') if profile.get('skills') else [],
+                    'experience': profile.get('experience', 'entry'),
+                    'years_experience': profile.get('years_experience', 0),
+                    'hourly_rate': float(profile.get('hourly_rate') or 0),
+                    'rating': float(profile.get('rating') or 0),
+                    'location': location,
+                    'availability': profile.get('availability', 'available'),
+                    'similarity': round(similarity, 4),
+                })
+
+            return JsonResponse({'developers': developers_data})
+
+        except Exception as e:
+            print(f"Search developers error: {str(e)}")
+            import traceback
+            traceback.print_exc()
+            return JsonResponse({'developers': [], 'error': str(e)}, status=500)
+
+    return JsonResponse({'error': 'Method not allowed'}, status=405)
+
 @csrf_exempt
 def get_developer_profile(request, developer_email):
     """Get developer profile by email"""
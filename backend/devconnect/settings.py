@@ -94,4 +94,68 @@ CORS_ALLOW_CREDENTIALS = True
 # Supabase Configuration
 SUPABASE_URL = os.getenv('SUPABASE_URL')
 SUPABASE_KEY = os.getenv('SUPABASE_KEY')
-SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
\ No newline at end of file
+SUPABASE_SERVICE_ROLE_KEY = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+
+# ML Matcher
+# Embedding cache: in-process LRU budget (MB) and SQLite file that survives restarts.
+# Set MATCHER_EMBEDDING_CACHE_PATH to an empty string to disable the disk tier.
+MATCHER_EMBEDDING_CACHE_MB = int(os.getenv('MATCHER_EMBEDDING_CACHE_MB', '256'))
+MATCHER_EMBEDDING_CACHE_PATH = os.getenv(
+    'MATCHER_EMBEDDING_CACHE_PATH',
+    str(BASE_DIR / 'ml_models' / 'embedding_cache.sqlite3'),
+)
+# Texts per SentenceTransformer.encode() call when embedding cache misses
+MATCHER_ENCODE_BATCH_SIZE = int(os.getenv('MATCHER_ENCODE_BATCH_SIZE', '64'))
+# Padded tokens (texts x longest text) per encoding batch; texts are bucketed by token length under it
+MATCHER_ENCODE_TOKEN_BUDGET = int(os.getenv('MATCHER_ENCODE_TOKEN_BUDGET', '8192'))
+# How long (ms) an encode call waits for concurrent requests to share its batch of up to
+# MATCHER_ENCODE_BATCH_SIZE texts (0 encodes every call on its own)
+MATCHER_ENCODE_COALESCE_MS = float(os.getenv('MATCHER_ENCODE_COALESCE_MS', '2'))
+# Developers whose past-project text is kept in memory per worker; entries are
+# re-checked against a DB freshness stamp (selected applications) on every use
+MATCHER_PAST_PROJECTS_CACHE_SIZE = int(os.getenv('MATCHER_PAST_PROJECTS_CACHE_SIZE', '10000'))
+# Rankings and match analyses kept per worker, reused while their inputs are unchanged (0 disables)
+MATCHER_RESULT_CACHE_SIZE = int(os.getenv('MATCHER_RESULT_CACHE_SIZE', '512'))
+# Persisted ANN index of developer profiles used by talent search
+MATCHER_DEVELOPER_INDEX_PATH = os.getenv(
+    'MATCHER_DEVELOPER_INDEX_PATH',
+    str(BASE_DIR / 'ml_models' / 'developer_index.npz'),
+)
+# Load the matcher in a background thread when a server process starts;
+# /ready/ answers 503 until it has finished
+MATCHER_WARMUP = os.getenv('MATCHER_WARMUP', 'True').lower() == 'true'
+# Embedding backend: 'torch' (SentenceTransformer) or 'onnx' (int8 export made by
+# "manage.py export_onnx_embedder"; falls back to torch if it is missing)
+MATCHER_EMBEDDING_BACKEND = os.getenv('MATCHER_EMBEDDING_BACKEND', 'torch')
+MATCHER_ONNX_DIR = os.getenv('MATCHER_ONNX_DIR', str(BASE_DIR / 'ml_models' / 'onnx'))
+# onnxruntime intra-op threads per worker (0 lets onnxruntime decide)
+MATCHER_ONNX_THREADS = int(os.getenv('MATCHER_ONNX_THREADS', '0'))
+# Unix socket of "manage.py run_embedding_server"; when set, workers encode through
+# the shared sidecar and only load the model themselves if it is unreachable
+MATCHER_EMBEDDING_SOCKET = os.getenv('MATCHER_EMBEDDING_SOCKET', '')
+MATCHER_EMBEDDING_TIMEOUT = float(os.getenv('MATCHER_EMBEDDING_TIMEOUT', '10'))
+# Build the matcher in the WSGI/ASGI master before forking workers (gunicorn
+# preload_app) so model weights are shared copy-on-write; replaces the warm-up thread
+MATCHER_PRELOAD = os.getenv('MATCHER_PRELOAD', 'False').lower() == 'true'
+# Versioned model registry written by "manage.py publish_models"; workers re-read
+# its CURRENT pointer every MATCHER_MODEL_POLL_SECONDS (0 disables hot reload)
+# and fall back to the plain pickles in ml_models/ while it is empty
+MATCHER_MODEL_REGISTRY = os.getenv('MATCHER_MODEL_REGISTRY', str(BASE_DIR / 'ml_models' / 'registry'))
+MATCHER_MODEL_POLL_SECONDS = float(os.getenv('MATCHER_MODEL_POLL_SECONDS', '30'))
+# Processes that score projects in parallel for batch ranking ("manage.py rank_projects",
+# projects.utils.batch_rank_projects); 0 uses every available CPU
+MATCHER_RANKING_WORKERS = int(os.getenv('MATCHER_RANKING_WORKERS', '0'))
+# Log level of the matcher; DEBUG prints per-applicant scores and tracebacks.
+# Stage timings are served in Prometheus format at /metrics/ regardless.
+MATCHER_LOG_LEVEL = os.getenv('MATCHER_LOG_LEVEL', 'WARNING').upper()
+
+LOGGING = {
+    'version': 1,
+    'disable_existing_loggers': False,
+    'handlers': {
+        'console': {'class': 'logging.StreamHandler'},
+    },
+    'loggers': {
+        'projects': {'handlers': ['console'], 'level': MATCHER_LOG_LEVEL},
+    },
+}
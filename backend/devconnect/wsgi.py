@@ -14,3 +14,11 @@ from django.core.wsgi import get_wsgi_application
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'devconnect.settings')
 
 application = get_wsgi_application()
+
+# Load the matcher in the server master so forked workers share it copy-on-write
+# (MATCHER_PRELOAD=true with gunicorn's preload_app; see gunicorn.conf.py)
+from django.conf import settings  # noqa: E402
+
+if settings.MATCHER_PRELOAD:
+    from projects.matcher import preload_matcher
+    preload_matcher()
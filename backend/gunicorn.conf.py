@@ -0,0 +1,35 @@
+"""
+Gunicorn configuration for the DevConnect backend.
+
+    MATCHER_PRELOAD=true gunicorn devconnect.wsgi
+
+With MATCHER_PRELOAD=true the master imports devconnect.wsgi (preload_app),
+which loads the matcher's GB/RF models, scaler and embedder weights once with
+GC disabled and freezes them with gc.freeze(); every forked worker then
+shares those pages copy-on-write instead of loading its own copy, and
+re-enables GC in post_fork. Measure the effect with
+scripts/measure_worker_memory.py.
+"""
+
+import gc
+import multiprocessing
+import os
+import sys
+
+bind = os.getenv('GUNICORN_BIND', '0.0.0.0:8000')
+workers = int(os.getenv('GUNICORN_WORKERS', multiprocessing.cpu_count() * 2 + 1))
+timeout = int(os.getenv('GUNICORN_TIMEOUT', '120'))
+preload_app = os.getenv('MATCHER_PRELOAD', 'False').lower() == 'true'
+
+# Recycle workers now and then; preloaded pages stay shared across restarts
+max_requests = int(os.getenv('GUNICORN_MAX_REQUESTS', '2000'))
+max_requests_jitter = 200
+
+
+def post_fork(server, worker):
+    # The preloading master loads with GC off; collect normally from here on
+    gc.enable()
+    # One torch thread per worker: N workers x all-cores thread pools oversubscribe the CPU
+    torch = sys.modules.get('torch')
+    if torch is not None:
+        torch.set_num_threads(int(os.getenv('MATCHER_TORCH_THREADS', '1')))
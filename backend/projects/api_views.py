@@ -2,6 +2,10 @@
 REST API views for project management and freelancer matching.
 """
 
+import base64
+import binascii
+import json
+
 from rest_framework import viewsets, status
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -13,6 +17,31 @@ from projects.serializers import ProjectSerializer, ProjectApplicationSerializer
 from projects.matcher import get_matcher
 
 
+# Page size bounds for ranked_freelancers
+DEFAULT_RANKING_LIMIT = 5
+MAX_RANKING_LIMIT = 100
+# Applications per bulk_match_analysis request
+MAX_BULK_ANALYSIS = 200
+
+
+def encode_ranking_cursor(offset: int, version: str) -> str:
+    """Opaque cursor for the ranking page starting at ``offset``."""
+    payload = json.dumps({'o': offset, 'v': version[:12]}, separators=(',', ':')).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip('=')
+
+
+def decode_ranking_cursor(cursor: str):
+    """Return ``(offset, version prefix)``; raises ValueError for a malformed cursor."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+        offset, version = int(payload['o']), str(payload['v'])
+    except (binascii.Error, json.JSONDecodeError, UnicodeDecodeError, KeyError, TypeError, ValueError):
+        raise ValueError('Invalid cursor')
+    if offset < 0:
+        raise ValueError('Invalid cursor')
+    return offset, version
+
+
 class ProjectViewSet(viewsets.ModelViewSet):
     """
     ViewSet for Project management.
@@ -38,7 +67,7 @@ class ProjectViewSet(viewsets.ModelViewSet):
     @action(detail=True, methods=['get'])
     def ranked_freelancers(self, request, pk=None):
         """
-        Get top 5 ranked freelancers for a project.
+        Get a page of ranked freelancers for a project.
         
         Uses ML model to rank applicants based on:
         - Skill match
@@ -46,6 +75,10 @@ class ProjectViewSet(viewsets.ModelViewSet):
         - Portfolio quality
         - Proposal quality
         - Rate fit
+        
+        Query params:
+        - limit: page size (default 5, at most 100)
+        - cursor: ``next_cursor`` from the previous page
         """
         project = self.get_object()
         
@@ -56,15 +89,33 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_403_FORBIDDEN
             )
         
+        try:
+            limit = int(request.query_params.get('limit', DEFAULT_RANKING_LIMIT))
+            offset, cursor_version = 0, None
+            if request.query_params.get('cursor'):
+                offset, cursor_version = decode_ranking_cursor(request.query_params['cursor'])
+        except ValueError:
+            return Response(
+                {'error': 'limit must be an integer and cursor must come from a previous page'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        limit = max(1, min(limit, MAX_RANKING_LIMIT))
+        
         try:
             matcher = get_matcher()
-            ranked = matcher.rank_freelancers(project, top_n=5)
+            page = matcher.rank_freelancers_page(project, limit=limit, offset=offset)
+            next_offset = offset + len(page['results'])
             
             return Response({
                 'project_id': project.id,
                 'project_title': project.title,
                 'total_applications': project.applications_count,
-                'ranked_freelancers': ranked,
+                'total_ranked': page['total'],
+                'ranked_freelancers': page['results'],
+                'next_cursor': (encode_ranking_cursor(next_offset, page['version'])
+                                if next_offset < page['total'] else None),
+                # Applications changed since the cursor was issued; positions may have shifted
+                'ranking_changed': cursor_version is not None and not page['version'].startswith(cursor_version),
             })
         except Exception as e:
             return Response(
@@ -123,6 +174,60 @@ class ProjectViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
     
+    @action(detail=True, methods=['post'])
+    def bulk_match_analysis(self, request, pk=None):
+        """
+        Match analysis for many applications to this project in one pass.
+        
+        Request body:
+        {
+            "application_ids": [5, 8, 13]
+        }
+        """
+        project = self.get_object()
+        
+        if project.company != request.user:
+            return Response(
+                {'error': 'You do not have permission to view this project\'s applications'},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        application_ids = request.data.get('application_ids')
+        if not isinstance(application_ids, list) or not application_ids:
+            return Response(
+                {'error': 'application_ids must be a non-empty list'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        try:
+            application_ids = list(dict.fromkeys(int(application_id) for application_id in application_ids))
+        except (TypeError, ValueError):
+            return Response(
+                {'error': 'application_ids must be integers'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if len(application_ids) > MAX_BULK_ANALYSIS:
+            return Response(
+                {'error': f'At most {MAX_BULK_ANALYSIS} application_ids per request'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        try:
+            analyses = get_matcher().get_match_details_bulk(project, application_ids)
+        except Exception as e:
+            return Response(
+                {'error': f'Error analyzing matches: {str(e)}'},
+                status=status.HTTP_500_INTERNAL_SERVER_ERROR
+            )
+        
+        return Response({
+            'project_id': project.id,
+            'results': [
+                dict(analyses[application_id], application_id=application_id)
+                for application_id in application_ids if application_id in analyses
+            ],
+            'not_found': [application_id for application_id in application_ids if application_id not in analyses],
+        })
+    
     @action(detail=True, methods=['post'])
     def shortlist_freelancer(self, request, pk=None):
         """
@@ -0,0 +1,407 @@
+"""
+Background scoring of applications stored in Supabase.
+
+``apply_to_project`` inserts the application and returns straight away;
+``enqueue_application_scoring`` hands the new row to a background worker
+thread that loads the project, developer profile and past work, scores the
+pair with ``FreelancerMatcher`` and writes the scores back in one update.
+Reading applications never runs the model: ``get_project_applications``
+sorts on the stored ``match_score``. Applications with ``manual_override``
+set keep the score the company gave them.
+
+Stored scores go stale when their inputs change. Views that edit a project
+(``notify_project_changed``) or a developer's profile or past work
+(``notify_developer_changed``) tell the same worker, which re-scores only
+the applications depending on it, one batch per project, and refreshes a
+changed developer's entry in the talent-search index. Project edits that
+leave every scoring input unchanged (e.g. a new timeline) are dropped by
+fingerprint, and the content-addressed embedding cache means only texts
+that actually changed are re-encoded.
+
+Jobs live in process memory, so applications whose worker died before
+finishing keep a null ``match_score``; ``python manage.py
+score_applications`` backfills them.
+"""
+
+import json
+import logging
+import os
+import queue
+import threading
+from collections import defaultdict
+from types import SimpleNamespace
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from projects.developer_index import text_fingerprint
+from projects.scoring import COMPONENT_NAMES
+
+
+logger = logging.getLogger(__name__)
+
+
+# Past work considered for the portfolio similarity, like the ORM path
+PAST_PROJECTS_LIMIT = 10
+
+# Applications whose scores are kept current; decided ones keep their last score
+RESCORED_STATUSES = ['pending', 'shortlisted']
+
+COMPONENT_LABELS = {
+    'skill_match': 'skill match',
+    'experience_fit': 'experience fit',
+    'portfolio_quality': 'portfolio quality',
+    'proposal_quality': 'proposal quality',
+    'rate_fit': 'rate fit',
+}
+
+
+def _number(value) -> Optional[float]:
+    # PostgREST may return DECIMAL columns as strings ("0.00" would otherwise be truthy)
+    return float(value) if value not in (None, '') else None
+
+
+def project_record(row: Dict) -> SimpleNamespace:
+    """Attribute view of a Supabase ``projects`` row, as scoring expects from ``Project``."""
+    tech_stack = row.get('tech_stack')
+    return SimpleNamespace(
+        title=row.get('title') or '',
+        description=row.get('description') or '',
+        tech_stack=tech_stack if isinstance(tech_stack, list) else [],
+        budget_min=_number(row.get('budget_min')),
+        budget_max=_number(row.get('budget_max')),
+    )
+
+
+def developer_record(row: Dict) -> SimpleNamespace:
+    """Attribute view of a Supabase ``developer_profiles`` row."""
+    skills = row.get('skills') or ''
+    return SimpleNamespace(
+        user_id=row.get('user_id'),
+        title=row.get('title') or '',
+        bio=row.get('bio') or '',
+        skills=','.join(skills) if isinstance(skills, list) else skills,
+        years_experience=row.get('years_experience') or 0,
+        rating=_number(row.get('rating')) or 0,
+        success_rate=_number(row.get('success_rate')) or 0,
+        total_projects=row.get('total_projects') or 0,
+    )
+
+
+def application_record(row: Dict) -> SimpleNamespace:
+    """Attribute view of a Supabase ``project_applications`` row."""
+    return SimpleNamespace(
+        cover_letter=row.get('cover_letter') or '',
+        proposed_rate=_number(row.get('proposed_rate')),
+    )
+
+
+def project_fingerprint(row: Dict) -> str:
+    """Fingerprint of the ``projects`` columns that scoring reads."""
+    record = project_record(row)
+    return text_fingerprint(json.dumps(
+        [record.title, record.description, record.tech_stack, record.budget_min, record.budget_max]
+    ))
+
+
+def fetch_past_projects_texts(supabase, developer_ids: Iterable[str]) -> Dict[str, str]:
+    """
+    Descriptions of each developer's past work: projects they were selected
+    for, then their portfolio, up to ``PAST_PROJECTS_LIMIT`` each. Three
+    queries however many developers are asked for.
+    """
+    developer_ids = list(dict.fromkeys(developer_ids))
+    descriptions: Dict[str, List[str]] = {developer_id: [] for developer_id in developer_ids}
+    if not developer_ids:
+        return {}
+
+    selected = supabase.table('project_applications').select('developer_id,project_id').in_(
+        'developer_id', developer_ids
+    ).eq('status', 'selected').execute().data or []
+    if selected:
+        project_ids = list({row['project_id'] for row in selected})
+        projects = supabase.table('projects').select('id,description').in_('id', project_ids).execute()
+        project_descriptions = {row['id']: row.get('description') or '' for row in projects.data or []}
+        for row in selected:
+            descriptions[row['developer_id']].append(project_descriptions.get(row['project_id'], ''))
+
+    portfolio = supabase.table('portfolio_projects').select('developer_id,description').in_(
+        'developer_id', developer_ids
+    ).order('created_at', desc=True).execute()
+    for row in portfolio.data or []:
+        descriptions[row['developer_id']].append(row.get('description') or '')
+
+    return {
+        developer_id: ' '.join(text for text in texts[:PAST_PROJECTS_LIMIT] if text)
+        for developer_id, texts in descriptions.items()
+    }
+
+
+def ai_reasoning(result: Dict) -> str:
+    """One-paragraph explanation of a score for the company reviewing applications."""
+    components = result['component_scores']
+    ranked = sorted(COMPONENT_NAMES, key=lambda name: -components[name])
+    parts = [
+        f"Overall match: {result['overall_score']}%.",
+        f"Strongest: {COMPONENT_LABELS[ranked[0]]} ({components[ranked[0]]:.0f}%); "
+        f"weakest: {COMPONENT_LABELS[ranked[-1]]} ({components[ranked[-1]]:.0f}%).",
+    ]
+    if result['matching_skills']:
+        parts.append(f"Matches {', '.join(result['matching_skills'])}.")
+    if result['missing_skills']:
+        parts.append(f"Missing {', '.join(result['missing_skills'])}.")
+    return ' '.join(parts)
+
+
+def score_update(result: Dict) -> Dict:
+    """``project_applications`` columns written for a scored application."""
+    components = result['component_scores']
+    return {
+        'match_score': result['overall_score'],
+        'skill_match_score': round(components['skill_match']),
+        'experience_fit_score': round(components['experience_fit']),
+        'portfolio_quality_score': round(components['portfolio_quality']),
+        'matching_skills': result['matching_skills'],
+        'missing_skills': result['missing_skills'],
+        'ai_reasoning': ai_reasoning(result),
+    }
+
+
+class ScoringInputs:
+    """Supabase rows needed to score a batch of applications, each fetched once."""
+
+    def __init__(self, supabase):
+        self.supabase = supabase
+        self.projects: Dict[str, Optional[Dict]] = {}
+        self.profiles: Dict[str, Optional[Dict]] = {}
+        self.past_projects: Dict[str, str] = {}
+
+    def project(self, project_id: str) -> Optional[Dict]:
+        if project_id not in self.projects:
+            response = self.supabase.table('projects').select('*').eq('id', project_id).execute()
+            self.projects[project_id] = response.data[0] if response.data else None
+        return self.projects[project_id]
+
+    def load_developers(self, developer_ids: Iterable[str]):
+        missing = [developer_id for developer_id in dict.fromkeys(developer_ids) if developer_id not in self.profiles]
+        if not missing:
+            return
+        response = self.supabase.table('developer_profiles').select('*').in_('user_id', missing).execute()
+        found = {row['user_id']: row for row in response.data or []}
+        self.profiles.update({developer_id: found.get(developer_id) for developer_id in missing})
+        self.past_projects.update(fetch_past_projects_texts(self.supabase, missing))
+
+    def developer(self, developer_id: str) -> Tuple[Optional[Dict], str]:
+        self.load_developers([developer_id])
+        return self.profiles[developer_id], self.past_projects.get(developer_id, '')
+
+
+def dependent_applications(supabase, kind: str, key: str) -> List[Dict]:
+    """
+    Applications whose stored scores depend on project or developer ``key``.
+
+    Looked up in Supabase on every change rather than tracked in memory:
+    applications are created by whichever worker process served the request,
+    so no single process knows them all.
+    """
+    column = 'project_id' if kind == 'project' else 'developer_id'
+    response = supabase.table('project_applications').select('*').eq(column, key).in_(
+        'status', RESCORED_STATUSES
+    ).execute()
+    return [application for application in response.data or [] if not application.get('manual_override')]
+
+
+def score_applications(inputs: ScoringInputs, applications: Iterable[Dict], matcher=None) -> Dict[str, Dict]:
+    """
+    Score application rows and store the results, one matcher batch per project.
+
+    Returns the written columns by application id. Applications whose
+    project or developer profile no longer exists are skipped, and so are
+    those with ``manual_override`` set, whether when they were read or by
+    the time their score is written: a score the company chose by hand is
+    never replaced.
+    """
+    by_project: Dict[str, List[Dict]] = defaultdict(list)
+    for application in applications:
+        if application.get('manual_override'):
+            continue
+        by_project[application['project_id']].append(application)
+    if not by_project:
+        return {}
+
+    if matcher is None:
+        from projects.matcher import get_matcher
+        matcher = get_matcher()
+    inputs.load_developers(app['developer_id'] for apps in by_project.values() for app in apps)
+
+    updates = {}
+    for project_id, project_applications in by_project.items():
+        project = inputs.project(project_id)
+        if project is None:
+            continue
+        scored, candidates, past_projects_texts = [], [], []
+        for application in project_applications:
+            profile, past_projects_text = inputs.developer(application['developer_id'])
+            if profile is None:
+                logger.warning('No developer profile for application %s; leaving it unscored', application['id'])
+                continue
+            scored.append(application)
+            candidates.append((developer_record(profile), application_record(application)))
+            past_projects_texts.append(past_projects_text)
+
+        results = matcher.score_candidates(project_record(project), candidates, past_projects_texts)
+        for application, result in zip(scored, results):
+            update = score_update(result)
+            # The company may have overridden the score since the row was read
+            response = inputs.supabase.table('project_applications').update(update).eq(
+                'id', application['id']
+            ).eq('manual_override', False).execute()
+            if response.data:
+                updates[application['id']] = update
+    return updates
+
+
+class ApplicationScoringQueue:
+    """
+    Background worker for new applications and change notifications.
+
+    Jobs that pile up while a batch is being scored are handled together,
+    so a burst of edits re-scores each affected application once.
+    """
+
+    def __init__(self, supabase_factory=None, developer_index_factory=None):
+        self._supabase_factory = supabase_factory
+        self._developer_index_factory = developer_index_factory
+        self._jobs: 'queue.Queue[Dict]' = queue.Queue()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._thread_pid = None
+        self.scored = 0
+        self.failed = 0
+
+    def _supabase(self):
+        if self._supabase_factory is None:
+            from accounts.supabase_client import get_supabase_client
+            return get_supabase_client()
+        return self._supabase_factory()
+
+    def _developer_index(self):
+        if self._developer_index_factory is None:
+            from projects.developer_index import get_developer_index
+            return get_developer_index()
+        return self._developer_index_factory()
+
+    def _put(self, job: Dict):
+        # Threads don't survive fork: each worker process starts its own
+        with self._lock:
+            if self._thread is None or self._thread_pid != os.getpid() or not self._thread.is_alive():
+                self._jobs = queue.Queue()
+                self._thread = threading.Thread(target=self._run, name='application-scoring', daemon=True)
+                self._thread_pid = os.getpid()
+                self._thread.start()
+            self._jobs.put(job)
+
+    def enqueue(self, application: Dict, project: Optional[Dict] = None):
+        self._put({'kind': 'application', 'application': application, 'project': project})
+
+    def project_changed(self, project_id: str, project: Optional[Dict] = None):
+        self._put({'kind': 'project', 'key': project_id, 'project': project})
+
+    def developer_changed(self, developer_id: str):
+        self._put({'kind': 'developer', 'key': developer_id})
+
+    def pending(self) -> int:
+        return self._jobs.qsize()
+
+    def join(self):
+        """Block until every queued job has been processed."""
+        self._jobs.join()
+
+    def _run(self):
+        jobs = self._jobs
+        while True:
+            batch = [jobs.get()]
+            while True:
+                try:
+                    batch.append(jobs.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self.process(batch)
+            except Exception as e:
+                self.failed += len(batch)
+                logger.warning('Error scoring applications: %s', e)
+            finally:
+                for _ in batch:
+                    jobs.task_done()
+
+    def process(self, jobs: List[Dict]) -> Dict[str, Dict]:
+        """Score new applications and the dependents of changed projects/developers."""
+        inputs = ScoringInputs(self._supabase())
+        applications: Dict[str, Dict] = {}
+        for job in jobs:
+            if job['kind'] == 'application':
+                if job['project'] is not None:
+                    inputs.projects[job['application']['project_id']] = job['project']
+                applications[job['application']['id']] = job['application']
+            elif job['kind'] == 'project' and job['project'] is not None:
+                # Later notifications overwrite earlier ones, so the latest edit is scored
+                inputs.projects[job['key']] = job['project']
+
+        changed = dict.fromkeys((job['kind'], job['key']) for job in jobs if job['kind'] != 'application')
+        self.index_developers([key for kind, key in changed if kind == 'developer'], inputs)
+        for kind, key in changed:
+            for application in dependent_applications(inputs.supabase, kind, key):
+                applications.setdefault(application['id'], application)
+
+        updates = score_applications(inputs, applications.values())
+        self.scored += len(updates)
+        if updates:
+            logger.info('Scored %d application(s)', len(updates))
+        return updates
+
+    def index_developers(self, developer_ids: List[str], inputs: ScoringInputs):
+        """Bring changed developers' talent-search entries up to date; unchanged profiles aren't re-encoded."""
+        if not developer_ids:
+            return
+        inputs.load_developers(developer_ids)
+        profiles = [inputs.profiles[developer_id] for developer_id in developer_ids]
+        try:
+            index = self._developer_index()
+            index.upsert_profiles([profile for profile in profiles if profile is not None])
+            deleted = [developer_id for developer_id, profile in zip(developer_ids, profiles) if profile is None]
+            if deleted:
+                index.remove(deleted)
+        except Exception as e:
+            # Search staying stale must not hold up re-scoring
+            logger.warning('Could not index developers %s: %s', developer_ids, e)
+
+
+_scoring_queue = ApplicationScoringQueue()
+
+
+def enqueue_application_scoring(application: Dict, project: Optional[Dict] = None):
+    """Score a newly inserted application in the background."""
+    _scoring_queue.enqueue(application, project)
+
+
+def notify_project_changed(project_id: str, project: Optional[Dict] = None, previous: Optional[Dict] = None):
+    """
+    Re-score a project's applications in the background.
+
+    With both the ``previous`` and updated ``project`` rows, edits that
+    leave every scoring input unchanged are ignored.
+    """
+    if project is not None and previous is not None and project_fingerprint(project) == project_fingerprint(previous):
+        return
+    _scoring_queue.project_changed(project_id, project)
+
+
+def notify_developer_changed(developer_id: str):
+    """
+    Re-score a developer's applications and refresh their talent-search
+    index entry after their profile or past work changed.
+    """
+    _scoring_queue.developer_changed(developer_id)
+
+
+def get_scoring_queue() -> ApplicationScoringQueue:
+    return _scoring_queue
@@ -1,5 +1,36 @@
+import os
+import sys
+
 from django.apps import AppConfig
+from django.conf import settings
+
+
+# Process names of the WSGI/ASGI servers we deploy behind
+SERVER_PROCESSES = ('gunicorn', 'uvicorn', 'uwsgi', 'daphne', 'hypercorn')
+
+
+def _should_warm_up_matcher() -> bool:
+    """Warm the matcher in serving processes only, not in scripts or management commands."""
+    if not getattr(settings, 'MATCHER_WARMUP', True):
+        return False
+    if getattr(settings, 'MATCHER_PRELOAD', False):
+        # The WSGI/ASGI module loads it synchronously before the server forks
+        return False
+    program = os.path.basename(sys.argv[0]) if sys.argv else ''
+    if program.startswith(SERVER_PROCESSES):
+        return True
+    if program != 'manage.py' or len(sys.argv) < 2 or sys.argv[1] != 'runserver':
+        return False
+    # With the autoreloader, only the child process (RUN_MAIN set) serves requests
+    return '--noreload' in sys.argv or os.environ.get('RUN_MAIN') == 'true'
 
 
 class ProjectsConfig(AppConfig):
     name = 'projects'
+
+    def ready(self):
+        from projects import signals  # noqa: F401
+
+        if _should_warm_up_matcher():
+            from projects.matcher import start_matcher_warmup
+            start_matcher_warmup()
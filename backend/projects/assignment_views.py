@@ -8,6 +8,7 @@ from django.db import models
 from datetime import timedelta
 import json
 
+from .apply_scoring import notify_developer_changed
 from .supabase_service import ProjectSupabaseService
 from accounts.supabase_client import get_supabase_client
 
@@ -70,6 +71,8 @@ class ProjectAssignmentViewSet(viewsets.ViewSet):
             
             # Update application status
             self.supabase.table('project_applications').update({'status': 'selected'}).eq('id', application_id).execute()
+            # The project is now part of the developer's past work, which their other scores use
+            notify_developer_changed(developer_id)
             
             # Update project status
             self.supabase.table('projects').update({'status': 'in_progress'}).eq('id', project_id).execute()
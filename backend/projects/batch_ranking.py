@@ -0,0 +1,144 @@
+"""
+Parallel scoring of many projects over one shared embedding matrix.
+
+``FreelancerMatcher.rank_projects`` collects the distinct texts of every
+project in a batch (project texts, developer profiles, proposals, past
+projects), encodes each of them once and hands this module one
+``ProjectScoringTask`` per project: row indices into the embedding matrix
+plus the project's ``CandidateBatch``.
+
+``score_projects`` copies the matrix into a ``multiprocessing`` shared-memory
+block and fans the tasks out over a process pool; every worker maps the
+block instead of receiving its own copy, and gets the score predictor once
+at start-up. Workers are started with ``forkserver``, so they don't inherit
+the parent's threads (embedding coalescer, model reloader, torch pools).
+Small batches, or ``workers=1``, are scored in-process.
+
+This module imports no Django code, so pool workers start without loading
+the project.
+"""
+
+import multiprocessing
+import os
+from multiprocessing import shared_memory
+from typing import List, Optional, Tuple
+
+import numpy as np
+
+from projects.scoring import CandidateBatch, cosine_similarities, match_scores
+
+
+class ProjectScoringTask:
+    """
+    One project's candidates, as rows of the shared embedding matrix.
+
+    ``portfolio_rows`` is -1 for developers without past projects.
+    """
+
+    def __init__(self, project_row: int, developer_rows: np.ndarray, proposal_rows: np.ndarray,
+                 portfolio_rows: np.ndarray, batch: CandidateBatch):
+        self.project_row = project_row
+        self.developer_rows = np.asarray(developer_rows, dtype=np.intp)
+        self.proposal_rows = np.asarray(proposal_rows, dtype=np.intp)
+        self.portfolio_rows = np.asarray(portfolio_rows, dtype=np.intp)
+        self.batch = batch
+
+    def __len__(self) -> int:
+        return len(self.batch)
+
+
+# (overall scores, (N, 5) component matrix, prediction error or None)
+TaskResult = Tuple[np.ndarray, np.ndarray, Optional[str]]
+
+
+def score_task(embeddings: Optional[np.ndarray], task: ProjectScoringTask, predictor) -> TaskResult:
+    """
+    Score one project's candidates as ``FreelancerMatcher`` ranks them.
+    Without ``embeddings`` every similarity is the neutral 0.5.
+    """
+    n = len(task)
+    if embeddings is None:
+        similarities = np.full((n, 3), 0.5)
+    else:
+        project_vec = embeddings[task.project_row]
+        similarities = np.zeros((n, 3))
+        similarities[:, 0] = cosine_similarities(project_vec, embeddings[task.developer_rows])
+        similarities[:, 1] = cosine_similarities(project_vec, embeddings[task.proposal_rows])
+        has_portfolio = task.portfolio_rows >= 0
+        similarities[has_portfolio, 2] = cosine_similarities(
+            project_vec, embeddings[task.portfolio_rows[has_portfolio]]
+        )
+
+    components = task.batch.component_scores()
+    features = task.batch.feature_matrix(similarities)
+    try:
+        return match_scores(predictor, features, components), components, None
+    except Exception as e:
+        # As in a single ranking: fall back to the component scores
+        return match_scores(None, features, components), components, str(e)
+
+
+# Per-worker state set by _init_worker
+_worker = {}
+
+
+def _init_worker(name: Optional[str], shape: Tuple[int, int], dtype: str, predictor):
+    # Pool workers share the parent's resource tracker, so attaching doesn't
+    # add a second registration; the parent unlinks the block once
+    block = shared_memory.SharedMemory(name=name) if name else None
+    _worker['block'] = block
+    _worker['embeddings'] = np.ndarray(shape, dtype=np.dtype(dtype), buffer=block.buf) if block else None
+    _worker['predictor'] = predictor
+
+
+def _score_in_worker(item: Tuple[int, ProjectScoringTask]) -> Tuple[int, TaskResult]:
+    index, task = item
+    return index, score_task(_worker['embeddings'], task, _worker['predictor'])
+
+
+def default_workers() -> int:
+    return len(os.sched_getaffinity(0)) if hasattr(os, 'sched_getaffinity') else (os.cpu_count() or 1)
+
+
+def score_projects(embeddings: Optional[np.ndarray], tasks: List[ProjectScoringTask], predictor=None,
+                   workers: int = 0, min_parallel_candidates: int = 2000) -> List[TaskResult]:
+    """
+    Score every task, in a process pool when it pays off.
+
+    Args:
+        embeddings: ``(texts, dim)`` matrix the tasks' rows index, or None
+        predictor: Object with ``predict(features) -> (gb_bins, rf_bins)``
+            (a ``ModelBundle`` or compiled ensemble), or None for component
+            scores only
+        workers: Pool size; 0 uses every available CPU
+        min_parallel_candidates: Below this many candidates in total, pool
+            start-up costs more than it saves and tasks run in-process
+
+    Returns:
+        ``(scores, components, error)`` per task, in task order
+    """
+    workers = min(workers or default_workers(), len(tasks))
+    if workers <= 1 or sum(len(task) for task in tasks) < min_parallel_candidates:
+        return [score_task(embeddings, task, predictor) for task in tasks]
+
+    block = None
+    if embeddings is not None:
+        embeddings = np.ascontiguousarray(embeddings)
+        block = shared_memory.SharedMemory(create=True, size=max(embeddings.nbytes, 1))
+        np.ndarray(embeddings.shape, dtype=embeddings.dtype, buffer=block.buf)[:] = embeddings
+    try:
+        context = multiprocessing.get_context('forkserver')
+        shape = embeddings.shape if embeddings is not None else (0, 0)
+        dtype = embeddings.dtype.str if embeddings is not None else '<f4'
+        # Largest projects first, so a big one doesn't start last and hold up the pool
+        order = sorted(range(len(tasks)), key=lambda i: -len(tasks[i]))
+        results: List[Optional[TaskResult]] = [None] * len(tasks)
+        with context.Pool(workers, initializer=_init_worker,
+                          initargs=(block.name if block else None, shape, dtype, predictor)) as pool:
+            for index, result in pool.imap_unordered(_score_in_worker, ((i, tasks[i]) for i in order)):
+                results[index] = result
+        return results
+    finally:
+        if block is not None:
+            block.close()
+            block.unlink()
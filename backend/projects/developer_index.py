@@ -0,0 +1,281 @@
+"""
+Semantic talent search over developer profiles.
+
+Keeps an ``IVFIndex`` of developer profile embeddings (title, bio, skills)
+persisted under ``MATCHER_DEVELOPER_INDEX_PATH``. Incremental changes are
+appended to a journal next to the snapshot, so every worker process picks up
+profiles added, updated or removed by another one on its next search without
+reloading the whole index. ``python manage.py build_developer_index``
+rebuilds the snapshot from Supabase. It first rotates the journal (renames it
+aside), so records other workers append while profiles are being read land
+in a fresh journal that is replayed on top of the new snapshot.
+"""
+
+import base64
+import hashlib
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from projects.scoring import developer_text, project_text
+from projects.vector_index import IVFIndex
+
+
+def profile_text(profile: Dict) -> str:
+    """Embedded text of a Supabase ``developer_profiles`` row."""
+    return developer_text(profile.get('title') or '', profile.get('bio') or '', profile.get('skills') or '')
+
+
+def project_record_text(project: Dict) -> str:
+    """Embedded text of a Supabase ``projects`` row."""
+    tech_stack = project.get('tech_stack')
+    return project_text(project.get('title') or '', project.get('description') or '',
+                        tech_stack if isinstance(tech_stack, list) else [])
+
+
+def text_fingerprint(text: str) -> str:
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=12).hexdigest()
+
+
+class DeveloperIndex:
+    """Persisted ANN index of developer profiles keyed by Supabase user id."""
+
+    def __init__(self, path: str, encode_fn=None):
+        self.path = path
+        self.journal_path = f"{path}.journal"
+        # Where a running rebuild moved the journal it started from
+        self.rotated_journal_path = f"{path}.journal.rebuilding"
+        self._encode_fn = encode_fn
+        self._lock = threading.RLock()
+        self.index = None
+        self.fingerprints: Dict[str, str] = {}
+        self._snapshot_mtime = None
+        self._journal_inode = None
+        self._journal_offset = 0
+        self.refresh()
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self._encode_fn is None:
+            from projects.matcher import get_matcher
+            return get_matcher().embed_texts(texts)
+        return self._encode_fn(texts)
+
+    def __len__(self) -> int:
+        return len(self.index) if self.index is not None else 0
+
+    def _apply_upsert(self, ids: List[str], vectors: np.ndarray, fingerprints: List[str]):
+        if self.index is None or (not len(self.index) and self.index.dim != vectors.shape[1]):
+            self.index = IVFIndex(dim=vectors.shape[1])
+        self.index.upsert(ids, vectors)
+        self.fingerprints.update(zip(ids, fingerprints))
+
+    def _apply_remove(self, ids: List[str]):
+        if self.index is not None:
+            self.index.remove(ids)
+        for item_id in ids:
+            self.fingerprints.pop(item_id, None)
+
+    def _append_journal(self, records: List[Dict]):
+        lines = ''.join(json.dumps(record) + '\n' for record in records)
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            end = f.tell()
+            inode = os.fstat(f.fileno()).st_ino
+        # Our own records are already applied; skip them on the next refresh
+        # unless another worker appended in between or a rebuild rotated the journal
+        if inode == self._journal_inode and end - len(lines.encode('utf-8')) == self._journal_offset:
+            self._journal_offset = end
+
+    def _snapshot_version(self) -> Optional[float]:
+        return os.path.getmtime(self.path) if os.path.exists(self.path) else None
+
+    def refresh(self):
+        """Apply journal records written since the last refresh (by any process)."""
+        with self._lock:
+            snapshot_version = self._snapshot_version()
+            if snapshot_version != self._snapshot_mtime:
+                # A rebuild wrote a new snapshot; the journal holds what was appended since it started
+                self.index, metadata = IVFIndex.load(self.path)
+                self.fingerprints = metadata.get('fingerprints', {})
+                self._snapshot_mtime = snapshot_version
+                self._journal_inode, self._journal_offset = None, 0
+            try:
+                stat = os.stat(self.journal_path)
+            except FileNotFoundError:
+                stat = None
+            inode = stat.st_ino if stat is not None else None
+            if inode != self._journal_inode:
+                if self._journal_inode is not None:
+                    # A rebuild rotated the journal: finish the old one, then start on the new one
+                    self._replay_rotated_journal()
+                self._journal_inode, self._journal_offset = inode, 0
+            if stat is not None and stat.st_size > self._journal_offset:
+                self._journal_offset += self._replay_journal(self.journal_path, self._journal_offset, stat.st_size)
+
+    def _replay_rotated_journal(self):
+        try:
+            stat = os.stat(self.rotated_journal_path)
+        except FileNotFoundError:
+            return
+        if stat.st_ino == self._journal_inode:
+            self._replay_journal(self.rotated_journal_path, self._journal_offset, stat.st_size)
+
+    def _replay_journal(self, path: str, start: int, end: int) -> int:
+        """Apply the complete records between two byte offsets; returns the bytes consumed."""
+        with open(path, 'rb') as f:
+            f.seek(start)
+            chunk = f.read(end - start)
+        # Only complete lines; a concurrent writer may be mid-record
+        complete = chunk[:chunk.rfind(b'\n') + 1]
+        for line in complete.splitlines():
+            record = json.loads(line)
+            if record['op'] == 'upsert':
+                vector = np.frombuffer(base64.b64decode(record['v']), dtype=np.float32)
+                self._apply_upsert([record['id']], vector.reshape(1, -1), [record['fp']])
+            elif record['op'] == 'remove':
+                self._apply_remove([record['id']])
+        return len(complete)
+
+    def upsert_profiles(self, profiles: Iterable[Dict]) -> int:
+        """
+        Add or update developer profiles; only changed profile texts are re-encoded.
+
+        Returns:
+            Number of profiles whose embedding changed
+        """
+        changed_ids, texts, fingerprints = [], [], []
+        with self._lock:
+            for profile in profiles:
+                user_id = str(profile['user_id'])
+                text = profile_text(profile)
+                fingerprint = text_fingerprint(text)
+                if self.fingerprints.get(user_id) != fingerprint:
+                    changed_ids.append(user_id)
+                    texts.append(text)
+                    fingerprints.append(fingerprint)
+        if not changed_ids:
+            return 0
+
+        vectors = np.asarray(self._encode(texts), dtype=np.float32)
+        with self._lock:
+            self.refresh()
+            self._apply_upsert(changed_ids, vectors, fingerprints)
+            self._append_journal([
+                {'op': 'upsert', 'id': user_id, 'fp': fp, 'v': base64.b64encode(vector.tobytes()).decode('ascii')}
+                for user_id, fp, vector in zip(changed_ids, fingerprints, vectors)
+            ])
+        return len(changed_ids)
+
+    def remove(self, user_ids: Iterable[str]):
+        user_ids = [str(user_id) for user_id in user_ids]
+        with self._lock:
+            self.refresh()
+            self._apply_remove(user_ids)
+            self._append_journal([{'op': 'remove', 'id': user_id} for user_id in user_ids])
+
+    def search_vector(self, vector: np.ndarray, k: int = 20) -> List[Tuple[str, float]]:
+        with self._lock:
+            self.refresh()
+            if self.index is None:
+                return []
+            return self.index.search(vector, k=k)
+
+    def search_text(self, text: str, k: int = 20) -> List[Tuple[str, float]]:
+        return self.search_vector(self._encode([text])[0], k=k)
+
+    def search_project(self, project: Dict, k: int = 20) -> List[Tuple[str, float]]:
+        return self.search_text(project_record_text(project), k=k)
+
+    def rebuild(self, profiles: Iterable[Dict], batch_size: int = 1024) -> int:
+        """
+        Re-index every profile from scratch, train the quantizer and write a snapshot.
+
+        ``profiles`` is read after the journal is rotated: records other
+        workers append from then on may describe changes the profiles read
+        here predate, so they stay in the new journal on top of the snapshot.
+        """
+        with self._lock:
+            rotated_size = self._rotate_journal()
+            self.index, self.fingerprints = None, {}
+            batch = []
+            for profile in profiles:
+                batch.append(profile)
+                if len(batch) >= batch_size:
+                    self._rebuild_batch(batch)
+                    batch = []
+            self._rebuild_batch(batch)
+            if self.index is None:
+                self.index = IVFIndex(dim=0)
+            self.index.train()
+            self.index.save(self.path, metadata={'fingerprints': self.fingerprints})
+            # Other workers notice the new snapshot, reload it and replay the new journal
+            self._carry_late_records(rotated_size)
+            self._snapshot_mtime = self._snapshot_version()
+            self._journal_inode, self._journal_offset = None, 0
+            return len(self)
+
+    def _rotate_journal(self) -> int:
+        """Move the journal aside so appends start a new one; returns the moved journal's size."""
+        try:
+            os.replace(self.journal_path, self.rotated_journal_path)
+        except FileNotFoundError:
+            return 0
+        return os.path.getsize(self.rotated_journal_path)
+
+    def _carry_late_records(self, rotated_size: int):
+        """
+        Copy records written to the rotated journal by writers that opened it
+        before the rename into the new journal, then delete it.
+        """
+        try:
+            with open(self.rotated_journal_path, 'rb') as f:
+                f.seek(rotated_size)
+                late = f.read()
+        except FileNotFoundError:
+            return
+        late = late[:late.rfind(b'\n') + 1]
+        if late:
+            with open(self.journal_path, 'ab') as f:
+                f.write(late)
+        os.remove(self.rotated_journal_path)
+
+    def _rebuild_batch(self, profiles: List[Dict]):
+        if not profiles:
+            return
+        ids = [str(profile['user_id']) for profile in profiles]
+        texts = [profile_text(profile) for profile in profiles]
+        vectors = np.asarray(self._encode(texts), dtype=np.float32)
+        self._apply_upsert(ids, vectors, [text_fingerprint(text) for text in texts])
+
+
+_developer_index = None
+_developer_index_lock = threading.Lock()
+
+
+def get_developer_index() -> DeveloperIndex:
+    """Get or load the process-wide developer index."""
+    global _developer_index
+    if _developer_index is None:
+        with _developer_index_lock:
+            if _developer_index is None:
+                _developer_index = DeveloperIndex(settings.MATCHER_DEVELOPER_INDEX_PATH)
+    return _developer_index
+
+
+def fetch_developer_profiles(supabase, page_size: int = 1000) -> Iterable[Dict]:
+    """Yield every Supabase developer profile, paging past the API row limit."""
+    start = 0
+    while True:
+        response = supabase.table('developer_profiles').select('*').order('user_id').range(
+            start, start + page_size - 1
+        ).execute()
+        rows = response.data or []
+        yield from rows
+        if len(rows) < page_size:
+            return
+        start += page_size
@@ -0,0 +1,327 @@
+"""
+Text embedding backends for the freelancer matcher.
+
+Every backend exposes ``name`` (part of the embedding cache key) and
+``encode(texts, batch_size=...) -> (N, dim) float32``:
+
+- ``TorchEmbedder``: the full-precision SentenceTransformer.
+- ``OnnxEmbedder``: the same model exported to ONNX and int8-quantized by
+  ``python manage.py export_onnx_embedder``, run with onnxruntime and the
+  standalone ``tokenizers`` library, so neither torch nor transformers is
+  imported in the worker.
+
+``build_embedder`` picks the backend from ``MATCHER_EMBEDDING_BACKEND``, or
+returns a ``SidecarEmbedder`` when ``MATCHER_EMBEDDING_SOCKET`` points at a
+running ``run_embedding_server``. Heavy imports happen inside the
+constructors, never at module import.
+
+Both local backends batch through ``encode_scheduler.LengthBucketedEncoder``:
+texts are grouped by token length under ``MATCHER_ENCODE_TOKEN_BUDGET``, and
+texts longer than the model window are encoded as mean-pooled windows rather
+than truncated. The window size is part of each backend's ``name``, so
+vectors cached from truncated encodings are never reused.
+"""
+
+import json
+import logging
+import os
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+from projects.encode_scheduler import LengthBucketedEncoder, pooling_window, tokenizer_offsets
+
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MODEL_NAME = 'all-MiniLM-L6-v2'
+
+ONNX_MODEL_FILE = 'model_int8.onnx'
+ONNX_TOKENIZER_FILE = 'tokenizer.json'
+ONNX_CONFIG_FILE = 'embedder_config.json'
+
+
+def onnx_model_dir(model_name: str) -> str:
+    """Directory holding the exported ONNX model for ``model_name``."""
+    base = getattr(settings, 'MATCHER_ONNX_DIR', os.path.join(settings.BASE_DIR, 'ml_models', 'onnx'))
+    return os.path.join(base, model_name.replace('/', '__'))
+
+
+def onnx_embedder_name(model_name: str) -> str:
+    return f"{model_name}@onnx-int8"
+
+
+def windowed_embedder_name(name: str, window: int) -> str:
+    """
+    Cache key of a backend that pools long texts over ``window``-token
+    windows; vectors cached from truncated encodings don't share it.
+    """
+    return f"{name}#win{window}"
+
+
+def token_budget() -> int:
+    return getattr(settings, 'MATCHER_ENCODE_TOKEN_BUDGET', 8192)
+
+
+class TorchEmbedder:
+    """Full-precision SentenceTransformer backend."""
+
+    backend = 'torch'
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME):
+        from sentence_transformers import SentenceTransformer
+
+        self.model_name = model_name
+        self.model = SentenceTransformer(model_name)
+        tokenizer = self.model.tokenizer
+        self.scheduler = LengthBucketedEncoder(
+            tokenizer_offsets(tokenizer.backend_tokenizer),
+            lambda batch: self.model.encode(batch, batch_size=len(batch), convert_to_numpy=True),
+            max_tokens=self.model.max_seq_length,
+            token_budget=token_budget(),
+            special_tokens=tokenizer.num_special_tokens_to_add(False),
+            normalize=any(type(module).__name__ == 'Normalize' for module in self.model),
+        )
+        self.name = windowed_embedder_name(model_name, self.scheduler.window)
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if kwargs:
+            # Output options the scheduler doesn't reproduce (tensors, precision, ...)
+            return self.model.encode(texts, batch_size=batch_size, **kwargs)
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, self.model.get_sentence_embedding_dimension()), dtype=np.float32)
+        vectors = self.scheduler.encode(texts, max_batch=batch_size)
+        return vectors[0] if single else vectors
+
+
+class OnnxEmbedder:
+    """Int8-quantized ONNX export of a SentenceTransformer (mean pooling)."""
+
+    backend = 'onnx'
+
+    def __init__(self, model_name: str = DEFAULT_MODEL_NAME, model_dir: Optional[str] = None,
+                 threads: int = 0, require_parity: bool = True):
+        import onnxruntime  # noqa: F401  (fail here, so build_embedder can fall back)
+        from tokenizers import Tokenizer
+
+        self.model_name = model_name
+        self.model_dir = model_dir or onnx_model_dir(model_name)
+        with open(os.path.join(self.model_dir, ONNX_CONFIG_FILE)) as f:
+            self.config = json.load(f)
+        if require_parity and not self.config.get('parity_passed'):
+            raise RuntimeError(
+                f'ONNX export in {self.model_dir} has not passed the parity check; '
+                'run "python manage.py export_onnx_embedder"'
+            )
+
+        self.tokenizer = Tokenizer.from_file(os.path.join(self.model_dir, ONNX_TOKENIZER_FILE))
+        self.tokenizer.enable_truncation(max_length=self.config['max_seq_length'])
+        self.tokenizer.enable_padding(pad_id=self.config.get('pad_token_id', 0))
+        self.scheduler = LengthBucketedEncoder(
+            tokenizer_offsets(self.tokenizer),
+            self._encode_batch,
+            max_tokens=self.config['max_seq_length'],
+            token_budget=token_budget(),
+            special_tokens=self.tokenizer.num_special_tokens_to_add(False),
+            normalize=bool(self.config.get('normalize')),
+        )
+        self.name = windowed_embedder_name(onnx_embedder_name(model_name), self.scheduler.window)
+
+        self.threads = threads
+        self._session = None
+        self._session_pid = None
+
+    @property
+    def session(self):
+        """
+        The inference session, created on first use in each process.
+
+        onnxruntime's thread pools don't survive ``fork``, so a session built
+        in a preloading server master is never handed to its workers.
+        """
+        if self._session is None or self._session_pid != os.getpid():
+            import onnxruntime
+
+            options = onnxruntime.SessionOptions()
+            options.graph_optimization_level = onnxruntime.GraphOptimizationLevel.ORT_ENABLE_ALL
+            if self.threads:
+                options.intra_op_num_threads = self.threads
+            self._session = onnxruntime.InferenceSession(
+                os.path.join(self.model_dir, ONNX_MODEL_FILE), options, providers=['CPUExecutionProvider']
+            )
+            self._session_pid = os.getpid()
+            self.input_names = {i.name for i in self._session.get_inputs()}
+        return self._session
+
+    def _encode_batch(self, texts: List[str]) -> np.ndarray:
+        encodings = self.tokenizer.encode_batch(texts)
+        input_ids = np.array([e.ids for e in encodings], dtype=np.int64)
+        attention_mask = np.array([e.attention_mask for e in encodings], dtype=np.int64)
+        feeds = {'input_ids': input_ids, 'attention_mask': attention_mask}
+        session = self.session
+        if 'token_type_ids' in self.input_names:
+            feeds['token_type_ids'] = np.array([e.type_ids for e in encodings], dtype=np.int64)
+
+        hidden = session.run(['last_hidden_state'], feeds)[0]
+        mask = attention_mask[:, :, None].astype(np.float32)
+        pooled = (hidden * mask).sum(axis=1) / np.maximum(mask.sum(axis=1), 1e-9)
+        if self.config.get('normalize'):
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype(np.float32)
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.zeros((0, self.config['dim']), dtype=np.float32)
+        vectors = self.scheduler.encode(texts, max_batch=batch_size)
+        return vectors[0] if single else vectors
+
+
+EMBEDDER_BACKENDS = {
+    'torch': TorchEmbedder,
+    'onnx': OnnxEmbedder,
+}
+
+
+def build_embedder(model_name: str = DEFAULT_MODEL_NAME, backend: Optional[str] = None,
+                   use_sidecar: bool = True):
+    """
+    Create the embedder selected by ``MATCHER_EMBEDDING_BACKEND``.
+
+    A failing non-torch backend (onnxruntime missing, model not exported or
+    parity not verified) falls back to the torch backend. With
+    ``MATCHER_EMBEDDING_SOCKET`` set (and ``use_sidecar``), encoding goes to
+    the host's embedding server and the local model is only loaded if the
+    server can't be reached.
+    """
+    backend = backend or getattr(settings, 'MATCHER_EMBEDDING_BACKEND', 'torch')
+    socket_path = getattr(settings, 'MATCHER_EMBEDDING_SOCKET', '')
+    if use_sidecar and socket_path:
+        return build_sidecar_embedder(socket_path, model_name, backend)
+    if backend not in EMBEDDER_BACKENDS:
+        raise ValueError(f"Unknown embedding backend '{backend}'; choose from {sorted(EMBEDDER_BACKENDS)}")
+    if backend == 'onnx':
+        try:
+            return OnnxEmbedder(model_name, threads=getattr(settings, 'MATCHER_ONNX_THREADS', 0))
+        except Exception as e:
+            logger.warning('ONNX embedder unavailable (%s); falling back to torch', e)
+    return TorchEmbedder(model_name)
+
+
+def _special_token_count(tokenizer_file: str) -> int:
+    from tokenizers import Tokenizer
+
+    return Tokenizer.from_file(tokenizer_file).num_special_tokens_to_add(False)
+
+
+def _sentence_transformer_dir(model_name: str) -> str:
+    """Local files of ``model_name``, without downloading anything."""
+    if os.path.isdir(model_name):
+        return model_name
+    from huggingface_hub import snapshot_download
+
+    repo = model_name if '/' in model_name else f'sentence-transformers/{model_name}'
+    return snapshot_download(repo, local_files_only=True)
+
+
+def _read_json(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as f:
+        return json.load(f)
+
+
+def _sentence_transformer_max_tokens(model_dir: str) -> int:
+    """The ``max_seq_length`` SentenceTransformer would load ``model_dir`` with."""
+    configured = _read_json(os.path.join(model_dir, 'sentence_bert_config.json')).get('max_seq_length')
+    if configured:
+        return int(configured)
+    # Not saved: SentenceTransformer takes the tokenizer's limit, capped by the position table
+    limits = [
+        _read_json(os.path.join(model_dir, 'tokenizer_config.json')).get('model_max_length'),
+        _read_json(os.path.join(model_dir, 'config.json')).get('max_position_embeddings'),
+    ]
+    limits = [int(limit) for limit in limits if limit and limit < 1e6]
+    if not limits:
+        raise ValueError(f'no max_seq_length configured in {model_dir}')
+    return min(limits)
+
+
+def configured_embedder_name(model_name: str, backend: str) -> Optional[str]:
+    """
+    The ``name`` the ``backend`` embedder would have, read from the model's
+    config files instead of loading it; None when they aren't available locally.
+    """
+    try:
+        if backend == 'onnx':
+            import onnxruntime  # noqa: F401  (build_embedder falls back to torch without it)
+
+            model_dir = onnx_model_dir(model_name)
+            config = _read_json(os.path.join(model_dir, ONNX_CONFIG_FILE))
+            if config.get('parity_passed'):
+                window = pooling_window(
+                    config['max_seq_length'], _special_token_count(os.path.join(model_dir, ONNX_TOKENIZER_FILE))
+                )
+                return windowed_embedder_name(onnx_embedder_name(model_name), window)
+        model_dir = _sentence_transformer_dir(model_name)
+        window = pooling_window(
+            _sentence_transformer_max_tokens(model_dir), _special_token_count(os.path.join(model_dir, 'tokenizer.json'))
+        )
+        return windowed_embedder_name(model_name, window)
+    except (ImportError, OSError, ValueError, KeyError, TypeError) as e:
+        logger.info('Could not read the embedder config of %s (%s)', model_name, e)
+        return None
+
+
+def build_sidecar_embedder(socket_path: str, model_name: str, backend: str):
+    from projects.embedding_server import EmbeddingClient, SidecarEmbedder
+
+    client = EmbeddingClient(socket_path, timeout=getattr(settings, 'MATCHER_EMBEDDING_TIMEOUT', 10.0))
+
+    def fallback_factory():
+        return build_embedder(model_name, backend, use_sidecar=False)
+
+    try:
+        # Share the server's cache key so vectors from either side are interchangeable
+        name = client.info()['name']
+    except (OSError, ConnectionError, RuntimeError) as e:
+        logger.warning('Embedding server at %s unavailable (%s); will encode in-process until it is up',
+                       socket_path, e)
+        # Keep the fallback lazy: the sidecar may come back before anything is encoded
+        name = configured_embedder_name(model_name, backend)
+        if name is None:
+            # Without the config the cache key is only known once the model is loaded
+            fallback = fallback_factory()
+            name, fallback_factory = fallback.name, lambda: fallback
+    return SidecarEmbedder(client, name, fallback_factory=fallback_factory)
+
+
+def cosine_matrix(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float64)
+    vectors = vectors / np.maximum(np.linalg.norm(vectors, axis=1, keepdims=True), 1e-12)
+    return vectors @ vectors.T
+
+
+def embedding_parity(reference, candidate, texts: Sequence[str], batch_size: int = 32) -> Dict[str, float]:
+    """
+    Compare two embedders on the same texts.
+
+    Returns:
+        ``max_similarity_error``: largest absolute difference between the two
+        backends' text-to-text cosine similarity matrices (what the matcher
+        consumes), and ``min_self_cosine``: the lowest cosine between a text's
+        two embeddings.
+    """
+    a = np.asarray(reference.encode(list(texts), batch_size=batch_size), dtype=np.float64)
+    b = np.asarray(candidate.encode(list(texts), batch_size=batch_size), dtype=np.float64)
+    a_unit = a / np.maximum(np.linalg.norm(a, axis=1, keepdims=True), 1e-12)
+    b_unit = b / np.maximum(np.linalg.norm(b, axis=1, keepdims=True), 1e-12)
+    return {
+        'max_similarity_error': float(np.abs(cosine_matrix(a) - cosine_matrix(b)).max()),
+        'min_self_cosine': float((a_unit * b_unit).sum(axis=1).min()),
+    }
@@ -0,0 +1,219 @@
+"""
+Two-tier embedding cache for the freelancer matcher.
+
+Embeddings are content-addressed: the key is a hash of the embedding model
+name and the text, so the same project description, developer bio or cover
+letter is encoded at most once per model. Hot vectors are kept in an
+in-process LRU bounded by a memory budget, and every vector is also written
+to a SQLite store on disk so a restarted worker starts warm.
+"""
+
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+from django.conf import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+def embedding_key(model_name: str, text: str) -> str:
+    """Content address of ``text`` embedded with ``model_name``."""
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(model_name.encode('utf-8'))
+    digest.update(b'\x00')
+    digest.update(text.encode('utf-8'))
+    return digest.hexdigest()
+
+
+class LRUEmbeddingCache:
+    """In-process LRU of embedding vectors, bounded by total bytes."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        with self._lock:
+            for key in keys:
+                vector = self._entries.get(key)
+                if vector is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = vector
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        with self._lock:
+            for key, vector in items.items():
+                previous = self._entries.pop(key, None)
+                if previous is not None:
+                    self.current_bytes -= previous.nbytes
+                if vector.nbytes > self.max_bytes:
+                    continue
+                self._entries[key] = vector
+                self.current_bytes += vector.nbytes
+            while self.current_bytes > self.max_bytes and self._entries:
+                _, evicted = self._entries.popitem(last=False)
+                self.current_bytes -= evicted.nbytes
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+
+class SQLiteEmbeddingStore:
+    """Persistent float32 embedding store backed by a single SQLite file."""
+
+    # SQLite's default limit on host parameters per statement is 999
+    QUERY_CHUNK = 500
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._connection() as conn:
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS embeddings ('
+                ' key TEXT PRIMARY KEY,'
+                ' dim INTEGER NOT NULL,'
+                ' vector BLOB NOT NULL)'
+            )
+
+    def _connection(self) -> sqlite3.Connection:
+        # One connection per thread; SQLite connections are not shareable,
+        # including with a child forked from this process
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get_many(self, keys: Sequence[str]) -> Dict[str, np.ndarray]:
+        found = {}
+        conn = self._connection()
+        for start in range(0, len(keys), self.QUERY_CHUNK):
+            chunk = keys[start:start + self.QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            rows = conn.execute(
+                f'SELECT key, dim, vector FROM embeddings WHERE key IN ({placeholders})',
+                chunk,
+            ).fetchall()
+            for key, dim, blob in rows:
+                found[key] = np.frombuffer(blob, dtype=np.float32, count=dim)
+        return found
+
+    def put_many(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        rows = [
+            (key, int(vector.shape[0]), np.ascontiguousarray(vector, dtype=np.float32).tobytes())
+            for key, vector in items.items()
+        ]
+        with self._connection() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO embeddings (key, dim, vector) VALUES (?, ?, ?)',
+                rows,
+            )
+
+
+class EmbeddingCache:
+    """
+    Content-addressed embedding cache: memory LRU in front of a disk store.
+
+    ``encode`` is the entry point used by the matcher. It resolves every text
+    from memory, then disk, and hands only the remaining unique texts to the
+    encoder in a single call.
+    """
+
+    def __init__(self, max_bytes: int, disk_path: Optional[str] = None):
+        self.memory = LRUEmbeddingCache(max_bytes)
+        self.disk = None
+        if disk_path:
+            try:
+                self.disk = SQLiteEmbeddingStore(disk_path)
+            except sqlite3.Error as e:
+                logger.warning('Embedding disk cache unavailable at %s: %s', disk_path, e)
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_settings(cls) -> 'EmbeddingCache':
+        max_mb = getattr(settings, 'MATCHER_EMBEDDING_CACHE_MB', 256)
+        disk_path = getattr(settings, 'MATCHER_EMBEDDING_CACHE_PATH', None)
+        return cls(max_bytes=int(max_mb) * 1024 * 1024, disk_path=disk_path)
+
+    def encode(self, texts: Sequence[str], model_name: str,
+               encode_fn: Callable[[List[str]], np.ndarray]) -> np.ndarray:
+        """
+        Return a ``(len(texts), dim)`` float32 matrix of embeddings.
+
+        Args:
+            texts: Texts to embed; duplicates are resolved once
+            model_name: Name of the embedding model, part of the cache key
+            encode_fn: Called once with the list of uncached texts
+        """
+        if not texts:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        keys = [embedding_key(model_name, text) for text in texts]
+        unique_keys = list(dict.fromkeys(keys))
+
+        vectors = self.memory.get_many(unique_keys)
+        self.memory_hits += len(vectors)
+
+        pending = [key for key in unique_keys if key not in vectors]
+        if pending and self.disk is not None:
+            try:
+                from_disk = self.disk.get_many(pending)
+            except sqlite3.Error as e:
+                logger.warning('Embedding disk cache read failed: %s', e)
+                from_disk = {}
+            if from_disk:
+                self.disk_hits += len(from_disk)
+                self.memory.put_many(from_disk)
+                vectors.update(from_disk)
+                pending = [key for key in pending if key not in from_disk]
+
+        if pending:
+            text_by_key = dict(zip(keys, texts))
+            encoded = np.asarray(encode_fn([text_by_key[key] for key in pending]), dtype=np.float32)
+            # Copies, so a cached row doesn't keep the whole batch matrix alive
+            fresh = {key: encoded[i].copy() for i, key in enumerate(pending)}
+            self.misses += len(fresh)
+            self.memory.put_many(fresh)
+            if self.disk is not None:
+                try:
+                    self.disk.put_many(fresh)
+                except sqlite3.Error as e:
+                    logger.warning('Embedding disk cache write failed: %s', e)
+            vectors.update(fresh)
+
+        return np.stack([vectors[key] for key in keys])
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'memory_entries': len(self.memory),
+            'memory_bytes': self.memory.current_bytes,
+            'memory_hits': self.memory_hits,
+            'disk_hits': self.disk_hits,
+            'misses': self.misses,
+        }
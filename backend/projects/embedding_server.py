@@ -0,0 +1,243 @@
+"""
+Local embedding sidecar shared by every worker on a host.
+
+``python manage.py run_embedding_server`` loads the embedder once and serves
+it on a Unix socket. Requests from all worker processes are queued and
+encoded together in micro-batches by a ``CoalescingEmbedder``, so a host
+holds one copy of the model however many Django workers it runs.
+
+Workers talk to it through ``EmbeddingClient``; ``SidecarEmbedder`` wraps
+the client with a timeout and falls back to loading the model in-process if
+the sidecar is down. After a failure the sidecar is left alone for a backoff
+period (doubling up to a cap while it keeps failing) instead of every
+request waiting on the timeout, and whenever it comes back its model is
+checked against the worker's cache key before its vectors are used.
+
+Wire format: every message is a 4-byte big-endian length followed by the
+payload. A request is one JSON frame (``{"op": "encode", "texts": [...]}``
+or ``{"op": "info"}``); a response is a JSON header frame, followed for
+``encode`` by one frame of raw float32 vectors.
+"""
+
+import json
+import logging
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Callable, Dict, List
+
+import numpy as np
+
+from projects.encode_coalescer import CoalescingEmbedder
+
+
+logger = logging.getLogger(__name__)
+
+
+def _send_frame(sock: socket.socket, payload: bytes):
+    sock.sendall(struct.pack('>I', len(payload)) + payload)
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytes:
+    chunks = []
+    while size:
+        chunk = sock.recv(min(size, 1 << 20))
+        if not chunk:
+            raise ConnectionError('Embedding server closed the connection')
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b''.join(chunks)
+
+
+def _recv_frame(sock: socket.socket) -> bytes:
+    (size,) = struct.unpack('>I', _recv_exact(sock, 4))
+    return _recv_exact(sock, size)
+
+
+class EmbeddingServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket server that micro-batches encode requests from many clients."""
+
+    daemon_threads = True
+    # Every worker on the host may connect at once
+    request_queue_size = 128
+
+    def __init__(self, socket_path: str, embedder, max_batch: int = 64, max_wait_ms: float = 5):
+        self.socket_path = socket_path
+        self.embedder = embedder
+        self.coalescer = CoalescingEmbedder(embedder, max_batch=max_batch, max_wait_ms=max_wait_ms)
+        if os.path.exists(socket_path):
+            os.remove(socket_path)
+        super().__init__(socket_path, _EmbeddingRequestHandler)
+        os.chmod(socket_path, 0o660)
+
+    def info(self) -> Dict:
+        return {
+            'name': self.embedder.name,
+            'backend': getattr(self.embedder, 'backend', 'unknown'),
+            'batches': self.coalescer.batches,
+            'texts_encoded': self.coalescer.texts_encoded,
+        }
+
+    def server_close(self):
+        super().server_close()
+        if os.path.exists(self.socket_path):
+            os.remove(self.socket_path)
+
+
+class _EmbeddingRequestHandler(socketserver.BaseRequestHandler):
+    def handle(self):
+        # A client may send several requests over one connection
+        while True:
+            try:
+                message = json.loads(_recv_frame(self.request))
+            except (ConnectionError, struct.error):
+                return
+            if message.get('op') == 'info':
+                _send_frame(self.request, json.dumps(self.server.info()).encode())
+                continue
+
+            texts = message.get('texts') or []
+            if not texts:
+                _send_frame(self.request, json.dumps({'n': 0, 'dim': 0}).encode())
+                _send_frame(self.request, b'')
+                continue
+            try:
+                vectors = np.ascontiguousarray(self.server.coalescer.submit(texts).result(), dtype=np.float32)
+            except Exception as e:
+                _send_frame(self.request, json.dumps({'error': str(e)}).encode())
+                continue
+            _send_frame(self.request, json.dumps({'n': vectors.shape[0], 'dim': vectors.shape[1]}).encode())
+            _send_frame(self.request, vectors.tobytes())
+
+
+class EmbeddingClient:
+    """Client for ``EmbeddingServer``; one connection per calling thread."""
+
+    def __init__(self, socket_path: str, timeout: float = 5.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, 'sock', None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _close(self):
+        sock = getattr(self._local, 'sock', None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+    def _call(self, message: Dict, with_payload: bool):
+        try:
+            sock = self._connection()
+            _send_frame(sock, json.dumps(message).encode())
+            header = json.loads(_recv_frame(sock))
+            payload = _recv_frame(sock) if with_payload and 'error' not in header else None
+        except (OSError, ConnectionError):
+            # Timed out or broken mid-message; the stream can't be reused
+            self._close()
+            raise
+        if 'error' in header:
+            raise RuntimeError(f"Embedding server error: {header['error']}")
+        return header, payload
+
+    def info(self) -> Dict:
+        return self._call({'op': 'info'}, with_payload=False)[0]
+
+    def encode(self, texts: List[str]) -> np.ndarray:
+        header, payload = self._call({'op': 'encode', 'texts': list(texts)}, with_payload=True)
+        return np.frombuffer(payload, dtype=np.float32).reshape(header['n'], header['dim'])
+
+
+class SidecarEmbedder:
+    """
+    Embedder that encodes through the host's embedding server.
+
+    If the server is unreachable or times out, texts are encoded in-process
+    with the embedder from ``fallback_factory``, which is only built the
+    first time it is needed, and the server isn't tried again for
+    ``retry_initial`` seconds, doubling up to ``retry_max`` while it keeps
+    failing. A server whose model doesn't match ``name`` is treated as
+    failing, so its vectors never land under this cache key.
+    """
+
+    backend = 'sidecar'
+
+    def __init__(self, client: EmbeddingClient, name: str, fallback_factory: Callable,
+                 retry_initial: float = 1.0, retry_max: float = 60.0):
+        self.client = client
+        self.name = name
+        self._fallback_factory = fallback_factory
+        self._fallback = None
+        self._fallback_lock = threading.Lock()
+        self.retry_initial = retry_initial
+        self.retry_max = retry_max
+        self._state_lock = threading.Lock()
+        self._retry_at = 0.0
+        self._backoff = 0.0
+        # Whether the server's model was checked since it last (re)connected
+        self._verified = False
+        self.remote_calls = 0
+        self.fallback_calls = 0
+
+    def _fallback_embedder(self):
+        if self._fallback is None:
+            with self._fallback_lock:
+                if self._fallback is None:
+                    self._fallback = self._fallback_factory()
+        return self._fallback
+
+    def _remote_encode(self, texts: List[str]) -> np.ndarray:
+        if not self._verified:
+            served = self.client.info().get('name')
+            if served != self.name:
+                raise RuntimeError(f"server encodes with '{served}', expected '{self.name}'")
+            self._verified = True
+        return self.client.encode(texts)
+
+    def _record_failure(self, error: Exception):
+        with self._state_lock:
+            opened = self._backoff == 0
+            self._backoff = min(self._backoff * 2, self.retry_max) if self._backoff else self.retry_initial
+            self._retry_at = time.monotonic() + self._backoff
+            self._verified = False
+        if opened:
+            logger.warning('Embedding server unavailable (%s); encoding in-process, retrying in %.0fs',
+                           error, self._backoff)
+        else:
+            logger.debug('Embedding server still unavailable (%s); retrying in %.0fs', error, self._backoff)
+
+    def _record_success(self):
+        if self._backoff:
+            with self._state_lock:
+                self._backoff = 0.0
+            logger.info('Embedding server reachable again; encoding through it')
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        vectors = None
+        if time.monotonic() >= self._retry_at:
+            try:
+                vectors = self._remote_encode(texts)
+                self.remote_calls += 1
+                self._record_success()
+            except (OSError, ConnectionError, RuntimeError) as e:
+                self._record_failure(e)
+        if vectors is None:
+            vectors = np.asarray(self._fallback_embedder().encode(texts, batch_size=batch_size), dtype=np.float32)
+            self.fallback_calls += 1
+        return vectors[0] if single else vectors
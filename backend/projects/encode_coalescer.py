@@ -0,0 +1,176 @@
+"""
+Cross-request micro-batching in front of an embedder.
+
+Concurrent requests each encode a handful of texts (one project, a few
+proposals), and a transformer spends most of a small call on fixed
+overhead. ``CoalescingEmbedder`` queues submissions from every thread; a
+dispatcher thread collects them for up to ``max_wait_ms`` after the oldest
+one arrived, or until ``max_batch`` texts are waiting, encodes the distinct
+texts in one call and resolves each caller's future with its rows.
+
+Under load the queue is never empty, so batches leave full without waiting;
+a lone request pays at most ``max_wait_ms``. All encoding happens on the
+dispatcher thread, which also serializes access to the model. ``close``
+stops the dispatcher once the queued texts are encoded, so a replaced
+embedder's model can be freed.
+
+``matcher_embedding_batch_texts`` and ``matcher_embedding_batch_fill``
+(texts / ``max_batch``) describe the batches, and
+``matcher_embedding_queue_seconds`` how long submissions waited for one.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import List, Optional
+
+import numpy as np
+
+from projects.metrics import registry as metrics
+
+
+metrics.histogram('matcher_embedding_batch_texts', 'Distinct texts per coalesced embedder call',
+                  buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256, 512))
+metrics.histogram('matcher_embedding_batch_fill', 'Coalesced batch size as a fraction of the batch cap',
+                  buckets=(0.1, 0.25, 0.5, 0.75, 0.9, 1.0))
+metrics.histogram('matcher_embedding_queue_seconds', 'Time from submitting texts to their batch being encoded')
+
+
+# Queued by ``close``: the dispatcher exits when it reaches it
+_CLOSE = object()
+
+
+class _Submission:
+    def __init__(self, texts: List[str]):
+        self.texts = texts
+        self.future: Future = Future()
+        self.submitted = time.monotonic()
+
+
+class CoalescingEmbedder:
+    """
+    Wraps an embedder (``encode(texts, batch_size=...)``) so concurrent calls
+    share batches. Exposes the wrapped embedder's ``name`` and ``backend``,
+    so cache keys don't change.
+    """
+
+    def __init__(self, embedder, max_batch: int = 64, max_wait_ms: float = 2):
+        self.embedder = embedder
+        self.name = embedder.name
+        self.backend = getattr(embedder, 'backend', 'unknown')
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.texts_encoded = 0
+        self._lock = threading.Lock()
+        self._queue: Optional['queue.Queue[_Submission]'] = None
+        self._dispatcher: Optional[threading.Thread] = None
+        self._dispatcher_pid = None
+        self._closed = False
+        # Submission that didn't fit the previous batch; only touched by the dispatcher
+        self._carry: Optional[_Submission] = None
+
+    def _submissions(self) -> 'queue.Queue[_Submission]':
+        """
+        The dispatcher's queue, starting the dispatcher on first use in each
+        process (threads don't survive the ``fork`` of a preloading master).
+        """
+        if self._dispatcher_pid != os.getpid():
+            with self._lock:
+                if self._dispatcher_pid != os.getpid():
+                    self._queue = queue.Queue()
+                    self._carry = None
+                    self._dispatcher = threading.Thread(target=self._dispatch_loop, args=(self._queue,),
+                                                        name='embedding-coalescer', daemon=True)
+                    self._dispatcher.start()
+                    self._dispatcher_pid = os.getpid()
+        return self._queue
+
+    def submit(self, texts: List[str]) -> Future:
+        """Queue texts for encoding; the future resolves to their ``(N, dim)`` float32 vectors."""
+        submission = _Submission(list(texts))
+        if not self._closed:
+            submissions = self._submissions()
+            with self._lock:
+                if not self._closed:
+                    submissions.put(submission)
+                    return submission.future
+        # Closed: a request still holding this embedder encodes on its own thread
+        submission.future.set_running_or_notify_cancel()
+        self._encode([submission])
+        return submission.future
+
+    def close(self):
+        """Stop the dispatcher after the texts already queued; later calls encode on the caller's thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            if self._dispatcher_pid == os.getpid():
+                self._queue.put(_CLOSE)
+
+    def encode(self, texts, batch_size: int = 32, **kwargs) -> np.ndarray:
+        if kwargs:
+            return self.embedder.encode(texts, batch_size=batch_size, **kwargs)
+        single = isinstance(texts, str)
+        texts = [texts] if single else list(texts)
+        if not texts:
+            return np.asarray(self.embedder.encode(texts, batch_size=batch_size), dtype=np.float32)
+        vectors = self.submit(texts).result()
+        return vectors[0] if single else vectors
+
+    def _next_batch(self, submissions: 'queue.Queue[_Submission]') -> Optional[List[_Submission]]:
+        """The next batch, or None once ``close`` was called and everything before it is encoded."""
+        first = self._carry if self._carry is not None else submissions.get()
+        self._carry = None
+        if first is _CLOSE:
+            return None
+        batch = [first]
+        count = len(batch[0].texts)
+        deadline = batch[0].submitted + self.max_wait
+        while count < self.max_batch:
+            try:
+                # Past the deadline, still take whatever is already queued
+                submission = submissions.get(timeout=max(deadline - time.monotonic(), 0))
+            except queue.Empty:
+                break
+            if submission is _CLOSE or count + len(submission.texts) > self.max_batch:
+                self._carry = submission
+                break
+            batch.append(submission)
+            count += len(submission.texts)
+        return batch
+
+    def _dispatch_loop(self, submissions: 'queue.Queue[_Submission]'):
+        while True:
+            batch = self._next_batch(submissions)
+            if batch is None:
+                return
+            batch = [s for s in batch if s.future.set_running_or_notify_cancel()]
+            if batch:
+                self._encode(batch)
+
+    def _encode(self, batch: List[_Submission]):
+        started = time.monotonic()
+        # Concurrent requests for one project submit the same texts
+        rows = {}
+        for submission in batch:
+            for text in submission.texts:
+                rows.setdefault(text, len(rows))
+        texts = list(rows)
+        try:
+            vectors = np.asarray(self.embedder.encode(texts, batch_size=self.max_batch), dtype=np.float32)
+        except Exception as e:
+            for submission in batch:
+                submission.future.set_exception(e)
+            return
+
+        self.batches += 1
+        self.texts_encoded += len(texts)
+        metrics.observe('matcher_embedding_batch_texts', len(texts))
+        metrics.observe('matcher_embedding_batch_fill', min(len(texts) / self.max_batch, 1.0))
+        for submission in batch:
+            metrics.observe('matcher_embedding_queue_seconds', started - submission.submitted)
+            submission.future.set_result(vectors[[rows[text] for text in submission.texts]])
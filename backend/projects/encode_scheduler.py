@@ -0,0 +1,124 @@
+"""
+Length-bucketed batching for text encoding.
+
+Padding every batch to its longest member wastes most of a transformer's
+compute when one-line proposals share a batch with multi-page ones, and the
+model's ``max_seq_length`` silently drops everything past it.
+``LengthBucketedEncoder`` instead:
+
+1. tokenizes all pending texts once (offsets only, no truncation);
+2. splits texts longer than the model window into consecutive windows;
+3. sorts the windows by token count and packs them into buckets whose
+   padded size (count x longest member) stays under a token budget;
+4. encodes bucket by bucket, so each batch pads to a near-equal length;
+5. mean-pools every text's window vectors, weighted by their token counts,
+   and returns the vectors in the original order.
+
+Windows are cut on token boundaries of the original string and handed to the
+backend as substrings, so the backend's own tokenizer and pooling run
+unchanged.
+"""
+
+from typing import Callable, List, Sequence, Tuple
+
+import numpy as np
+
+
+# (start, end) character offsets of each token of one text
+Offsets = List[Tuple[int, int]]
+
+
+def pooling_window(max_tokens: int, special_tokens: int) -> int:
+    """Tokens of text per window for a model taking ``max_tokens`` inputs."""
+    return max(max_tokens - special_tokens - LengthBucketedEncoder.WINDOW_MARGIN, 1)
+
+
+class LengthBucketedEncoder:
+    """
+    Args:
+        tokenize: Returns the token offsets of each text (no special tokens)
+        encode_batch: Encodes one bucket of texts into ``(N, dim)`` vectors
+        max_tokens: Model window, special tokens included
+        token_budget: Largest padded ``count x length`` token total per batch
+        special_tokens: Tokens the backend adds to every input ([CLS], [SEP])
+        normalize: Re-normalize pooled vectors (for unit-length models)
+    """
+
+    # Tokens left free in each window: a substring re-tokenized on its own can
+    # split a leading word differently than in the full text
+    WINDOW_MARGIN = 8
+
+    def __init__(self, tokenize: Callable[[List[str]], List[Offsets]], encode_batch: Callable[[List[str]], np.ndarray],
+                 max_tokens: int, token_budget: int = 8192, special_tokens: int = 2, normalize: bool = False):
+        self.tokenize = tokenize
+        self.encode_batch = encode_batch
+        self.max_tokens = max_tokens
+        self.window = pooling_window(max_tokens, special_tokens)
+        self.token_budget = token_budget
+        self.special_tokens = special_tokens
+        self.normalize = normalize
+
+    def windows(self, texts: Sequence[str]) -> Tuple[List[str], np.ndarray, np.ndarray]:
+        """
+        Split texts into model-sized windows.
+
+        Returns:
+            Window texts, the index of the text each window came from, and each
+            window's token count (at least 1, so empty texts keep a weight)
+        """
+        window_texts, owners, lengths = [], [], []
+        for i, (text, offsets) in enumerate(zip(texts, self.tokenize(list(texts)))):
+            if len(offsets) <= self.window:
+                window_texts.append(text)
+                owners.append(i)
+                lengths.append(max(len(offsets), 1))
+                continue
+            for start in range(0, len(offsets), self.window):
+                span = offsets[start:start + self.window]
+                window_texts.append(text[span[0][0]:span[-1][1]])
+                owners.append(i)
+                lengths.append(len(span))
+        return window_texts, np.array(owners, dtype=np.intp), np.array(lengths, dtype=np.intp)
+
+    def buckets(self, lengths: np.ndarray, max_batch: int) -> List[np.ndarray]:
+        """Window indices grouped longest-first into batches under the padded-token budget."""
+        order = np.argsort(-lengths, kind='stable')
+        buckets, start = [], 0
+        while start < len(order):
+            # Sorted descending, so the first member sets the batch's padded length
+            padded = int(lengths[order[start]]) + self.special_tokens
+            size = max(1, min(max_batch, self.token_budget // padded))
+            buckets.append(order[start:start + size])
+            start += size
+        return buckets
+
+    def encode(self, texts: Sequence[str], max_batch: int = 64) -> np.ndarray:
+        """``(len(texts), dim)`` float32 vectors, in the order of ``texts``."""
+        window_texts, owners, lengths = self.windows(texts)
+        pooled = None
+        for bucket in self.buckets(lengths, max_batch):
+            vectors = np.asarray(self.encode_batch([window_texts[i] for i in bucket]), dtype=np.float32)
+            if pooled is None:
+                pooled = np.zeros((len(texts), vectors.shape[1]), dtype=np.float64)
+            np.add.at(pooled, owners[bucket], vectors * lengths[bucket, np.newaxis])
+        if pooled is None:
+            return np.zeros((0, 0), dtype=np.float32)
+
+        pooled /= np.bincount(owners, weights=lengths, minlength=len(texts))[:, np.newaxis]
+        if self.normalize:
+            pooled /= np.maximum(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12)
+        return pooled.astype(np.float32)
+
+
+def tokenizer_offsets(tokenizer) -> Callable[[List[str]], List[Offsets]]:
+    """``tokenize`` for a ``tokenizers.Tokenizer``, run without truncation, padding or special tokens."""
+    from tokenizers import Tokenizer
+
+    counter = Tokenizer.from_str(tokenizer.to_str())
+    counter.no_truncation()
+    counter.no_padding()
+
+    def tokenize(texts: List[str]) -> List[Offsets]:
+        return [encoding.offsets for encoding in counter.encode_batch(texts, add_special_tokens=False)]
+
+    return tokenize
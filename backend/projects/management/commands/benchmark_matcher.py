@@ -0,0 +1,299 @@
+"""
+Management command that benchmarks the matcher on synthetic marketplaces.
+Usage: python manage.py benchmark_matcher [--sizes 10 100 1000] [--repeats 20] [--embedder stub|real]
+                                          [--baseline <json>] [--save-baseline] [--tolerance 0.25]
+                                          [--min-delta-ms 1.0] [--output <json>]
+
+For every size one project receives that many generated applicants (profiles,
+skills, cover letters, proposed rates and a past-project history for a third
+of the developers). The command then times, on a throwaway test database
+(in-memory with SQLite):
+
+- ``rank``: ``rank_freelancers`` with the result cache cleared, i.e. a full
+  scoring pass over warm embeddings
+- ``rank_cached``: ``rank_freelancers`` with nothing changed
+- ``match_details``: ``get_match_details`` for random applications, uncached
+
+and reports throughput, p50/p95/p99 latency and the tracemalloc peak of one
+fully cold ranking (embedding cache cleared too). With a baseline file it
+fails if a p50/p95 latency or the peak memory grew by more than
+``--tolerance`` (latency only when also more than ``--min-delta-ms``).
+Baselines are machine-specific, so none is committed: ``--save-baseline``
+records one at ``benchmarks/matcher_baseline.json`` (git-ignored), and later
+runs on the same machine compare against it. An explicit ``--baseline`` that
+doesn't exist is an error.
+"""
+
+import gc
+import hashlib
+import json
+import time
+import tracemalloc
+from datetime import date
+from decimal import Decimal
+from pathlib import Path
+from typing import Callable, Dict, List
+
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+
+from accounts.models import DeveloperProfile
+from projects.models import Project, ProjectApplication
+
+
+DEFAULT_BASELINE = Path(settings.BASE_DIR) / 'benchmarks' / 'matcher_baseline.json'
+
+SKILLS = [
+    'react', 'django', 'python', 'postgres', 'vue', 'angular', 'node.js', 'typescript', 'go', 'rust',
+    'aws', 'docker', 'kubernetes', 'figma', 'flutter', 'swift', 'kotlin', 'graphql', 'redis', 'tailwind',
+]
+WORDS = (
+    'build deliver experience team project client api design frontend backend scalable tested '
+    'deploy maintain performance secure responsive database integration timeline budget quality '
+    'communication agile review feature mobile web dashboard payment auth cloud migrate'
+).split()
+# Compared against the baseline; p99 of a few dozen samples is too noisy to gate on
+GATED_STATS = ('p50_ms', 'p95_ms')
+
+
+class StubEmbedder:
+    """Deterministic, model-free embedder: one pseudo-random unit vector per text."""
+    name = 'benchmark-stub'
+
+    def __init__(self, dim: int = 384):
+        self.dim = dim
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        vectors = np.stack([
+            np.random.default_rng(int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'little'))
+            .standard_normal(self.dim).astype(np.float32)
+            for text in texts
+        ])
+        vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors[0] if single else vectors
+
+
+def latency_stats(samples: List[float], items: int = 1) -> Dict[str, float]:
+    """Percentiles in ms and throughput in items per second for per-call durations in seconds."""
+    ms = np.array(samples) * 1000
+    return {
+        'calls': len(samples),
+        'p50_ms': round(float(np.percentile(ms, 50)), 3),
+        'p95_ms': round(float(np.percentile(ms, 95)), 3),
+        'p99_ms': round(float(np.percentile(ms, 99)), 3),
+        'throughput_per_s': round(items * len(samples) / max(float(np.sum(samples)), 1e-9), 1),
+    }
+
+
+def timed(fn: Callable, repeats: int, before: Callable = None) -> List[float]:
+    """Durations of ``repeats`` calls; garbage from earlier calls is collected untimed."""
+    samples = []
+    for _ in range(repeats):
+        if before is not None:
+            before()
+        gc.collect()
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def build_marketplace(sizes: List[int], seed: int) -> Dict[int, Project]:
+    """
+    One project per size, applied to by the first ``size`` developers; every
+    third developer also has a selected application on an older project.
+    """
+    rng = np.random.default_rng(seed)
+    company = User.objects.create(username='benchmark-company')
+    start = date(2026, 1, 1)
+
+    def project(i: int, title: str) -> Project:
+        stack = list(rng.choice(SKILLS, size=int(rng.integers(2, 6)), replace=False))
+        return Project.objects.create(
+            company=company, title=title, description=' '.join(rng.choice(WORDS, size=60)),
+            category='web', tech_stack=stack, complexity='medium', start_date=start, deadline=start,
+            budget_min=Decimal(int(rng.integers(20, 80))), budget_max=Decimal(int(rng.integers(80, 200))),
+            status='open',
+        )
+
+    n = max(sizes)
+    users = User.objects.bulk_create([
+        User(username=f'benchmark-dev-{i}', first_name=f'Dev{i}', last_name='Bench') for i in range(n)
+    ])
+    DeveloperProfile.objects.bulk_create([
+        DeveloperProfile(
+            user=user, title='Software Developer', bio=' '.join(rng.choice(WORDS, size=int(rng.integers(5, 40)))),
+            skills=', '.join(rng.choice(SKILLS, size=int(rng.integers(0, 8)), replace=False)),
+            experience='intermediate', years_experience=int(rng.integers(0, 15)),
+            rating=Decimal(str(round(float(rng.uniform(0, 5)), 2))),
+            success_rate=Decimal(str(round(float(rng.uniform(0, 100)), 2))),
+            total_projects=int(rng.integers(0, 60)),
+        )
+        for user in users
+    ], batch_size=1000)
+
+    history = project(0, 'Past work')
+    ProjectApplication.objects.bulk_create([
+        ProjectApplication(project=history, developer=user, cover_letter='past', estimated_duration='1 month',
+                           status='selected')
+        for user in users[::3]
+    ], batch_size=1000)
+
+    projects = {}
+    for size in sizes:
+        projects[size] = project(size, f'Benchmark project ({size} applicants)')
+        ProjectApplication.objects.bulk_create([
+            ProjectApplication(
+                project=projects[size], developer=user,
+                cover_letter=' '.join(rng.choice(WORDS, size=int(rng.integers(0, 400)))),
+                proposed_rate=None if rng.random() < 0.2 else Decimal(int(rng.integers(15, 250))),
+                estimated_duration='2 weeks',
+            )
+            for user in users[:size]
+        ], batch_size=1000)
+    return projects
+
+
+class Command(BaseCommand):
+    help = 'Benchmark rank_freelancers and get_match_details on synthetic marketplaces'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--sizes', nargs='+', type=int, default=[10, 100, 1000],
+                            help='Applicants per benchmark project')
+        parser.add_argument('--repeats', type=int, default=20, help='Timed calls per scenario')
+        parser.add_argument('--embedder', choices=['stub', 'real'], default='stub',
+                            help='Deterministic stub vectors, or the configured BERT embedder')
+        parser.add_argument('--seed', type=int, default=0)
+        parser.add_argument('--baseline', help=f'Baseline JSON to compare against (default: {DEFAULT_BASELINE}, '
+                                               'compared only once recorded on this machine; '
+                                               'a missing explicit path is an error)')
+        parser.add_argument('--save-baseline', action='store_true', help='Write the results as the new baseline')
+        parser.add_argument('--tolerance', type=float, default=0.25,
+                            help='Allowed fractional increase over the baseline')
+        parser.add_argument('--min-delta-ms', type=float, default=1.0,
+                            help='Ignore latency increases smaller than this (timer noise on tiny sizes)')
+        parser.add_argument('--output', help='Also write the results to this JSON file')
+
+    def handle(self, *args, **options):
+        sizes = sorted(set(options['sizes']))
+        if not sizes or min(sizes) < 1:
+            raise CommandError('--sizes must be positive')
+        baseline_path = Path(options['baseline'] or DEFAULT_BASELINE)
+        if options['baseline'] and not options['save_baseline'] and not baseline_path.exists():
+            # A gate pointed at a missing file must not pass silently
+            raise CommandError(f'Baseline {baseline_path} does not exist; record it with --save-baseline')
+
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with override_settings(MATCHER_EMBEDDING_CACHE_PATH=''):
+                results = self.run(sizes, options)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        report = {'embedder': options['embedder'], 'repeats': options['repeats'], 'sizes': results}
+        if options['output']:
+            Path(options['output']).write_text(json.dumps(report, indent=2) + '\n')
+
+        if options['save_baseline']:
+            baseline_path.parent.mkdir(parents=True, exist_ok=True)
+            baseline_path.write_text(json.dumps(report, indent=2) + '\n')
+            self.stdout.write(self.style.SUCCESS(f'✓ Baseline written to {baseline_path}'))
+        elif baseline_path.exists():
+            self.compare(report, json.loads(baseline_path.read_text()), options['tolerance'], options['min_delta_ms'])
+        else:
+            self.stdout.write(self.style.WARNING(
+                f'⚠ No baseline recorded on this machine at {baseline_path}; '
+                'run with --save-baseline to record one'
+            ))
+
+    def run(self, sizes: List[int], options) -> Dict[str, Dict]:
+        from projects.matcher import FreelancerMatcher
+
+        self.stdout.write(f'Generating marketplace for sizes {sizes}...')
+        projects = build_marketplace(sizes, options['seed'])
+        matcher = FreelancerMatcher(embedder=StubEmbedder() if options['embedder'] == 'stub' else None)
+        if matcher.embedder is None:
+            raise CommandError('No embedder available; use --embedder stub')
+        repeats = options['repeats']
+        rng = np.random.default_rng(options['seed'])
+
+        results = {}
+        for size in sizes:
+            project = projects[size]
+            application_ids = list(ProjectApplication.objects.filter(project=project).values_list('id', flat=True))
+
+            # Fully cold ranking (embeddings too), then again under tracemalloc,
+            # which slows allocation-heavy code too much to share the timing run
+            cold = [matcher.embedding_cache.memory.clear, matcher.result_cache.clear]
+            first_ms = timed(lambda: matcher.rank_freelancers(project), 1,
+                             before=lambda: [clear() for clear in cold])[0] * 1000
+            for clear in cold:
+                clear()
+            tracemalloc.start()
+            matcher.rank_freelancers(project)
+            peak_mb = tracemalloc.get_traced_memory()[1] / 2 ** 20
+            tracemalloc.stop()
+
+            rank = timed(lambda: matcher.rank_freelancers(project), repeats, before=matcher.result_cache.clear)
+            cached = timed(lambda: matcher.rank_freelancers(project), repeats)
+            sample = iter(rng.choice(application_ids, size=repeats))
+            details = timed(
+                lambda: matcher.get_match_details(
+                    ProjectApplication.objects.select_related('project', 'developer__developerprofile')
+                    .get(id=int(next(sample)))
+                ),
+                repeats, before=matcher.result_cache.clear,
+            )
+
+            results[str(size)] = {
+                'first_rank_ms': round(first_ms, 3),
+                'peak_memory_mb': round(peak_mb, 2),
+                'rank': latency_stats(rank, items=size),
+                'rank_cached': latency_stats(cached, items=size),
+                'match_details': latency_stats(details),
+            }
+            self.print_size(size, results[str(size)])
+        return results
+
+    def print_size(self, size: int, result: Dict):
+        self.stdout.write(self.style.SUCCESS(
+            f'\n{size} applicants: first ranking {result["first_rank_ms"]:.1f} ms, '
+            f'peak memory {result["peak_memory_mb"]:.1f} MB'
+        ))
+        self.stdout.write(f'  {"scenario":14s} {"p50 ms":>9s} {"p95 ms":>9s} {"p99 ms":>9s} {"items/s":>11s}')
+        for scenario in ('rank', 'rank_cached', 'match_details'):
+            stats = result[scenario]
+            self.stdout.write(f'  {scenario:14s} {stats["p50_ms"]:9.2f} {stats["p95_ms"]:9.2f} '
+                              f'{stats["p99_ms"]:9.2f} {stats["throughput_per_s"]:11.1f}')
+
+    def compare(self, report: Dict, baseline: Dict, tolerance: float, min_delta_ms: float):
+        if baseline.get('embedder') != report['embedder']:
+            raise CommandError(f'Baseline was recorded with the {baseline.get("embedder")} embedder, '
+                               f'not {report["embedder"]}')
+
+        regressions = []
+        for size, result in report['sizes'].items():
+            expected = baseline['sizes'].get(size)
+            if expected is None:
+                self.stdout.write(self.style.WARNING(f'⚠ No baseline for {size} applicants'))
+                continue
+            checks = [(f'{size} peak_memory_mb', result['peak_memory_mb'], expected['peak_memory_mb'], 0)]
+            checks += [
+                (f'{size} {scenario} {stat}', result[scenario][stat], expected[scenario][stat], min_delta_ms)
+                for scenario in ('rank', 'rank_cached', 'match_details') for stat in GATED_STATS
+            ]
+            for label, value, reference, min_delta in checks:
+                if value > reference * (1 + tolerance) and value - reference > min_delta:
+                    regressions.append(f'{label}: {value:.2f} vs baseline {reference:.2f} '
+                                       f'(+{(value / reference - 1) * 100:.0f}%)')
+
+        if regressions:
+            raise CommandError(f'Matcher regressed beyond {tolerance:.0%} of the baseline:\n  '
+                               + '\n  '.join(regressions))
+        self.stdout.write(self.style.SUCCESS(f'✓ Within {tolerance:.0%} of the baseline'))
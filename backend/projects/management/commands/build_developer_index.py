@@ -0,0 +1,30 @@
+"""
+Management command to rebuild the developer search index from Supabase.
+Usage: python manage.py build_developer_index [--batch-size 1024]
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.supabase_client import get_supabase_client
+from projects.developer_index import fetch_developer_profiles, get_developer_index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the ANN index of developer profile embeddings used by talent search'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=1024,
+                            help='Profiles embedded per encoder call')
+
+    def handle(self, *args, **options):
+        start = time.perf_counter()
+        index = get_developer_index()
+        profiles = fetch_developer_profiles(get_supabase_client())
+        count = index.rebuild(profiles, batch_size=options['batch_size'])
+        trained = index.index is not None and index.index.centroids is not None
+        self.stdout.write(self.style.SUCCESS(
+            f'Indexed {count} developer profiles in {time.perf_counter() - start:.1f}s '
+            f'({"IVF" if trained else "exact scan"}) -> {index.path}'
+        ))
@@ -0,0 +1,84 @@
+"""
+Management command that guards Django startup time.
+Usage: python manage.py check_import_time [--budget-ms 2000] [--commands check showmigrations]
+
+Runs each management command in a fresh interpreter under ``python -X importtime``
+and fails if its total import time exceeds the budget, or if it imports any of
+the ML stack (torch, sentence_transformers, ...), which must only be loaded by
+the first scoring call.
+"""
+
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+# Modules that non-ML commands must never import
+ML_MODULES = ('torch', 'sentence_transformers', 'transformers', 'sklearn')
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Dict[str, float]]:
+    """
+    Parse ``-X importtime`` output.
+
+    Returns:
+        Total import time in ms (sum of top-level cumulative times) and the
+        cumulative ms of every imported module
+    """
+    total_us = 0
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        _, cumulative, name_field = line.split('|', 2)
+        name = name_field.strip()
+        # One separator space, then two spaces per nesting level (top level is 1)
+        depth = (len(name_field) - len(name_field.lstrip()) - 1) // 2
+        modules[name] = int(cumulative) / 1000
+        if depth == 1:
+            total_us += int(cumulative)
+    return total_us / 1000, modules
+
+
+class Command(BaseCommand):
+    help = 'Fail if non-ML management commands exceed the import-time budget or import the ML stack'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--budget-ms', type=float, default=2000,
+                            help='Maximum total import time per command')
+        parser.add_argument('--commands', nargs='+', default=['check', 'showmigrations'],
+                            help='Management commands to measure')
+
+    def measure(self, command: str) -> Tuple[float, Dict[str, float]]:
+        result = subprocess.run(
+            [sys.executable, '-X', 'importtime', 'manage.py', *command.split()],
+            cwd=settings.BASE_DIR, capture_output=True, text=True,
+        )
+        if result.returncode != 0:
+            raise CommandError(f'"manage.py {command}" failed:\n{result.stderr[-2000:]}')
+        return parse_importtime(result.stderr)
+
+    def handle(self, *args, **options):
+        budget = options['budget_ms']
+        failures: List[str] = []
+
+        for command in options['commands']:
+            total_ms, modules = self.measure(command)
+            ml_imports = sorted(name for name in modules if name.split('.')[0] in ML_MODULES)
+            slowest = sorted(modules.items(), key=lambda item: -item[1])[:5]
+
+            self.stdout.write(f'manage.py {command}: {total_ms:.0f} ms of imports (budget {budget:.0f} ms)')
+            for name, ms in slowest:
+                self.stdout.write(f'    {ms:8.1f} ms  {name}')
+
+            if total_ms > budget:
+                failures.append(f'"{command}" spent {total_ms:.0f} ms importing (budget {budget:.0f} ms)')
+            if ml_imports:
+                failures.append(f'"{command}" imported the ML stack: {", ".join(ml_imports[:5])}')
+
+        if failures:
+            raise CommandError('Import-time budget exceeded:\n  ' + '\n  '.join(failures))
+        self.stdout.write(self.style.SUCCESS('✓ Import-time budget met'))
@@ -0,0 +1,148 @@
+"""
+Management command to export the matcher's SentenceTransformer to int8 ONNX.
+Usage: python manage.py export_onnx_embedder [--model all-MiniLM-L6-v2] [--tolerance 0.02] [--check-only]
+
+Exports the transformer with torch.onnx, quantizes its weights to int8 with
+onnxruntime, then checks parity against the torch backend on a sample of
+project and developer texts. The ONNX backend refuses to load an export
+that has not passed the check.
+"""
+
+import json
+import os
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.embedders import (
+    DEFAULT_MODEL_NAME, ONNX_CONFIG_FILE, ONNX_MODEL_FILE, ONNX_TOKENIZER_FILE,
+    OnnxEmbedder, TorchEmbedder, embedding_parity, onnx_model_dir,
+)
+
+
+SAMPLE_TEXTS = [
+    'Build E-commerce Platform Build a modern e-commerce platform with React frontend, '
+    'Node.js backend, MongoDB database and Stripe payments React Node.js MongoDB Stripe',
+    'Mobile App UI/UX Design Design the interface of a fitness tracking app Figma Prototyping',
+    'Data pipeline for analytics Ingest events into a warehouse and build dashboards Python Airflow SQL',
+    'Senior Full-Stack Developer Ten years shipping Django and React products Python, Django, React, PostgreSQL',
+    'iOS Developer I build native apps in Swift with a focus on accessibility Swift, SwiftUI, Xcode',
+    'Machine learning engineer NLP, recommendation systems and model serving PyTorch, ONNX, Python',
+    'I have built three similar stores and can deliver the MVP in four weeks with tests and CI.',
+    'Hi',
+    'Experienced designer. ' * 60,
+]
+
+
+def embedding_dimension(model) -> int:
+    # Renamed in newer sentence-transformers releases
+    getter = getattr(model, 'get_embedding_dimension', None) or model.get_sentence_embedding_dimension
+    return getter()
+
+
+class Command(BaseCommand):
+    help = 'Export the matcher embedder to an int8-quantized ONNX model and verify parity with torch'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--model', default=DEFAULT_MODEL_NAME, help='SentenceTransformer model name or path')
+        parser.add_argument('--tolerance', type=float, default=0.02,
+                            help='Maximum allowed cosine-similarity difference from the torch backend')
+        parser.add_argument('--check-only', action='store_true', help='Re-run the parity check on an existing export')
+        parser.add_argument('--opset', type=int, default=17)
+
+    def handle(self, *args, **options):
+        model_name = options['model']
+        model_dir = onnx_model_dir(model_name)
+        reference = TorchEmbedder(model_name)
+
+        if not options['check_only']:
+            self.export(reference, model_dir, options['opset'])
+
+        config_path = os.path.join(model_dir, ONNX_CONFIG_FILE)
+        if not os.path.exists(config_path):
+            raise CommandError(f'No ONNX export in {model_dir}')
+        with open(config_path) as f:
+            config = json.load(f)
+
+        candidate = OnnxEmbedder(model_name, model_dir=model_dir, require_parity=False)
+        parity = embedding_parity(reference, candidate, SAMPLE_TEXTS)
+
+        passed = parity['max_similarity_error'] <= options['tolerance']
+        config.update(parity_passed=passed, parity=parity, tolerance=options['tolerance'])
+        self.write_config(config_path, config)
+
+        self.stdout.write(
+            f"Parity: max similarity error {parity['max_similarity_error']:.4f} "
+            f"(tolerance {options['tolerance']}), min self-cosine {parity['min_self_cosine']:.4f}"
+        )
+        if not passed:
+            raise CommandError('ONNX export is outside the parity tolerance; the onnx backend will not load it')
+
+        texts = SAMPLE_TEXTS * 20
+        for label, embedder in (('torch', reference), ('onnx-int8', candidate)):
+            start = time.perf_counter()
+            embedder.encode(texts, batch_size=32)
+            elapsed = time.perf_counter() - start
+            self.stdout.write(f'  {label:10s} {len(texts) / elapsed:8.1f} texts/s')
+        self.stdout.write(self.style.SUCCESS(f'✓ ONNX embedder ready in {model_dir}'))
+
+    @staticmethod
+    def write_config(path, config):
+        with open(path, 'w') as f:
+            json.dump(config, f, indent=2)
+
+    def export(self, reference: TorchEmbedder, model_dir: str, opset: int):
+        import torch
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        model = reference.model
+        transformer = model[0]
+        pooling = model[1] if len(model) > 1 else None
+        mean_pooling = (getattr(pooling, 'pooling_mode', 'mean') == 'mean'
+                        and getattr(pooling, 'pooling_mode_mean_tokens', True))
+        if pooling is not None and not mean_pooling:
+            raise CommandError('Only mean-pooling SentenceTransformers can be exported')
+        normalize = any(type(module).__name__ == 'Normalize' for module in model)
+
+        os.makedirs(model_dir, exist_ok=True)
+        tokenizer = transformer.tokenizer
+        tokenizer.save_pretrained(model_dir)
+        if not os.path.exists(os.path.join(model_dir, ONNX_TOKENIZER_FILE)):
+            raise CommandError('Model has no fast tokenizer (tokenizer.json); cannot export')
+
+        class LastHiddenState(torch.nn.Module):
+            def __init__(self, auto_model):
+                super().__init__()
+                self.auto_model = auto_model
+
+            def forward(self, input_ids, attention_mask, token_type_ids):
+                return self.auto_model(input_ids=input_ids, attention_mask=attention_mask,
+                                       token_type_ids=token_type_ids)[0]
+
+        sample = tokenizer(['export sample'], return_tensors='pt')
+        token_type_ids = sample.get('token_type_ids', torch.zeros_like(sample['input_ids']))
+        fp32_path = os.path.join(model_dir, 'model_fp32.onnx')
+        dynamic = {0: 'batch', 1: 'sequence'}
+        wrapper = LastHiddenState(transformer.auto_model).eval()
+        with torch.no_grad():
+            torch.onnx.export(
+                wrapper, (sample['input_ids'], sample['attention_mask'], token_type_ids), fp32_path,
+                input_names=['input_ids', 'attention_mask', 'token_type_ids'],
+                output_names=['last_hidden_state'],
+                dynamic_axes={'input_ids': dynamic, 'attention_mask': dynamic, 'token_type_ids': dynamic,
+                              'last_hidden_state': dynamic},
+                opset_version=opset,
+                dynamo=False,
+            )
+        quantize_dynamic(fp32_path, os.path.join(model_dir, ONNX_MODEL_FILE), weight_type=QuantType.QInt8)
+        os.remove(fp32_path)
+
+        self.write_config(os.path.join(model_dir, ONNX_CONFIG_FILE), {
+            'model_name': reference.model_name,
+            'max_seq_length': model.max_seq_length,
+            'dim': embedding_dimension(model),
+            'normalize': normalize,
+            'pad_token_id': tokenizer.pad_token_id or 0,
+            'parity_passed': False,
+        })
+        self.stdout.write(f'Exported {reference.model_name} to {model_dir}')
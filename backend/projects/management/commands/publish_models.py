@@ -0,0 +1,68 @@
+"""
+Management command to publish matcher models to the versioned registry.
+Usage: python manage.py publish_models --name <name> [--source <dir>] [--no-activate]
+       python manage.py publish_models --activate <name>
+       python manage.py publish_models --list
+
+Reads ``gb_classifier.pkl``, ``rf_classifier.pkl``, ``feature_scaler.pkl``
+and ``model_metadata.json`` from ``--source`` (default ``ml_models/``), stores
+them under ``MATCHER_MODEL_REGISTRY/<name>`` as joblib files plus the
+compiled NumPy arrays workers load (see ``projects/tree_ensemble.py``), and
+switches ``CURRENT`` to it. Running workers pick the new version up within
+``MATCHER_MODEL_POLL_SECONDS`` without a restart. ``--activate`` points
+``CURRENT`` back at an earlier version (rollback).
+"""
+
+import os
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.model_registry import (
+    current_version, list_versions, load_legacy_models, publish_models, registry_dir, set_current,
+)
+
+
+class Command(BaseCommand):
+    help = 'Publish matcher models as a new registry version, or switch the version in service'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--name', help='Name of the new model version')
+        parser.add_argument('--source', default=os.path.join(settings.BASE_DIR, 'ml_models'),
+                            help='Directory holding the trained pickles and model_metadata.json')
+        parser.add_argument('--no-activate', action='store_true', help='Publish without putting it in service')
+        parser.add_argument('--activate', metavar='VERSION', help='Put an already published version in service')
+        parser.add_argument('--list', action='store_true', help='List published versions')
+
+    def handle(self, *args, **options):
+        root = registry_dir()
+
+        if options['list']:
+            current = current_version(root)
+            for version in list_versions(root):
+                self.stdout.write(f"{'*' if version == current else ' '} {version}")
+            return
+
+        if options['activate']:
+            try:
+                set_current(root, options['activate'])
+            except ValueError as e:
+                raise CommandError(str(e))
+            self.stdout.write(self.style.SUCCESS(f"✓ {options['activate']} is now in service"))
+            return
+
+        if not options['name']:
+            raise CommandError('Pass --name, --activate or --list')
+        try:
+            loaded = load_legacy_models(options['source'])
+        except Exception as e:
+            raise CommandError(f"Could not load models from {options['source']}: {e}")
+        if loaded is None:
+            raise CommandError(f"Model files not found in {options['source']}")
+
+        try:
+            directory = publish_models(root, options['name'], *loaded, activate=not options['no_activate'])
+        except ValueError as e:
+            raise CommandError(str(e))
+        state = 'published' if options['no_activate'] else 'published and in service'
+        self.stdout.write(self.style.SUCCESS(f"✓ {options['name']} {state} ({directory})"))
@@ -0,0 +1,83 @@
+"""
+Management command to re-rank the applicants of many projects at once.
+Usage: python manage.py rank_projects [--status open] [--project <id> ...] [--chunk 500]
+                                      [--workers N] [--save]
+
+Projects are ranked ``--chunk`` at a time with ``FreelancerMatcher.rank_projects``:
+each distinct text in a chunk is encoded once (and later chunks reuse the
+embedding cache), and the projects are scored in ``--workers`` processes
+over shared embeddings. With ``--save`` every pending application's
+``match_score`` and component scores are stored on its row; applications
+with ``manual_override`` set are left alone. Meant for a nightly job after
+a model or scoring change.
+"""
+
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from projects.matcher import get_matcher
+from projects.models import Project, ProjectApplication
+
+
+# Component scores stored on ProjectApplication, by component name
+SCORE_FIELDS = {
+    'skill_match': 'skill_match_score',
+    'experience_fit': 'experience_fit_score',
+    'portfolio_quality': 'portfolio_quality_score',
+}
+
+
+class Command(BaseCommand):
+    help = "Rank every project's pending applicants in parallel batches"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--status', default='open', help='Rank projects with this status (default: open)')
+        parser.add_argument('--project', type=int, nargs='+', help='Only rank these project ids')
+        parser.add_argument('--chunk', type=int, default=500, help='Projects ranked per pass')
+        parser.add_argument('--workers', type=int, default=getattr(settings, 'MATCHER_RANKING_WORKERS', 0),
+                            help='Scoring processes (0: every available CPU)')
+        parser.add_argument('--save', action='store_true', help='Store the scores on the applications')
+
+    def handle(self, *args, **options):
+        projects = Project.objects.order_by('id')
+        if options['project']:
+            projects = projects.filter(id__in=options['project'])
+        else:
+            projects = projects.filter(status=options['status'])
+        project_ids = list(projects.values_list('id', flat=True))
+        chunk = max(options['chunk'], 1)
+
+        matcher = get_matcher()
+        start = time.perf_counter()
+        ranked = saved = 0
+        for i in range(0, len(project_ids), chunk):
+            rankings = matcher.rank_projects(project_ids[i:i + chunk], top_n=2 ** 31, workers=options['workers'])
+            results = [result for ranking in rankings.values() for result in ranking]
+            ranked += len(results)
+            if options['save']:
+                saved += self.save(results)
+            self.stdout.write(f'  {min(i + chunk, len(project_ids))}/{len(project_ids)} projects, '
+                              f'{ranked} applications, {time.perf_counter() - start:.1f}s')
+
+        summary = f'Ranked {ranked} applications in {len(project_ids)} projects in {time.perf_counter() - start:.1f}s'
+        if options['save']:
+            summary += f'; stored {saved} scores'
+        self.stdout.write(self.style.SUCCESS(summary))
+
+    def save(self, results) -> int:
+        by_id = {result['application_id']: result for result in results}
+        applications = list(ProjectApplication.objects.filter(id__in=by_id, manual_override=False))
+        for application in applications:
+            result = by_id[application.id]
+            application.match_score = result['overall_score']
+            for component, field in SCORE_FIELDS.items():
+                setattr(application, field, round(result['component_scores'][component]))
+        with transaction.atomic():
+            # bulk_update skips auto_now, so updated_at (part of cached results' versions) is kept
+            ProjectApplication.objects.bulk_update(
+                applications, ['match_score', *SCORE_FIELDS.values()], batch_size=1000
+            )
+        return len(applications)
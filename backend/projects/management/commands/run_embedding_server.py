@@ -0,0 +1,44 @@
+"""
+Management command to run the shared embedding sidecar.
+Usage: python manage.py run_embedding_server [--socket /run/devconnect/embeddings.sock]
+
+Loads the embedder selected by MATCHER_EMBEDDING_BACKEND once and serves it
+to every worker on the host over a Unix socket. Point the workers at it with
+MATCHER_EMBEDDING_SOCKET.
+"""
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from projects.embedders import DEFAULT_MODEL_NAME, build_embedder
+from projects.embedding_server import EmbeddingServer
+
+
+class Command(BaseCommand):
+    help = 'Serve matcher embeddings to all workers on this host over a Unix socket'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--socket', default=getattr(settings, 'MATCHER_EMBEDDING_SOCKET', ''),
+                            help='Unix socket path (default: MATCHER_EMBEDDING_SOCKET)')
+        parser.add_argument('--model', default=DEFAULT_MODEL_NAME)
+        parser.add_argument('--max-batch', type=int, default=getattr(settings, 'MATCHER_ENCODE_BATCH_SIZE', 64),
+                            help='Texts encoded together across clients')
+        parser.add_argument('--max-wait-ms', type=float, default=5,
+                            help='How long the first request of a batch waits for others')
+
+    def handle(self, *args, **options):
+        if not options['socket']:
+            raise CommandError('Pass --socket or set MATCHER_EMBEDDING_SOCKET')
+
+        embedder = build_embedder(options['model'], use_sidecar=False)
+        server = EmbeddingServer(options['socket'], embedder, max_batch=options['max_batch'],
+                                 max_wait_ms=options['max_wait_ms'])
+        self.stdout.write(self.style.SUCCESS(
+            f"✓ Serving {embedder.name} ({embedder.backend}) on {options['socket']}"
+        ))
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            server.server_close()
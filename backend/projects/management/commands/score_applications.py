@@ -0,0 +1,44 @@
+"""
+Management command to score Supabase applications that have no match score yet.
+Usage: python manage.py score_applications [--all] [--project <uuid>] [--developer <uuid>]
+
+Applications are normally scored in the background right after they are
+submitted and again when their project or developer changes; this backfills
+rows whose worker was lost (e.g. a restart), and with ``--all`` rescores
+every matching application, e.g. after a model change or a developer
+profile edit made outside the API. Applications with ``manual_override``
+set are never rescored.
+"""
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from accounts.supabase_client import get_supabase_client
+from projects.apply_scoring import ScoringInputs, score_applications
+
+
+class Command(BaseCommand):
+    help = 'Compute and store match scores for unscored Supabase applications'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--all', action='store_true', help='Rescore applications that already have a score')
+        parser.add_argument('--project', help='Only score applications to this project id')
+        parser.add_argument('--developer', help='Only score applications from this developer id')
+
+    def handle(self, *args, **options):
+        supabase = get_supabase_client()
+        query = supabase.table('project_applications').select('*')
+        if not options['all']:
+            query = query.is_('match_score', 'null')
+        if options['project']:
+            query = query.eq('project_id', options['project'])
+        if options['developer']:
+            query = query.eq('developer_id', options['developer'])
+        applications = query.execute().data or []
+
+        start = time.perf_counter()
+        updates = score_applications(ScoringInputs(supabase), applications)
+        self.stdout.write(self.style.SUCCESS(
+            f'Scored {len(updates)} of {len(applications)} applications in {time.perf_counter() - start:.1f}s'
+        ))
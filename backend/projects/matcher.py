@@ -410,20 +410,56 @@ Matches freelancers to projects based on:
 """
 
 import os
-import pickle
-import json
+import logging
+import threading
+import time
+from collections import OrderedDict
+
 import numpy as np
-from typing import List, Dict, Tuple, Optional
+from typing import Any, List, Dict, NamedTuple, Tuple, Optional
 from pathlib import Path
 
-from sentence_transformers import SentenceTransformer
 from django.conf import settings
+from django.db.models import Count, Max
 
 from accounts.models import DeveloperProfile
 from django.contrib.auth import get_user_model
 
 User = get_user_model()
 from projects.models import Project, ProjectApplication
+from projects.embedders import DEFAULT_MODEL_NAME, build_embedder
+from projects.encode_coalescer import CoalescingEmbedder
+from projects.embedding_cache import EmbeddingCache
+from projects.metrics import registry as metrics, span
+from projects.model_registry import ModelBundle, current_version, load_bundle, load_legacy, registry_dir
+from projects.result_cache import ResultCache, StoredRanking, version_stamp
+from projects.batch_ranking import ProjectScoringTask, score_projects
+from projects.scoring import (
+    BIN_SCORES, COMPONENT_NAMES, CandidateBatch, bins_to_scores, component_dicts, cosine_similarities,
+    developer_text, match_scores, normalize_skills, project_text,
+)
+from projects.skills import skill_breakdown, skill_vocabulary
+
+logger = logging.getLogger(__name__)
+
+
+class ServingModels(NamedTuple):
+    """
+    The models in service and the embedder whose similarities they were
+    trained on. A reload replaces the whole tuple, so a request that reads it
+    once never pairs a new embedder with the old models.
+    """
+    models: Optional[ModelBundle]
+    embedder: Any
+    embedder_name: Optional[str]
+    embedding_model_name: str
+    
+    @property
+    def version(self) -> str:
+        return '{}/{}'.format(
+            self.models.version if self.models is not None else 'components',
+            self.embedder_name if self.embedder is not None else 'no-embedder',
+        )
 
 
 class FreelancerMatcher:
@@ -431,95 +467,180 @@ class FreelancerMatcher:
     ML-based freelancer matching engine using BERT embeddings and trained classifiers.
     """
     
-    def __init__(self):
-        """Initialize the matcher with pre-trained models and embeddings."""
+    def __init__(self, embedder=None):
+        """
+        Initialize the matcher with pre-trained models and embeddings.
+        
+        ``embedder`` replaces the SentenceTransformer (tests, benchmarks); it
+        must provide ``encode(texts, batch_size=...)``.
+        """
         self.model_dir = os.path.join(settings.BASE_DIR, 'ml_models')
-        self.models_loaded = False
+        self.model_registry = registry_dir()
+        self.model_poll_seconds = getattr(settings, 'MATCHER_MODEL_POLL_SECONDS', 30)
+        self.serving = ServingModels(None, None, None, DEFAULT_MODEL_NAME)
+        self._next_model_check = 0.0
+        self._model_reload_thread = None
+        self._model_lock = threading.Lock()
+        self.embedding_cache = EmbeddingCache.from_settings()
+        self.encode_batch_size = getattr(settings, 'MATCHER_ENCODE_BATCH_SIZE', 64)
+        self.past_projects_cache_size = getattr(settings, 'MATCHER_PAST_PROJECTS_CACHE_SIZE', 10000)
+        # user id -> (freshness stamp, text)
+        self._past_projects_cache: 'OrderedDict[int, Tuple[Tuple, str]]' = OrderedDict()
+        self._past_projects_lock = threading.Lock()
+        self.result_cache = ResultCache(getattr(settings, 'MATCHER_RESULT_CACHE_SIZE', 512))
         self._load_models()
-        self._initialize_embedder()
+        # An injected embedder is kept across model reloads
+        self._embedder_injected = embedder is not None
+        if embedder is not None:
+            name = getattr(embedder, 'name', type(embedder).__name__)
+            self.serving = self.serving._replace(embedder=embedder, embedder_name=name, embedding_model_name=name)
+        else:
+            self._initialize_embedder()
+    
+    @property
+    def models(self) -> Optional[ModelBundle]:
+        return self.serving.models
+    
+    @property
+    def embedder(self):
+        return self.serving.embedder
+    
+    @property
+    def embedder_name(self) -> Optional[str]:
+        return self.serving.embedder_name
+    
+    @property
+    def embedding_model_name(self) -> str:
+        return self.serving.embedding_model_name
+    
+    @property
+    def models_loaded(self) -> bool:
+        return self.models is not None
+    
+    @property
+    def model_version(self) -> str:
+        """Tag of the models and embedder in service; part of every cached result's version stamp."""
+        return self.serving.version
     
     def _load_models(self):
-        """Load pre-trained classifiers and scaler from pickle files."""
+        """Load the registry's current model version, or the legacy pickles in ml_models/."""
+        version = current_version(self.model_registry)
+        self._model_target = version
         try:
-            gb_path = os.path.join(self.model_dir, 'gb_classifier.pkl')
-            rf_path = os.path.join(self.model_dir, 'rf_classifier.pkl')
-            scaler_path = os.path.join(self.model_dir, 'feature_scaler.pkl')
-            metadata_path = os.path.join(self.model_dir, 'model_metadata.json')
+            if version is not None:
+                models = load_bundle(self.model_registry, version)
+                logger.info('Models %s loaded from %s', version, self.model_registry)
+            else:
+                models = load_legacy(self.model_dir)
+                if models is None:
+                    logger.warning('Model files not found in %s; using fallback scoring', self.model_dir)
+                    return
+                logger.info('Models loaded from %s', self.model_dir)
+            logger.info('Expected feature dimensions: %s', models.n_features or 'unknown')
+            self.serving = self.serving._replace(models=models)
             
-            # Check if files exist
-            if not all(os.path.exists(p) for p in [gb_path, rf_path, scaler_path, metadata_path]):
-                print(f"⚠ Model files not found in {self.model_dir}. Using fallback scoring.")
-                self.models_loaded = False
+        except Exception as e:
+            logger.warning('Error loading models (%s); using fallback component-based scoring', e)
+    
+    def _check_model_update(self):
+        """
+        Start loading a newly published model version in the background.
+        
+        ``CURRENT`` is re-read at most every ``model_poll_seconds``; the
+        models in service keep scoring until the new bundle is warm and
+        replaces them in one assignment.
+        """
+        now = time.monotonic()
+        if self.model_poll_seconds <= 0 or now < self._next_model_check:
+            return
+        self._next_model_check = now + self.model_poll_seconds
+        version = current_version(self.model_registry)
+        if version is None or version == self._model_target:
+            return
+        with self._model_lock:
+            if self._model_reload_thread is not None and self._model_reload_thread.is_alive():
                 return
-            
-            with open(gb_path, 'rb') as f:
-                self.gb_model = pickle.load(f)
-            
-            with open(rf_path, 'rb') as f:
-                self.rf_model = pickle.load(f)
-            
-            with open(scaler_path, 'rb') as f:
-                self.scaler = pickle.load(f)
-            
-            with open(metadata_path, 'r') as f:
-                self.metadata = json.load(f)
-            
-            self.models_loaded = True
-            print("✓ Models loaded successfully")
-            print(f"  Expected feature dimensions: {self.metadata.get('n_features', 'unknown')}")
-            
+            self._model_target = version
+            self._model_reload_thread = threading.Thread(
+                target=self._reload_models, args=(version,), name='matcher-model-reload', daemon=True
+            )
+            self._model_reload_thread.start()
+    
+    def _reload_models(self, version: str):
+        start = time.perf_counter()
+        serving = self.serving
+        try:
+            bundle = load_bundle(self.model_registry, version)
+            bundle.warm_up()
+            model_name = self._embedding_model_name(bundle)
+            embedder = None
+            if not self._embedder_injected and model_name != serving.embedding_model_name:
+                # Trained on another encoder: its features need that encoder's similarities
+                embedder = self._build_embedder(model_name)
         except Exception as e:
-            print(f"⚠ Error loading models: {e}")
-            print("  Using fallback component-based scoring")
-            self.models_loaded = False
+            logger.warning('Error loading models %s, keeping %s: %s', version, serving.version, e)
+            # Retry on the next poll
+            self._model_target = serving.models.version if serving.models is not None else None
+            return
+        if embedder is None:
+            self.serving = serving._replace(models=bundle)
+        else:
+            self.serving = ServingModels(bundle, embedder, embedder.name, model_name)
+            # Requests still holding the old pair finish on it; its dispatcher thread stops
+            # so the old model can be freed
+            close = getattr(serving.embedder, 'close', None)
+            if close is not None:
+                close()
+            logger.info('BERT embedder switched to %s for models %s', model_name, version)
+        logger.info('Models %s in service after %.2fs', version, time.perf_counter() - start)
+    
+    @staticmethod
+    def _embedding_model_name(models: Optional[ModelBundle]) -> str:
+        """Sentence encoder the models were trained with (from their metadata)."""
+        if models is None:
+            return DEFAULT_MODEL_NAME
+        return models.metadata.get('embedding_model_name') or DEFAULT_MODEL_NAME
+    
+    def _build_embedder(self, model_name: str):
+        # Backends import torch/onnxruntime in their constructors, so loading
+        # Django (and every management command) doesn't pay for them
+        embedder = build_embedder(model_name)
+        coalesce_ms = getattr(settings, 'MATCHER_ENCODE_COALESCE_MS', 2)
+        if coalesce_ms > 0:
+            # Concurrent requests share embedder calls instead of each encoding a few texts
+            embedder = CoalescingEmbedder(embedder, max_batch=self.encode_batch_size, max_wait_ms=coalesce_ms)
+        return embedder
     
     def _initialize_embedder(self):
         """Initialize BERT embedder for semantic similarity."""
+        model_name = self._embedding_model_name(self.models)
+        self.serving = self.serving._replace(embedding_model_name=model_name)
         try:
-            model_name = getattr(self, 'metadata', {}).get('embedding_model_name', 'all-MiniLM-L6-v2')
-            self.embedder = SentenceTransformer(model_name)
-            print(f"✓ BERT embedder initialized: {model_name}")
+            embedder = self._build_embedder(model_name)
+            self.serving = self.serving._replace(embedder=embedder, embedder_name=embedder.name)
+            logger.info('BERT embedder initialized: %s (%s)', model_name, embedder.backend)
         except Exception as e:
-            print(f"⚠ Error initializing embedder: {e}")
-            self.embedder = None
+            logger.warning('Error initializing embedder: %s', e)
     
     def _extract_features(self, project: Project, developer: DeveloperProfile, 
-                         application: ProjectApplication) -> np.ndarray:
+                         application: ProjectApplication,
+                         similarities: Optional[np.ndarray] = None) -> np.ndarray:
         """
         Extract features from project-freelancer-application triplet.
+        
+        Scalar reference for ``CandidateBatch.feature_matrix``, which the
+        ranking path uses; kept for parity tests.
+        
+        ``similarities`` are the precomputed project-developer, project-proposal
+        and project-portfolio cosine similarities from the batched ranking path.
         """
         
-        # Prepare text inputs
-        project_text = f"{project.title} {project.description} {' '.join(project.tech_stack)}"
-        developer_text = f"{developer.title} {developer.bio} {developer.skills}"
-        past_projects_text = self._get_developer_past_projects(developer.user)
         proposal_text = application.cover_letter
         
-        # 1. Get BERT embeddings (if available)
-        if self.embedder is not None:
-            try:
-                project_emb = self.embedder.encode(project_text)
-                developer_emb = self.embedder.encode(developer_text)
-                proposal_emb = self.embedder.encode(proposal_text)
-                past_projects_emb = self.embedder.encode(past_projects_text) if past_projects_text else np.zeros_like(project_emb)
-                
-                # Calculate cosine similarities
-                project_developer_sim = self._cosine_similarity(project_emb, developer_emb)
-                project_proposal_sim = self._cosine_similarity(project_emb, proposal_emb)
-                project_portfolio_sim = self._cosine_similarity(project_emb, past_projects_emb)
-            except Exception as e:
-                print(f"⚠ Error computing embeddings: {e}")
-                project_developer_sim = 0.5
-                project_proposal_sim = 0.5
-                project_portfolio_sim = 0.5
-                project_emb = np.zeros(384)
-                developer_emb = np.zeros(384)
-        else:
-            project_developer_sim = 0.5
-            project_proposal_sim = 0.5
-            project_portfolio_sim = 0.5
-            project_emb = np.zeros(384)
-            developer_emb = np.zeros(384)
+        # 1. Semantic similarities from BERT embeddings
+        if similarities is None:
+            similarities = self._embedding_similarities(project, [(developer, application)])[0]
+        project_developer_sim, project_proposal_sim, project_portfolio_sim = (float(s) for s in similarities)
         
         # 2. Skill overlap calculation
         required_skills = set(self._normalize_skills(project.tech_stack))
@@ -573,6 +694,85 @@ class FreelancerMatcher:
         
         return features
     
+    def embed_texts(self, texts: List[str]) -> np.ndarray:
+        """Public entry point for services that need matcher-compatible embeddings."""
+        serving = self.serving
+        if serving.embedder is None:
+            raise RuntimeError('Embedder is not available')
+        return self._encode_texts(texts, serving)
+    
+    def _encode_texts(self, texts: List[str], serving: Optional[ServingModels] = None) -> np.ndarray:
+        """Encode texts through the embedding cache; only cache misses reach the embedder."""
+        serving = serving if serving is not None else self.serving
+        return self.embedding_cache.encode(texts, serving.embedder_name,
+                                           lambda batch: self._encode_batch(batch, serving))
+    
+    def _encode_batch(self, texts: List[str], serving: Optional[ServingModels] = None) -> np.ndarray:
+        """Encode uncached texts in as few embedder calls as the batch size allows."""
+        serving = serving if serving is not None else self.serving
+        return serving.embedder.encode(texts, batch_size=self.encode_batch_size)
+    
+    def _encode_text(self, text: str, serving: Optional[ServingModels] = None) -> np.ndarray:
+        """Encode a single text through the embedding cache."""
+        return self._encode_texts([text], serving)[0]
+    
+    def _project_text(self, project: Project) -> str:
+        return project_text(project.title, project.description, project.tech_stack)
+    
+    def _developer_text(self, developer: DeveloperProfile) -> str:
+        return developer_text(developer.title, developer.bio, developer.skills)
+    
+    def _embedding_similarities(self, project: Project,
+                                candidates: List[Tuple[DeveloperProfile, ProjectApplication]],
+                                past_projects_texts: Optional[List[str]] = None,
+                                serving: Optional[ServingModels] = None) -> np.ndarray:
+        """
+        Compute semantic similarities for many applicants of one project.
+        
+        The project text is encoded once and all developer, proposal and
+        past-project texts go to the embedder together, so a ranking request
+        costs a couple of encoder calls regardless of the applicant count.
+        
+        ``past_projects_texts`` (one per candidate) replaces the lookup of
+        selected ORM applications, for candidates stored elsewhere.
+        ``serving`` is the request's snapshot of ``self.serving``.
+        
+        Returns:
+            ``(len(candidates), 3)`` array of project-developer,
+            project-proposal and project-portfolio cosine similarities
+        """
+        n = len(candidates)
+        serving = serving if serving is not None else self.serving
+        if serving.embedder is None:
+            return np.full((n, 3), 0.5)
+        
+        with span('text_assembly', items=n):
+            developer_texts = [self._developer_text(developer) for developer, _ in candidates]
+            proposal_texts = [application.cover_letter for _, application in candidates]
+        if past_projects_texts is None:
+            past_projects_by_user = self._get_past_projects_texts([developer.user_id for developer, _ in candidates])
+            past_projects_texts = [past_projects_by_user[developer.user_id] for developer, _ in candidates]
+        has_past_projects = np.array([bool(text) for text in past_projects_texts], dtype=bool)
+        
+        texts = developer_texts + proposal_texts + [text for text in past_projects_texts if text]
+        try:
+            with span('encoding', items=len(texts) + 1):
+                project_emb = self._encode_text(self._project_text(project), serving)
+                embeddings = self._encode_texts(texts, serving)
+        except Exception as e:
+            logger.warning("Error computing embeddings: %s", e)
+            return np.full((n, 3), 0.5)
+        
+        similarities = np.zeros((n, 3))
+        similarities[:, 0] = self._cosine_similarities(project_emb, embeddings[:n])
+        similarities[:, 1] = self._cosine_similarities(project_emb, embeddings[n:2 * n])
+        similarities[has_past_projects, 2] = self._cosine_similarities(project_emb, embeddings[2 * n:])
+        return similarities
+    
+    def _cosine_similarities(self, vec: np.ndarray, matrix: np.ndarray) -> np.ndarray:
+        """Cosine similarity between one vector and every row of a matrix."""
+        return cosine_similarities(vec, matrix)
+    
     def _cosine_similarity(self, vec1: np.ndarray, vec2: np.ndarray) -> float:
         """Calculate cosine similarity between two vectors."""
         norm1 = np.linalg.norm(vec1)
@@ -585,80 +785,162 @@ class FreelancerMatcher:
     
     def _normalize_skills(self, skills) -> List[str]:
         """Normalize skill strings to lowercase and split."""
-        if isinstance(skills, list):
-            return [s.strip().lower() for s in skills if s.strip()]
-        elif isinstance(skills, str):
-            return [s.strip().lower() for s in skills.replace(',', ' ').split() if s.strip()]
-        return []
+        return normalize_skills(skills)
     
     def _get_developer_past_projects(self, user: User) -> str:
         """Get developer's past project descriptions from applications."""
+        return self._get_past_projects_texts([user.id])[user.id]
+    
+    def _past_projects_stamps(self, user_ids: List[int]) -> Dict[int, Tuple]:
+        """
+        Freshness stamp of each developer's past projects, read from the DB.
+        
+        Count, last id and latest ``updated_at`` of their selected
+        applications and of those applications' projects, in one aggregate
+        query. Any selection, deselection or description edit (by any worker,
+        or straight in the database) changes it.
+        """
+        stamps = {uid: (0, None, None, None) for uid in user_ids}
         try:
-            past_projects = []
-            completed_apps = ProjectApplication.objects.filter(
-                developer=user,
-                status='selected'
-            ).select_related('project')[:10]
-            
-            for app in completed_apps:
-                past_projects.append(app.project.description)
-            
-            return ' '.join(past_projects) if past_projects else ""
+            with span('db_fetch', items=len(stamps)):
+                rows = ProjectApplication.objects.filter(
+                    developer_id__in=list(stamps), status='selected'
+                ).order_by().values('developer_id').annotate(
+                    count=Count('id'), last_id=Max('id'), updated=Max('updated_at'),
+                    project_updated=Max('project__updated_at'),
+                ).values_list('developer_id', 'count', 'last_id', 'updated', 'project_updated')
+                for developer_id, *stamp in rows:
+                    stamps[developer_id] = tuple(stamp)
         except Exception as e:
-            print(f"⚠ Error fetching past projects: {e}")
-            return ""
+            logger.warning("Error fetching past project stamps: %s", e)
+            # Matches no cached entry, so the texts are read instead
+            stamps = {uid: (-1,) for uid in stamps}
+        return stamps
     
-    def _predict_match_score(self, features: np.ndarray, component_scores: Dict[str, float]) -> int:
+    def _get_past_projects_texts(self, user_ids: List[int],
+                                 stamps: Optional[Dict[int, Tuple]] = None) -> Dict[int, str]:
+        """
+        Get past project descriptions for many developers.
+        
+        Cached texts are only used while their developer's freshness stamp
+        (``_past_projects_stamps``, or ``stamps`` if the caller already read
+        them) is unchanged; the selected-application history of all the
+        others is fetched in one query and grouped here.
+        """
+        unstamped = [uid for uid in user_ids if stamps is None or uid not in stamps]
+        if unstamped:
+            # E.g. an application that arrived after the caller read the stamps
+            stamps = {**(stamps or {}), **self._past_projects_stamps(unstamped)}
+        texts = {}
+        with self._past_projects_lock:
+            for uid in user_ids:
+                entry = self._past_projects_cache.get(uid)
+                if entry is not None and entry[0] == stamps[uid]:
+                    texts[uid] = entry[1]
+        # Developers without selected applications need no query
+        texts.update({uid: '' for uid in user_ids if uid not in texts and not stamps[uid][0]})
+        
+        missing = [uid for uid in dict.fromkeys(user_ids) if uid not in texts]
+        if missing:
+            past_projects = {uid: [] for uid in missing}
+            try:
+                with span('db_fetch', items=len(missing)):
+                    rows = ProjectApplication.objects.filter(
+                        developer_id__in=missing,
+                        status='selected'
+                    ).order_by('developer_id', 'id').values_list('developer_id', 'project__description')
+                    
+                    for developer_id, description in rows:
+                        if len(past_projects[developer_id]) < 10:  # Last 10 projects
+                            past_projects[developer_id].append(description)
+            except Exception as e:
+                logger.warning("Error fetching past projects: %s", e)
+                return {uid: texts.get(uid, "") for uid in user_ids}
+            
+            fetched = {uid: ' '.join(descriptions) for uid, descriptions in past_projects.items()}
+            texts.update(fetched)
+            with self._past_projects_lock:
+                self._past_projects_cache.update((uid, (stamps[uid], text)) for uid, text in fetched.items())
+                while len(self._past_projects_cache) > self.past_projects_cache_size:
+                    self._past_projects_cache.popitem(last=False)
+        
+        return {uid: texts[uid] for uid in user_ids}
+    
+    def _candidate_past_projects(self, candidates: List[Tuple[DeveloperProfile, ProjectApplication]],
+                                 stamps: Optional[Dict[int, Tuple]] = None) -> List[str]:
+        """Past-project text of each candidate, reusing freshness stamps read for the version."""
+        past_projects = self._get_past_projects_texts([developer.user_id for developer, _ in candidates], stamps)
+        return [past_projects[developer.user_id] for developer, _ in candidates]
+    
+    def invalidate_past_projects(self, user_id: int):
+        """Drop a developer's cached past-project text (stale entries are also caught by their stamp)."""
+        with self._past_projects_lock:
+            self._past_projects_cache.pop(user_id, None)
+    
+    BIN_SCORES = BIN_SCORES
+    
+    def _predict_match_score(self, features: np.ndarray, component_scores: Dict[str, float],
+                             serving: Optional[ServingModels] = None) -> int:
         """
         Predict match score using ML models or component scores as fallback.
         
+        Single-application wrapper around ``_predict_match_scores``.
         Returns score from 0-100.
         """
+        logger.debug("Component breakdown: Skill=%.1f, Exp=%.1f, Portfolio=%.1f, Proposal=%.1f, Rate=%.1f",
+                     component_scores['skill_match'], component_scores['experience_fit'],
+                     component_scores['portfolio_quality'], component_scores['proposal_quality'],
+                     component_scores['rate_fit'])
+        components = np.array([[component_scores[name] for name in COMPONENT_NAMES]])
+        return int(self._predict_match_scores(features.reshape(1, -1), components, serving)[0])
+    
+    def _predict_match_scores(self, features: np.ndarray, components: np.ndarray,
+                              serving: Optional[ServingModels] = None) -> np.ndarray:
+        """
+        Predict match scores for every applicant of a ranking request at once.
         
-        # ALWAYS use component scores as primary method
-        # This ensures transparent, explainable scoring
-        weighted_score = (
-            component_scores['skill_match'] * 0.35 +
-            component_scores['experience_fit'] * 0.25 +
-            component_scores['portfolio_quality'] * 0.20 +
-            component_scores['proposal_quality'] * 0.15 +
-            component_scores['rate_fit'] * 0.05
-        )
+        The scaler and both classifiers run once over the full feature matrix,
+        and the ensemble score is blended with the weighted component scores
+        in a single vector operation.
         
-        print(f"  Component breakdown: Skill={component_scores['skill_match']:.1f}, "
-              f"Exp={component_scores['experience_fit']:.1f}, "
-              f"Portfolio={component_scores['portfolio_quality']:.1f}, "
-              f"Proposal={component_scores['proposal_quality']:.1f}, "
-              f"Rate={component_scores['rate_fit']:.1f}")
-        print(f"  → Weighted score: {weighted_score:.1f}")
+        Args:
+            features: ``(N, 14)`` feature matrix
+            components: ``(N, 5)`` component-score matrix
+            serving: The request's snapshot of ``self.serving``
         
-        # If models are loaded, use them to adjust the score
-        if self.models_loaded:
-            try:
-                features_scaled = self.scaler.transform(features.reshape(1, -1))
-                
-                gb_bin = self.gb_model.predict(features_scaled)[0]
-                rf_bin = self.rf_model.predict(features_scaled)[0]
-                
-                bin_to_score = {0: 25, 1: 50, 2: 75, 3: 95}
-                gb_score = bin_to_score.get(gb_bin, 50)
-                rf_score = bin_to_score.get(rf_bin, 50)
-                
-                ml_score = (gb_score + rf_score) / 2
-                
-                # Blend ML score with component score (70% component, 30% ML)
-                final_score = weighted_score * 0.7 + ml_score * 0.3
-                print(f"  → ML adjustment: {ml_score:.1f}, Final: {final_score:.1f}")
-                
-                return int(round(final_score))
-            except Exception as e:
-                print(f"⚠ ML prediction failed: {e}, using component score")
+        Returns:
+            Integer scores from 0-100, one per row
+        """
         
-        return int(round(weighted_score))
+        with span('prediction', items=len(features)):
+            # ALWAYS use component scores as primary method
+            # This ensures transparent, explainable scoring
+            
+            # If models are loaded, use them to adjust the score; one bundle
+            # serves the whole batch even if a reload swaps it meanwhile
+            models = (serving if serving is not None else self.serving).models
+            if models is not None and len(features):
+                try:
+                    final_scores = match_scores(models, features, components)
+                    logger.debug("ML adjustment applied to %d applicants", len(final_scores))
+                    return final_scores
+                except Exception as e:
+                    logger.warning("ML prediction failed: %s, using component score", e)
+            
+            return match_scores(None, features, components)
+    
+    def _bins_to_scores(self, bins: np.ndarray) -> np.ndarray:
+        """Map predicted score bins to match scores."""
+        return bins_to_scores(bins)
     
     def _calculate_component_scores(self, project: Project, developer: DeveloperProfile,
                                    application: ProjectApplication) -> Dict[str, float]:
-        """Calculate individual component scores for transparency."""
+        """
+        Calculate individual component scores for transparency.
+        
+        Scalar reference for ``CandidateBatch.component_scores``, which the
+        ranking path uses; kept for parity tests.
+        """
         
         # 1. Skill match (0-100)
         required_skills = set(self._normalize_skills(project.tech_stack))
@@ -721,115 +1003,514 @@ class FreelancerMatcher:
             'rate_fit': float(rate_fit),
         }
         
-        print(f"  Raw component scores: {scores}")
+        logger.debug("Raw component scores: %s", scores)
         return scores
     
+    # Columns whose values version a cached ranking or match analysis: the
+    # application and profile ``updated_at`` stamps, plus the developer's name
+    # (shown in results, but ``User`` has no modification time)
+    RESULT_VERSION_FIELDS = (
+        'developer_id', 'id', 'updated_at', 'developer__developerprofile__updated_at',
+        'developer__first_name', 'developer__last_name',
+    )
+    
+    # Columns scoring and ranking results read; loading only these skips the
+    # profiles' and applications' other (JSON, link, stats) columns
+    RANKING_FIELDS = (
+        'id', 'project_id', 'cover_letter', 'proposed_rate', 'estimated_duration',
+        'developer__id', 'developer__first_name', 'developer__last_name',
+        'developer__developerprofile__id', 'developer__developerprofile__user_id',
+        'developer__developerprofile__title', 'developer__developerprofile__bio',
+        'developer__developerprofile__skills', 'developer__developerprofile__years_experience',
+        'developer__developerprofile__rating', 'developer__developerprofile__success_rate',
+        'developer__developerprofile__total_projects',
+    )
+    
+    def _results_version(self, project_updated_at, rows: List[Tuple],
+                         past_stamps: Optional[Dict[int, Tuple]] = None,
+                         serving: Optional[ServingModels] = None) -> str:
+        """
+        Version stamp of everything a ranking or match analysis reads: the
+        project, the applications with their developers' profiles, the
+        developers' past projects and the model version.
+        
+        Every part except the model version comes from the database (past
+        projects through ``_past_projects_stamps``, or ``past_stamps`` if the
+        caller already read them), never from this worker's caches.
+        """
+        self._check_model_update()
+        if past_stamps is None:
+            past_stamps = self._past_projects_stamps([row[0] for row in rows])
+        serving = serving if serving is not None else self.serving
+        return version_stamp(serving.version, project_updated_at, rows,
+                             [past_stamps[row[0]] for row in rows])
+    
     def rank_freelancers(self, project: Project, top_n: int = 5) -> List[Dict]:
         """
         Rank all freelancers who applied to a project.
         """
+        return self.rank_freelancers_page(project, limit=top_n)['results']
+    
+    def rank_freelancers_page(self, project: Project, limit: int = 5, offset: int = 0) -> Dict:
+        """
+        One page of a project's ranking.
         
-        applications = ProjectApplication.objects.filter(
-            project=project,
-            status='pending'
-        ).select_related('developer', 'developer__developerprofile')
+        Every pending application is scored once and the scores are cached
+        under a version stamp of their inputs; pages are then cut from the
+        stored ranking, so a repeat request or a later page with nothing
+        changed costs one lightweight query.
         
-        if not applications.exists():
-            print("  No pending applications found")
-            return []
+        Returns:
+            ``results`` for positions ``offset`` to ``offset + limit``,
+            ``total`` ranked applications and the ranking's ``version``
+        """
+        with span('ranking') as total:
+            ranking, version = self._ranking(project)
+            with span('sort', items=min(limit, max(len(ranking) - offset, 0))):
+                results = ranking.page(offset, limit)
+            total['items'] = len(ranking)
+        return {'results': results, 'total': len(ranking), 'version': version}
+    
+    def _ranking(self, project: Project) -> Tuple[StoredRanking, str]:
+        serving = self.serving
+        with span('db_fetch') as fetch:
+            version_rows = list(ProjectApplication.objects.filter(
+                project=project, status='pending'
+            ).order_by('id').values_list(*self.RESULT_VERSION_FIELDS))
+            fetch['items'] = len(version_rows)
+        past_stamps = self._past_projects_stamps([row[0] for row in version_rows])
+        version = self._results_version(project.updated_at, version_rows, past_stamps, serving)
+        cached = self.result_cache.get((project.id, 'ranking'), version)
+        metrics.inc('matcher_result_cache_total', kind='ranking', result='miss' if cached is None else 'hit')
+        if cached is not None:
+            return cached, version
+        
+        with span('db_fetch') as fetch:
+            applications = ProjectApplication.objects.filter(
+                project=project,
+                status='pending'
+            ).select_related('developer', 'developer__developerprofile').only(*self.RANKING_FIELDS).order_by('id')
+            
+            applications = list(applications)
+            fetch['items'] = len(applications)
+        if not applications:
+            logger.debug("No pending applications found for project %s", project.id)
+            ranking = StoredRanking([])
+            self.result_cache.put((project.id, 'ranking'), version, ranking)
+            return ranking, version
         
-        print(f"\n📊 Ranking {applications.count()} freelancers for project: {project.title}")
-        results = []
+        logger.debug("Ranking %d freelancers for project: %s", len(applications), project.title)
         
+        candidates = []
         for application in applications:
             try:
-                developer = application.developer.developerprofile
-                print(f"\n  Evaluating: {developer.user.get_full_name()}")
-                
-                component_scores = self._calculate_component_scores(project, developer, application)
-                features = self._extract_features(project, developer, application)
-                overall_score = self._predict_match_score(features, component_scores)
-                
-                results.append({
-                    'application_id': application.id,
-                    'developer_id': developer.user.id,
-                    'developer_name': developer.user.get_full_name(),
-                    'developer_title': developer.title,
-                    'overall_score': overall_score,
-                    'component_scores': component_scores,
-                    'years_experience': developer.years_experience,
-                    'rating': float(developer.rating or 0),
-                    'total_projects': developer.total_projects,
-                    'success_rate': float(developer.success_rate or 0),
-                    'proposed_rate': float(application.proposed_rate) if application.proposed_rate else None,
-                    'estimated_duration': application.estimated_duration,
-                })
+                candidates.append((application.developer.developerprofile, application))
             except Exception as e:
-                print(f"  ⚠ Error processing application {application.id}: {e}")
-                import traceback
-                traceback.print_exc()
+                logger.warning("Error processing application %s: %s", application.id, e)
+        
+        # Encode every applicant's texts in one batched pass
+        similarities = self._embedding_similarities(project, candidates,
+                                                    self._candidate_past_projects(candidates, past_stamps), serving)
+        
+        # Score all candidates at once with the columnar engine
+        with span('feature_extraction', items=len(candidates)):
+            batch = CandidateBatch.from_applications(project, candidates)
+            component_matrix = batch.component_scores()
+            components = component_dicts(component_matrix)
+            features = batch.feature_matrix(similarities)
+        overall_scores = self._predict_match_scores(features, component_matrix, serving)
+        model_version = serving.version
+        results = []
+        
+        for i, (developer, application) in enumerate(candidates):
+            try:
+                results.append(self._ranking_result(developer, application, overall_scores[i], components[i],
+                                                    model_version))
+            except Exception as e:
+                logger.warning("Error processing application %s: %s", application.id, e,
+                               exc_info=logger.isEnabledFor(logging.DEBUG))
                 continue
         
-        results.sort(key=lambda x: x['overall_score'], reverse=True)
+        ranking = StoredRanking(results)
+        self.result_cache.put((project.id, 'ranking'), version, ranking)
+        
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Ranked %d freelancers", len(results))
+            for i, r in enumerate(ranking.page(0, 5), 1):
+                logger.debug("  %d. %s: %d/100", i, r['developer_name'], r['overall_score'])
+        
+        return ranking, version
+    
+    def _ranking_result(self, developer: DeveloperProfile, application: ProjectApplication, overall_score: int,
+                        component_scores: Dict[str, float], model_version: str) -> Dict:
+        return {
+            'application_id': application.id,
+            'developer_id': developer.user.id,
+            'developer_name': developer.user.get_full_name(),
+            'developer_title': developer.title,
+            'overall_score': int(overall_score),
+            'component_scores': component_scores,
+            'years_experience': developer.years_experience,
+            'rating': float(developer.rating or 0),
+            'total_projects': developer.total_projects,
+            'success_rate': float(developer.success_rate or 0),
+            'proposed_rate': float(application.proposed_rate) if application.proposed_rate else None,
+            'estimated_duration': application.estimated_duration,
+            'model_version': model_version,
+        }
+    
+    def rank_projects(self, project_ids: List[int], top_n: int = 5,
+                      workers: Optional[int] = None) -> Dict[int, List[Dict]]:
+        """
+        Rank the pending applications of many projects in one pass.
+        
+        Every distinct text across the projects (a developer who applied to
+        30 of them included) is encoded once, and the projects are scored in
+        parallel over that shared embedding matrix (see ``batch_ranking``).
+        Scores equal those of ``rank_freelancers``; the result cache is
+        neither read nor filled.
+        
+        Args:
+            project_ids: Projects to rank; unknown ids get an empty ranking
+            top_n: Results kept per project
+            workers: Scoring processes; defaults to ``MATCHER_RANKING_WORKERS``
         
-        print(f"\n✅ Ranked {len(results)} freelancers")
-        for i, r in enumerate(results[:top_n], 1):
-            print(f"  {i}. {r['developer_name']}: {r['overall_score']}/100")
+        Returns:
+            Dict mapping project_id to its ranked freelancers
+        """
+        self._check_model_update()
+        serving = self.serving
+        with span('db_fetch') as fetch:
+            projects = Project.objects.in_bulk(project_ids)
+            applications = list(ProjectApplication.objects.filter(
+                project_id__in=list(projects), status='pending'
+            ).select_related('developer', 'developer__developerprofile').only(*self.RANKING_FIELDS).order_by('id'))
+            fetch['items'] = len(applications)
+        
+        candidates_by_project = {project_id: [] for project_id in projects}
+        for application in applications:
+            try:
+                candidates_by_project[application.project_id].append(
+                    (application.developer.developerprofile, application)
+                )
+            except Exception as e:
+                logger.warning("Error processing application %s: %s", application.id, e)
+        
+        # Row of every distinct text in the shared embedding matrix
+        rows: Dict[str, int] = {}
+        
+        def row(text: str) -> int:
+            return rows.setdefault(text, len(rows))
+        
+        past_projects = self._get_past_projects_texts([application.developer_id for application in applications])
+        ranked = [(project_id, candidates) for project_id, candidates in candidates_by_project.items() if candidates]
+        tasks = []
+        with span('text_assembly', items=len(applications)):
+            for project_id, candidates in ranked:
+                tasks.append(ProjectScoringTask(
+                    project_row=row(self._project_text(projects[project_id])),
+                    developer_rows=[row(self._developer_text(developer)) for developer, _ in candidates],
+                    proposal_rows=[row(application.cover_letter) for _, application in candidates],
+                    portfolio_rows=[row(past_projects[developer.user_id]) if past_projects[developer.user_id] else -1
+                                    for developer, _ in candidates],
+                    batch=CandidateBatch.from_applications(projects[project_id], candidates),
+                ))
+        
+        embeddings = None
+        if serving.embedder is not None and rows:
+            try:
+                with span('encoding', items=len(rows)):
+                    embeddings = self._encode_texts(list(rows), serving)
+            except Exception as e:
+                logger.warning("Error computing embeddings: %s", e)
+        
+        models = serving.models
+        model_version = serving.version
+        if workers is None:
+            workers = getattr(settings, 'MATCHER_RANKING_WORKERS', 0)
+        with span('batch_scoring', items=len(applications)):
+            scored = score_projects(embeddings, tasks, models.predictor if models is not None else None, workers)
+        
+        results = {project_id: [] for project_id in project_ids}
+        for (project_id, candidates), (overall_scores, component_matrix, error) in zip(ranked, scored):
+            if error is not None:
+                logger.warning("ML prediction failed for project %s: %s, using component score", project_id, error)
+            ranking = StoredRanking([
+                self._ranking_result(developer, application, overall_scores[i], components, model_version)
+                for i, ((developer, application), components) in enumerate(
+                    zip(candidates, component_dicts(component_matrix))
+                )
+            ])
+            results[project_id] = ranking.page(0, top_n)
+        return results
+    
+    def score_candidates(self, project, candidates: List[Tuple], past_projects_texts: List[str]) -> List[Dict]:
+        """
+        Score applications whose records don't live in the ORM.
         
-        return results[:top_n]
+        ``project`` and the ``(developer, application)`` pairs only need the
+        attributes the ORM models expose to scoring (title, tech_stack,
+        skills, cover_letter, ...); ``past_projects_texts`` (one per
+        candidate) stand in for the developers' selected-application history.
+        All candidates are embedded and scored in one batch.
+        """
+        if not candidates:
+            return []
+        self._check_model_update()
+        serving = self.serving
+        similarities = self._embedding_similarities(project, candidates, past_projects_texts, serving)
+        with span('feature_extraction', items=len(candidates)):
+            batch = CandidateBatch.from_applications(project, candidates)
+            component_matrix = batch.component_scores()
+            features = batch.feature_matrix(similarities)
+        overall_scores = self._predict_match_scores(features, component_matrix, serving)
+        model_version = serving.version
+        
+        required = skill_vocabulary.project_skills(project.tech_stack)
+        results = []
+        for i, ((developer, _), components) in enumerate(zip(candidates, component_dicts(component_matrix))):
+            matching_skills, missing_skills, extra_skills = skill_breakdown(
+                required, skill_vocabulary.developer_skills(developer.skills)
+            )
+            results.append({
+                'overall_score': int(overall_scores[i]),
+                'component_scores': components,
+                'similarities': dict(zip(('developer', 'proposal', 'portfolio'), (float(s) for s in similarities[i]))),
+                'matching_skills': matching_skills,
+                'missing_skills': missing_skills,
+                'extra_skills': extra_skills,
+                'model_version': model_version,
+            })
+        return results
     
     def get_match_details(self, application: ProjectApplication) -> Optional[Dict]:
-        """Get detailed match analysis for a specific application."""
+        """Get detailed match analysis for a specific application (cached like rankings)."""
+        serving = self.serving
+        version_row = ProjectApplication.objects.filter(id=application.id).values_list(
+            *self.RESULT_VERSION_FIELDS, 'project__updated_at'
+        ).first()
+        key = (application.project_id, 'details', application.id)
+        past_stamps = None
+        if version_row is not None:
+            past_stamps = self._past_projects_stamps([version_row[0]])
+            version = self._results_version(version_row[-1], [version_row[:-1]], past_stamps, serving)
+            cached = self.result_cache.get(key, version)
+            metrics.inc('matcher_result_cache_total', kind='details', result='miss' if cached is None else 'hit')
+            if cached is not None:
+                return cached
+        
         project = application.project
         developer = application.developer.developerprofile
         
         try:
-            component_scores = self._calculate_component_scores(project, developer, application)
-            features = self._extract_features(project, developer, application)
-            overall_score = self._predict_match_score(features, component_scores)
-            
-            required_skills = set(self._normalize_skills(project.tech_stack))
-            developer_skills = set(self._normalize_skills(developer.skills.split(',')))
-            
-            matching_skills = sorted(list(required_skills & developer_skills))
-            missing_skills = sorted(list(required_skills - developer_skills))
-            extra_skills = sorted(list(developer_skills - required_skills))
+            candidates = [(developer, application)]
+            batch = CandidateBatch.from_applications(project, candidates)
+            component_scores = component_dicts(batch.component_scores())[0]
+            features = batch.feature_matrix(self._embedding_similarities(
+                project, candidates, self._candidate_past_projects(candidates, past_stamps), serving
+            ))[0]
+            overall_score = self._predict_match_score(features, component_scores, serving)
             
-            return {
-                'overall_score': overall_score,
-                'component_scores': component_scores,
-                'matching_skills': matching_skills,
-                'missing_skills': missing_skills,
-                'extra_skills': extra_skills,
-                'developer_info': {
-                    'name': developer.user.get_full_name(),
-                    'title': developer.title,
-                    'years_experience': developer.years_experience,
-                    'rating': float(developer.rating or 0),
-                    'total_projects': developer.total_projects,
-                    'success_rate': float(developer.success_rate or 0),
-                },
-                'project_info': {
-                    'title': project.title,
-                    'category': project.category,
-                    'complexity': project.complexity,
-                    'tech_stack': project.tech_stack,
-                },
-            }
+            details = self._match_details(
+                project, developer, overall_score, component_scores,
+                skill_vocabulary.project_skills(project.tech_stack), serving.version,
+            )
+            if version_row is not None:
+                self.result_cache.put(key, version, details)
+            return details
         except Exception as e:
-            print(f"⚠ Error getting match details: {e}")
-            import traceback
-            traceback.print_exc()
+            logger.warning("Error getting match details: %s", e, exc_info=logger.isEnabledFor(logging.DEBUG))
             return None
+    
+    def get_match_details_bulk(self, project: Project, application_ids: List[int]) -> Dict[int, Dict]:
+        """
+        Match analysis for many applications to one project in a single pass.
+        
+        The project is encoded once, all applicants' texts go to the embedder
+        together and the scores come from one vectorized prediction, as in a
+        ranking. Results are shared with ``get_match_details`` through the
+        result cache, so only applications without a current cached
+        analysis are scored.
+        
+        Returns:
+            Analysis per application id; ids not belonging to the project are
+            left out
+        """
+        with span('db_fetch') as fetch:
+            version_rows = list(ProjectApplication.objects.filter(
+                project=project, id__in=application_ids
+            ).order_by('id').values_list(*self.RESULT_VERSION_FIELDS, 'project__updated_at'))
+            fetch['items'] = len(version_rows)
+        if not version_rows:
+            return {}
+        
+        # Per-application stamps, as get_match_details computes them
+        self._check_model_update()
+        serving = self.serving
+        model_version = serving.version
+        past_stamps = self._past_projects_stamps([row[0] for row in version_rows])
+        versions = {
+            row[1]: version_stamp(model_version, row[-1], [row[:-1]], [past_stamps[row[0]]])
+            for row in version_rows
+        }
+        results = {}
+        for application_id, version in versions.items():
+            cached = self.result_cache.get((project.id, 'details', application_id), version)
+            metrics.inc('matcher_result_cache_total', kind='details', result='miss' if cached is None else 'hit')
+            if cached is not None:
+                results[application_id] = cached
+        missing = [application_id for application_id in versions if application_id not in results]
+        if not missing:
+            return results
+        
+        with span('db_fetch') as fetch:
+            applications = list(ProjectApplication.objects.filter(id__in=missing).select_related(
+                'developer', 'developer__developerprofile'
+            ).order_by('id'))
+            fetch['items'] = len(applications)
+        candidates = []
+        for application in applications:
+            try:
+                candidates.append((application.developer.developerprofile, application))
+            except Exception as e:
+                logger.warning("Error processing application %s: %s", application.id, e)
+        if not candidates:
+            return results
+        
+        similarities = self._embedding_similarities(project, candidates,
+                                                    self._candidate_past_projects(candidates, past_stamps), serving)
+        with span('feature_extraction', items=len(candidates)):
+            batch = CandidateBatch.from_applications(project, candidates)
+            component_matrix = batch.component_scores()
+            features = batch.feature_matrix(similarities)
+        overall_scores = self._predict_match_scores(features, component_matrix, serving)
+        
+        required = skill_vocabulary.project_skills(project.tech_stack)
+        for i, ((developer, application), components) in enumerate(zip(candidates, component_dicts(component_matrix))):
+            details = self._match_details(project, developer, int(overall_scores[i]), components, required,
+                                          model_version)
+            self.result_cache.put((project.id, 'details', application.id), versions[application.id], details)
+            results[application.id] = details
+        return results
+    
+    def _match_details(self, project: Project, developer: DeveloperProfile, overall_score: int,
+                       component_scores: Dict[str, float], required_skills, model_version: str) -> Dict:
+        matching_skills, missing_skills, extra_skills = skill_breakdown(
+            required_skills, skill_vocabulary.developer_skills(developer.skills)
+        )
+        return {
+            'overall_score': overall_score,
+            'model_version': model_version,
+            'component_scores': component_scores,
+            'matching_skills': matching_skills,
+            'missing_skills': missing_skills,
+            'extra_skills': extra_skills,
+            'developer_info': {
+                'name': developer.user.get_full_name(),
+                'title': developer.title,
+                'years_experience': developer.years_experience,
+                'rating': float(developer.rating or 0),
+                'total_projects': developer.total_projects,
+                'success_rate': float(developer.success_rate or 0),
+            },
+            'project_info': {
+                'title': project.title,
+                'category': project.category,
+                'complexity': project.complexity,
+                'tech_stack': project.tech_stack,
+            },
+        }
 
 
 # Singleton instance
 _matcher_instance = None
+_matcher_lock = threading.Lock()
+
+# Warm-up progress reported by the readiness endpoint
+_warmup_state = {'status': 'idle', 'error': None, 'seconds': None}
+_warmup_thread = None
 
 
 def get_matcher() -> FreelancerMatcher:
-    """Get or create the matcher instance."""
+    """Get or create the matcher instance; concurrent first callers share one build."""
     global _matcher_instance
     if _matcher_instance is None:
-        _matcher_instance = FreelancerMatcher()
-    return _matcher_instance
\ No newline at end of file
+        with _matcher_lock:
+            if _matcher_instance is None:
+                _matcher_instance = FreelancerMatcher()
+    return _matcher_instance
+
+
+def warm_up_matcher():
+    """Build the matcher and run one encode so the first real request is fast."""
+    _warmup_state.update(status='loading', error=None)
+    start = time.perf_counter()
+    try:
+        matcher = get_matcher()
+        if matcher.embedder is not None:
+            matcher._encode_batch(['warm-up'])
+        _warmup_state.update(status='ready', seconds=round(time.perf_counter() - start, 2))
+        logger.info('Matcher warmed up in %ss', _warmup_state['seconds'])
+    except Exception as e:
+        _warmup_state.update(status='failed', error=str(e))
+        logger.warning('Matcher warm-up failed: %s', e)
+
+
+def start_matcher_warmup() -> threading.Thread:
+    """Start warm_up_matcher in a daemon thread (once per process)."""
+    global _warmup_thread
+    with _matcher_lock:
+        if _warmup_thread is None:
+            _warmup_state['status'] = 'loading'
+            _warmup_thread = threading.Thread(target=warm_up_matcher, name='matcher-warmup', daemon=True)
+            _warmup_thread.start()
+    return _warmup_thread
+
+
+def preload_matcher():
+    """
+    Load the matcher in a pre-fork server master so workers share its pages.
+
+    Builds the matcher (GB/RF models, scaler, embedder weights) without running
+    an encode, since thread pools started before ``fork`` don't survive into
+    the workers. GC stays disabled while loading, so no collection frees
+    objects in between and leaves holes in the shared pages, and everything
+    allocated is then moved to the permanent generation with ``gc.freeze`` so
+    collections in the workers don't write to (and un-share) those pages.
+    Workers re-enable GC after the fork (``post_fork`` in gunicorn.conf.py).
+    """
+    import gc
+
+    start = time.perf_counter()
+    gc.disable()
+    try:
+        get_matcher()
+    except Exception:
+        gc.enable()
+        raise
+    _warmup_state.update(status='ready', error=None, seconds=round(time.perf_counter() - start, 2))
+    gc.freeze()
+    logger.info('Matcher preloaded in %ss; %d objects frozen', _warmup_state['seconds'], gc.get_freeze_count())
+
+
+def matcher_readiness() -> Dict:
+    """Warm-up status plus what the loaded matcher can do."""
+    state = dict(_warmup_state)
+    state['ready'] = state['status'] == 'ready'
+    if state['ready']:
+        state['models_loaded'] = _matcher_instance.models_loaded
+        state['model_version'] = _matcher_instance.model_version
+        state['embedder_loaded'] = _matcher_instance.embedder is not None
+    return state
+
+
+def invalidate_project_results(project_id: int):
+    """Drop a project's cached rankings and match analyses if the matcher is loaded."""
+    if _matcher_instance is not None:
+        _matcher_instance.result_cache.invalidate_project(project_id)
+
+
+def invalidate_developer_past_projects(user_id: int):
+    """Forget a developer's cached past projects if the matcher is loaded."""
+    if _matcher_instance is not None:
+        _matcher_instance.invalidate_past_projects(user_id)
@@ -0,0 +1,128 @@
+"""
+In-process metrics for the matcher, exposed in Prometheus text format.
+
+``span(stage, items)`` times one stage of a ranking (DB fetch, text
+assembly, encoding, feature extraction, prediction, sort) and records its
+duration in the ``matcher_stage_seconds`` histogram and the number of items
+it handled in ``matcher_stage_items_total``. ``/metrics/`` serves
+``registry.render()``.
+
+The registry lives in process memory, so each server worker reports its own
+numbers; scrape every worker (or sum in the query) for a host-wide view.
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+
+# Upper bounds in seconds, from sub-millisecond cache hits to cold model loads
+DEFAULT_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _labels(labels: Tuple[Tuple[str, str], ...], **extra) -> str:
+    pairs = list(labels) + list(extra.items())
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{k}="{v}"' for k, v in pairs) + '}'
+
+
+class Histogram:
+    def __init__(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.buckets = tuple(buckets)
+        # labels -> [bucket counts..., +Inf count], sum
+        self._series: Dict[Tuple, Tuple[List[int], List[float]]] = {}
+
+    def observe(self, value: float, labels: Tuple[Tuple[str, str], ...] = ()):
+        counts, total = self._series.setdefault(labels, ([0] * (len(self.buckets) + 1), [0.0]))
+        counts[bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, (counts, total) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                yield f'{self.name}_bucket{_labels(labels, le=repr(bound))} {cumulative}'
+            cumulative += counts[-1]
+            yield f'{self.name}_bucket{_labels(labels, le="+Inf")} {cumulative}'
+            yield f'{self.name}_sum{_labels(labels)} {total[0]:.6f}'
+            yield f'{self.name}_count{_labels(labels)} {cumulative}'
+
+
+class Counter:
+    def __init__(self, name: str, help_text: str):
+        self.name = name
+        self.help_text = help_text
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, amount: float = 1, labels: Tuple[Tuple[str, str], ...] = ()):
+        self._values[labels] = self._values.get(labels, 0) + amount
+
+    def value(self, labels: Tuple[Tuple[str, str], ...] = ()) -> float:
+        return self._values.get(labels, 0)
+
+    def render(self) -> Iterator[str]:
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        for labels, value in sorted(self._values.items()):
+            yield f'{self.name}{_labels(labels)} {value:g}'
+
+
+class MetricsRegistry:
+    """Thread-safe set of named counters and histograms."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._metrics: Dict[str, object] = {}
+
+    def histogram(self, name: str, help_text: str, buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        with self._lock:
+            return self._metrics.setdefault(name, Histogram(name, help_text, buckets))
+
+    def counter(self, name: str, help_text: str) -> Counter:
+        with self._lock:
+            return self._metrics.setdefault(name, Counter(name, help_text))
+
+    def observe(self, name: str, value: float, **labels):
+        metric = self._metrics[name]
+        with self._lock:
+            metric.observe(value, tuple(sorted(labels.items())))
+
+    def inc(self, name: str, amount: float = 1, **labels):
+        metric = self._metrics[name]
+        with self._lock:
+            metric.inc(amount, tuple(sorted(labels.items())))
+
+    def render(self) -> str:
+        with self._lock:
+            lines = [line for metric in self._metrics.values() for line in metric.render()]
+        return '\n'.join(lines) + '\n'
+
+
+registry = MetricsRegistry()
+registry.histogram('matcher_stage_seconds', 'Time spent in each matcher stage')
+registry.counter('matcher_stage_items_total', 'Items (applications, texts, rows) processed by each matcher stage')
+registry.counter('matcher_result_cache_total', 'Ranking and match-analysis cache lookups by result')
+
+
+@contextmanager
+def span(stage: str, items: int = 0):
+    """
+    Time a matcher stage. ``items`` can be set up front or, when only known
+    inside the block, by assigning to the yielded dict's ``'items'`` key.
+    """
+    record = {'items': items}
+    start = time.perf_counter()
+    try:
+        yield record
+    finally:
+        registry.observe('matcher_stage_seconds', time.perf_counter() - start, stage=stage)
+        if record['items']:
+            registry.inc('matcher_stage_items_total', record['items'], stage=stage)
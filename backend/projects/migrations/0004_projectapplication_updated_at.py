@@ -0,0 +1,20 @@
+# Generated by Django 6.0.1 on 2026-10-18 12:00
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('projects', '0003_project_submission_deadline_projectassignment_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='projectapplication',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, default=django.utils.timezone.now),
+            preserve_default=False,
+        ),
+    ]
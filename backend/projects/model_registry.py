@@ -0,0 +1,211 @@
+"""
+Versioned registry of the matcher's trained models.
+
+Layout of the registry directory (``MATCHER_MODEL_REGISTRY``)::
+
+    <version>/manifest.json          version, creation time, metadata, file hashes
+    <version>/gb_classifier.joblib
+    <version>/rf_classifier.joblib
+    <version>/feature_scaler.joblib
+    <version>/compiled/*.npy         the same models flattened by ``tree_ensemble``
+    CURRENT                          name of the version in service
+
+``publish_models`` writes a complete version directory first and only then
+replaces ``CURRENT`` with ``os.replace``, so a reader sees either the old or
+the new version, never a partial one. Running matchers re-read ``CURRENT``
+every ``MATCHER_MODEL_POLL_SECONDS`` and load a new version in a background
+thread; the old models keep serving until the new ones are loaded and have
+made one prediction.
+
+Matchers load the compiled ``.npy`` arrays memory-mapped: no scikit-learn
+import, no unpickling, and every worker on a host shares one copy from the
+page cache. The joblib dumps stay alongside as the source of truth; versions
+without compiled arrays are loaded from them (with ``mmap_mode='r'``) and
+compiled in memory.
+
+Without a registry the legacy pickles in ``ml_models/`` are loaded as before.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import shutil
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+
+from projects.tree_ensemble import CompiledEnsemble, SklearnEnsemble, compile_ensemble
+
+
+# Bundle attribute -> artifact file stem
+MODEL_FILES = {'gb_model': 'gb_classifier', 'rf_model': 'rf_classifier', 'scaler': 'feature_scaler'}
+POINTER = 'CURRENT'
+
+
+class ModelBundle:
+    """Score-bin predictor (compiled or scikit-learn) and metadata of one model version."""
+
+    def __init__(self, version: str, predictor, metadata: Dict):
+        self.version = version
+        self.predictor = predictor
+        self.metadata = metadata
+
+    @property
+    def n_features(self) -> int:
+        return self.predictor.n_features
+
+    def predict(self, features: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """GB and RF score bins for every row of ``features``."""
+        return self.predictor.predict(features)
+
+    def warm_up(self):
+        """Run one prediction so lazily initialised state is built before serving."""
+        self.predict(np.zeros((1, self.n_features)))
+
+
+def fast_predictor(gb_model, rf_model, scaler):
+    """Compiled evaluator for the models, or the models themselves if they can't be compiled."""
+    try:
+        return compile_ensemble(gb_model, rf_model, scaler)
+    except (TypeError, AttributeError) as e:
+        print(f"⚠ Models can't be compiled ({e}); predicting with scikit-learn")
+        return SklearnEnsemble(gb_model, rf_model, scaler)
+
+
+def registry_dir() -> Path:
+    return Path(getattr(settings, 'MATCHER_MODEL_REGISTRY', Path(settings.BASE_DIR) / 'ml_models' / 'registry'))
+
+
+def current_version(root: Path) -> Optional[str]:
+    """Version named by the ``CURRENT`` pointer, or None without a registry."""
+    try:
+        return (Path(root) / POINTER).read_text().strip() or None
+    except FileNotFoundError:
+        return None
+
+
+def list_versions(root: Path) -> List[str]:
+    root = Path(root)
+    if not root.is_dir():
+        return []
+    return sorted(entry.name for entry in root.iterdir() if (entry / 'manifest.json').is_file())
+
+
+def _sha256(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_bundle(root: Path, version: str) -> ModelBundle:
+    """Load one registry version with its arrays memory-mapped."""
+    directory = Path(root) / version
+    with open(directory / 'manifest.json') as f:
+        manifest = json.load(f)
+    if manifest.get('compiled'):
+        predictor = CompiledEnsemble.load(directory / manifest['compiled']['path'])
+    else:
+        import joblib
+
+        models = {
+            attr: joblib.load(directory / manifest['files'][stem]['path'], mmap_mode='r')
+            for attr, stem in MODEL_FILES.items()
+        }
+        predictor = fast_predictor(**models)
+    return ModelBundle(manifest['version'], predictor, manifest.get('metadata', {}))
+
+
+def load_legacy_models(model_dir: str) -> Optional[Tuple[object, object, object, Dict]]:
+    """GB model, RF model, scaler and metadata from the pickles in ``ml_models/``; None if any is missing."""
+    paths = {attr: os.path.join(model_dir, f'{stem}.pkl') for attr, stem in MODEL_FILES.items()}
+    metadata_path = os.path.join(model_dir, 'model_metadata.json')
+    if not all(os.path.exists(p) for p in [*paths.values(), metadata_path]):
+        return None
+
+    models = {}
+    for attr, path in paths.items():
+        with open(path, 'rb') as f:
+            models[attr] = pickle.load(f)
+    with open(metadata_path, 'r') as f:
+        metadata = json.load(f)
+    return models['gb_model'], models['rf_model'], models['scaler'], metadata
+
+
+def load_legacy(model_dir: str) -> Optional[ModelBundle]:
+    """Load and compile the unversioned pickles from ``ml_models/``; None if any is missing."""
+    loaded = load_legacy_models(model_dir)
+    if loaded is None:
+        return None
+    gb_model, rf_model, scaler, metadata = loaded
+    return ModelBundle(str(metadata.get('version', 'unversioned')), fast_predictor(gb_model, rf_model, scaler),
+                       metadata)
+
+
+def set_current(root: Path, version: str):
+    """Atomically point ``CURRENT`` at an existing version."""
+    root = Path(root)
+    if not (root / version / 'manifest.json').is_file():
+        raise ValueError(f'Model version {version!r} is not in the registry at {root}')
+    tmp = root / f'.{POINTER}.{os.getpid()}.tmp'
+    tmp.write_text(version + '\n')
+    os.replace(tmp, root / POINTER)
+
+
+def publish_models(root: Path, version: str, gb_model, rf_model, scaler, metadata: Optional[Dict] = None,
+                   activate: bool = True) -> Path:
+    """
+    Add a model version to the registry and, with ``activate``, put it in service.
+
+    Versions are immutable: publishing an existing version name fails. Models
+    that ``compile_ensemble`` can't flatten are published without compiled
+    arrays and evaluated with scikit-learn.
+    """
+    import joblib
+
+    try:
+        compiled = compile_ensemble(gb_model, rf_model, scaler)
+    except (TypeError, AttributeError) as e:
+        print(f"⚠ Publishing {version} without compiled arrays: {e}")
+        compiled = None
+
+    root = Path(root)
+    directory = root / version
+    if directory.exists():
+        raise ValueError(f'Model version {version!r} already exists in {root}')
+    root.mkdir(parents=True, exist_ok=True)
+
+    tmp = root / f'.{version}.{os.getpid()}.tmp'
+    shutil.rmtree(tmp, ignore_errors=True)
+    tmp.mkdir()
+    models = {'gb_model': gb_model, 'rf_model': rf_model, 'scaler': scaler}
+    try:
+        files = {}
+        for attr, stem in MODEL_FILES.items():
+            path = tmp / f'{stem}.joblib'
+            joblib.dump(models[attr], path)
+            files[stem] = {'path': path.name, 'sha256': _sha256(path)}
+        if compiled is not None:
+            compiled.save(tmp / 'compiled')
+        manifest = {
+            'version': version,
+            'created_at': datetime.now(timezone.utc).isoformat(),
+            'n_features': getattr(scaler, 'n_features_in_', None),
+            'metadata': dict(metadata or {}, version=version),
+            'files': files,
+            'compiled': {'path': 'compiled'} if compiled is not None else None,
+        }
+        (tmp / 'manifest.json').write_text(json.dumps(manifest, indent=2) + '\n')
+        os.rename(tmp, directory)
+    except Exception:
+        shutil.rmtree(tmp, ignore_errors=True)
+        raise
+
+    if activate:
+        set_current(root, version)
+    return directory
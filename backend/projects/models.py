@@ -94,6 +94,7 @@ class ProjectApplication(models.Model):
     portfolio_links = models.JSONField(default=list, blank=True)
     status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending')
     applied_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     
     # ML Matching scores
     match_score = models.IntegerField(null=True, blank=True)
@@ -0,0 +1,151 @@
+"""
+Personalised project fit scores for the project browse endpoint.
+
+Every open project's embedding is kept in an ``IVFIndex`` (searched exactly,
+never trained) so one matrix-vector product scores all of them against a
+developer's profile embedding. The skill and rate parts reuse the matcher's
+component formulas, evaluated over the whole project list at once.
+"""
+
+import threading
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+from projects.developer_index import profile_text, project_record_text, text_fingerprint
+from projects.scoring import budget_midpoint
+from projects.skills import n_words, overlap_counts, pack, popcount, skill_vocabulary
+from projects.vector_index import IVFIndex
+
+
+# Weights of skill match, semantic similarity and rate fit in the fit score
+FIT_WEIGHTS = np.array([0.50, 0.35, 0.15])
+
+
+class ProjectFitIndex:
+    """Per-worker cache of open-project embeddings and skill/budget columns."""
+
+    def __init__(self, encode_fn=None):
+        self._encode_fn = encode_fn
+        self._lock = threading.Lock()
+        self.index: Optional[IVFIndex] = None
+        self._versions: Dict[str, str] = {}
+        self._skills: Dict[str, np.ndarray] = {}
+        self._budget_mid: Dict[str, float] = {}
+        # Columns for the last project list scored, reused while it is unchanged
+        self._prepared_ids: Optional[List[str]] = None
+        self._prepared = None
+
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        if self._encode_fn is None:
+            from projects.matcher import get_matcher
+            return get_matcher().embed_texts(texts)
+        return self._encode_fn(texts)
+
+    @staticmethod
+    def _version(project: Dict) -> str:
+        # Supabase bumps updated_at on edit; fall back to hashing the content
+        return project.get('updated_at') or text_fingerprint(project_record_text(project))
+
+    def sync(self, projects: Sequence[Dict]):
+        """Embed projects that are new or changed since they were last seen."""
+        with self._lock:
+            versions, version = self._versions, self._version
+            stale = [p for p in projects if versions.get(str(p['id'])) != version(p)]
+            if not stale:
+                return
+            self._prepared_ids = None
+            vectors = np.asarray(self._encode([project_record_text(p) for p in stale]), dtype=np.float32)
+            if self.index is None:
+                self.index = IVFIndex(dim=vectors.shape[1])
+            ids = [str(p['id']) for p in stale]
+            self.index.upsert(ids, vectors)
+            for project_id, project in zip(ids, stale):
+                self._versions[project_id] = self._version(project)
+                self._skills[project_id] = skill_vocabulary.project_skills(project.get('tech_stack'))
+                self._budget_mid[project_id] = budget_midpoint(project.get('budget_min'), project.get('budget_max'))
+
+    def retain(self, project_ids: Sequence[str]):
+        """
+        Drop every cached project not in ``project_ids``, which must be all
+        open projects (not a filtered subset): the rest were closed or deleted.
+        """
+        with self._lock:
+            keep = {str(project_id) for project_id in project_ids}
+            gone = [project_id for project_id in self._versions if project_id not in keep]
+            if not gone:
+                return
+            self._prepared_ids = None
+            if self.index is not None:
+                self.index.remove(gone)
+                # Removed rows stay in storage until compacted
+                self.index.compact()
+            for project_id in gone:
+                self._versions.pop(project_id, None)
+                self._skills.pop(project_id, None)
+                self._budget_mid.pop(project_id, None)
+
+    def score(self, developer_profile: Dict, projects: Sequence[Dict]) -> np.ndarray:
+        """
+        Fit score (0-100) of every project for one developer, in input order.
+
+        Args:
+            developer_profile: Supabase ``developer_profiles`` row
+            projects: Supabase ``projects`` rows
+        """
+        if not projects:
+            return np.zeros(0)
+        self.sync(projects)
+        developer_vector = np.asarray(self._encode([profile_text(developer_profile)]), dtype=np.float32)[0]
+        offered = skill_vocabulary.developer_skills(developer_profile.get('skills'))
+
+        ids = [str(p['id']) for p in projects]
+        with self._lock:
+            rows, required_bits, required_count, budget_mid = self._columns(ids)
+            similarity = self.index.similarities_by_row(developer_vector, rows)
+
+        # Skill match: share of each project's tech stack the developer covers.
+        # Skills interned after the projects were packed cannot overlap them.
+        words = required_bits.shape[1]
+        offered_bits = pack([offered[offered < words * 64]], words)[0]
+        overlap = overlap_counts(required_bits, offered_bits)
+        skill_match = np.where(required_count > 0, overlap / np.maximum(required_count, 1) * 100, 50.0)
+
+        semantic_match = np.clip(similarity, 0, 1) * 100
+
+        # Rate fit: the developer's hourly rate against each budget midpoint
+        rate = float(developer_profile.get('hourly_rate') or 0)
+        if rate > 0:
+            overage = (rate - budget_mid) / np.where(budget_mid > 0, budget_mid, 1)
+            rate_fit = np.where(rate <= budget_mid, 100.0, np.maximum(0, 100 - overage * 100))
+        else:
+            rate_fit = np.full(len(ids), 50.0)
+
+        return np.column_stack([skill_match, semantic_match, rate_fit]) @ FIT_WEIGHTS
+
+    def _columns(self, ids: List[str]):
+        """Index rows, packed skill bitsets, skill counts and budget midpoints for ``ids``."""
+        if ids != self._prepared_ids:
+            required_bits = pack([self._skills[project_id] for project_id in ids], n_words(len(skill_vocabulary)))
+            self._prepared = (
+                self.index.rows(ids),
+                required_bits,
+                popcount(required_bits),
+                np.fromiter((self._budget_mid[project_id] for project_id in ids), dtype=np.float64, count=len(ids)),
+            )
+            self._prepared_ids = ids
+        return self._prepared
+
+
+_project_fit_index = None
+_project_fit_index_lock = threading.Lock()
+
+
+def get_project_fit_index() -> ProjectFitIndex:
+    """Get or create the process-wide project fit index."""
+    global _project_fit_index
+    if _project_fit_index is None:
+        with _project_fit_index_lock:
+            if _project_fit_index is None:
+                _project_fit_index = ProjectFitIndex()
+    return _project_fit_index
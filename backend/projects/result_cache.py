@@ -0,0 +1,110 @@
+"""
+Versioned cache of matcher results (rankings and match analyses).
+
+Each entry is stored under a key that includes its project id, together with
+the version stamp of the inputs it was computed from: the applications,
+developer profiles, past projects and model version. Callers build the
+stamp from rows they just read from the database (``updated_at`` columns
+and past-project freshness stamps), not from their own caches, and a
+lookup only hits if it is unchanged, so edits made by another worker
+process or straight in the database are noticed on the next request.
+Explicit invalidation (applications saved, shortlisted, rejected)
+additionally drops a project's entries in this process straight away.
+"""
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+import numpy as np
+
+
+def version_stamp(*parts) -> str:
+    """
+    Hash of plain values (strings, numbers, datetimes and tuples/lists of them).
+
+    ``repr`` is deterministic for these types and faster than JSON encoding
+    for the datetimes that dominate a stamp.
+    """
+    return hashlib.blake2b(repr(parts).encode('utf-8'), digest_size=16).hexdigest()
+
+
+class StoredRanking:
+    """
+    Every applicant's scored result for one project, ordered on demand.
+
+    Only the prefix of the ranking that pages have asked for is ordered: a
+    page ending at position k costs an O(n) ``argpartition`` plus a sort of
+    k rows, and later pages inside that prefix are plain slices. Ties are
+    broken by position in ``results`` (ascending application id).
+    """
+
+    def __init__(self, results: List[Dict]):
+        self.results = results
+        n = len(results)
+        scores = np.array([r['overall_score'] for r in results], dtype=np.int64)
+        # Distinct integer keys: higher score first, then earlier position
+        self._keys = scores * n + (n - 1 - np.arange(n, dtype=np.int64))
+        self._order = np.zeros(0, dtype=np.intp)
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.results)
+
+    def page(self, offset: int = 0, limit: int = 5) -> List[Dict]:
+        end = min(offset + limit, len(self.results))
+        if end > len(self._order):
+            with self._lock:
+                if end > len(self._order):
+                    if end < len(self.results):
+                        top = np.argpartition(-self._keys, end - 1)[:end]
+                    else:
+                        top = np.arange(len(self.results))
+                    self._order = top[np.argsort(-self._keys[top])]
+        return [self.results[i] for i in self._order[offset:end]]
+
+
+class ResultCache:
+    """Size-bounded LRU of ``key -> (version, result)``; keys start with the project id."""
+
+    def __init__(self, max_entries: int = 512):
+        self.max_entries = max_entries
+        self._entries: 'OrderedDict[Tuple, Tuple[str, Any]]' = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: Tuple[Hashable, ...], version: str) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def put(self, key: Tuple[Hashable, ...], version: str, result: Any):
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._entries[key] = (version, result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def invalidate_project(self, project_id):
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == project_id]:
+                del self._entries[key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'entries': len(self._entries), 'hits': self.hits, 'misses': self.misses}
@@ -0,0 +1,27 @@
+"""
+Model signal handlers that keep the matcher's in-process caches fresh.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from projects.models import ProjectApplication
+
+
+@receiver(post_save, sender=ProjectApplication)
+def application_saved(sender, instance, **kwargs):
+    """
+    A new, shortlisted or rejected application changes its project's
+    ranking; a newly selected one also changes the developer's past projects.
+    """
+    # Imported lazily so app loading does not pull in the ML stack
+    from projects.matcher import invalidate_developer_past_projects, invalidate_project_results
+    invalidate_project_results(instance.project_id)
+    if instance.status == 'selected':
+        invalidate_developer_past_projects(instance.developer_id)
+
+
+@receiver(post_delete, sender=ProjectApplication)
+def application_deleted(sender, instance, **kwargs):
+    from projects.matcher import invalidate_project_results
+    invalidate_project_results(instance.project_id)
@@ -0,0 +1,145 @@
+"""
+Interned skill vocabulary and packed skill bitsets.
+
+Every normalized skill token gets a stable integer id for the life of the
+process. A skill list is stored as a sorted id array, and a group of skill
+lists is packed into a ``(N, words)`` ``uint64`` bitset matrix, so overlap,
+missing and extra counts for a whole candidate pool are one AND plus a
+popcount. Developer skill strings are parsed once and cached by content.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_skills(skills) -> List[str]:
+    """Normalize skill strings to lowercase and split."""
+    if isinstance(skills, list):
+        return [s.strip().lower() for s in skills if s.strip()]
+    elif isinstance(skills, str):
+        return [s.strip().lower() for s in skills.replace(',', ' ').split() if s.strip()]
+    return []
+
+
+class SkillVocabulary:
+    """Thread-safe mapping of normalized skill tokens to dense integer ids."""
+
+    # Distinct developer skill strings whose parsed id arrays are kept
+    PARSED_CACHE_SIZE = 50000
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._lock = threading.Lock()
+        self._parsed: 'OrderedDict[str, np.ndarray]' = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._tokens)
+
+    def intern(self, tokens: Sequence[str]) -> np.ndarray:
+        """Sorted unique ids of already-normalized tokens, adding new ones."""
+        ids = set()
+        for token in tokens:
+            token_id = self._ids.get(token)
+            if token_id is None:
+                with self._lock:
+                    token_id = self._ids.get(token)
+                    if token_id is None:
+                        token_id = len(self._tokens)
+                        self._tokens.append(token)
+                        self._ids[token] = token_id
+            ids.add(token_id)
+        return np.array(sorted(ids), dtype=np.int64)
+
+    def lookup(self, tokens: Sequence[str]) -> np.ndarray:
+        """Ids of tokens without interning; unknown tokens map to -1."""
+        return np.array([self._ids.get(token, -1) for token in tokens], dtype=np.int64)
+
+    def tokens(self, ids: Sequence[int]) -> List[str]:
+        return [self._tokens[i] for i in ids]
+
+    def project_skills(self, tech_stack) -> np.ndarray:
+        """Ids of a project's ``tech_stack`` list."""
+        return self.intern(normalize_skills(tech_stack if isinstance(tech_stack, list) else []))
+
+    def developer_skills(self, skills: Optional[str]) -> np.ndarray:
+        """Ids of a developer's comma-separated ``skills`` string (cached by content)."""
+        skills = skills or ''
+        ids = self._parsed.get(skills)
+        if ids is None:
+            ids = self.intern(normalize_skills(skills.split(',')))
+            with self._lock:
+                self._parsed[skills] = ids
+                while len(self._parsed) > self.PARSED_CACHE_SIZE:
+                    self._parsed.popitem(last=False)
+        return ids
+
+
+def n_words(n_bits: int) -> int:
+    return max((n_bits + 63) // 64, 1)
+
+
+def pack(rows: Sequence[np.ndarray], words: Optional[int] = None) -> np.ndarray:
+    """Pack per-row id arrays into a ``(len(rows), words)`` uint64 bitset matrix."""
+    counts = np.fromiter(map(len, rows), dtype=np.int64, count=len(rows))
+    flat = np.concatenate(rows) if counts.sum() else np.zeros(0, dtype=np.int64)
+    if words is None:
+        words = n_words(int(flat.max()) + 1 if len(flat) else 0)
+    bits = np.zeros((len(rows), words), dtype=np.uint64)
+    owner = np.repeat(np.arange(len(rows)), counts)
+    np.bitwise_or.at(bits, (owner, flat >> 6), np.left_shift(np.uint64(1), (flat & 63).astype(np.uint64)))
+    return bits
+
+
+def popcount(bits: np.ndarray) -> np.ndarray:
+    """Number of set bits per row of a bitset matrix."""
+    return np.bitwise_count(bits).sum(axis=-1, dtype=np.int64)
+
+
+def overlap_counts(bits: np.ndarray, query: np.ndarray) -> np.ndarray:
+    """``|row & query|`` for every row; ``query`` is a single packed bitset of the same width."""
+    return popcount(bits & query)
+
+
+def filter_mask(bits: np.ndarray, query: np.ndarray, match: str = 'any') -> np.ndarray:
+    """Rows holding any (or all, with ``match='all'``) of the query skills."""
+    common = overlap_counts(bits, query)
+    if match == 'all':
+        return common == popcount(query)
+    return common > 0
+
+
+def skill_breakdown(required: np.ndarray, offered: np.ndarray) -> Tuple[List[str], List[str], List[str]]:
+    """Sorted matching, missing and extra skill names for one project/developer pair."""
+    return tuple(
+        sorted(skill_vocabulary.tokens(ids))
+        for ids in (np.intersect1d(required, offered), np.setdiff1d(required, offered),
+                    np.setdiff1d(offered, required))
+    )
+
+
+def parse_skill_filter(value: Optional[str]) -> List[str]:
+    """Normalized tokens of a ``?skills=a,b`` query parameter."""
+    return normalize_skills((value or '').split(','))
+
+
+def skill_filter_mask(rows: Sequence[np.ndarray], skills: Sequence[str], match: str = 'any') -> np.ndarray:
+    """
+    Boolean mask of ``rows`` (skill id arrays) matching a skill filter.
+
+    Unknown filter skills match nothing, so ``match='all'`` with one is all False.
+    """
+    query_ids = skill_vocabulary.lookup(skills)
+    known = np.unique(query_ids[query_ids >= 0])
+    if match == 'all' and len(known) < len(set(skills)):
+        return np.zeros(len(rows), dtype=bool)
+    if not len(known):
+        return np.zeros(len(rows), dtype=bool) if len(skills) else np.ones(len(rows), dtype=bool)
+    words = n_words(len(skill_vocabulary))
+    return filter_mask(pack(rows, words), pack([known], words)[0], match)
+
+
+skill_vocabulary = SkillVocabulary()
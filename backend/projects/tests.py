@@ -1,3 +1,1046 @@
-from django.test import TestCase
+import hashlib
+import importlib.util
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+from datetime import date, timedelta
+from decimal import Decimal
+from io import StringIO
+from unittest import skipUnless
+from unittest.mock import ANY, patch
 
-# Create your tests here.
+import numpy as np
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.db import connection
+from django.test import SimpleTestCase, TestCase, override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from accounts.models import DeveloperProfile
+from projects.apply_scoring import (
+    ApplicationScoringQueue, ScoringInputs, application_record, developer_record, notify_developer_changed,
+    notify_project_changed, project_fingerprint, project_record, score_applications, score_update,
+)
+from projects.batch_ranking import score_projects, score_task
+from projects.developer_index import DeveloperIndex, profile_text, project_record_text
+from projects.embedders import build_embedder, windowed_embedder_name
+from projects.embedding_cache import EmbeddingCache, LRUEmbeddingCache
+from projects.embedding_server import EmbeddingClient, EmbeddingServer, SidecarEmbedder
+from projects.encode_coalescer import CoalescingEmbedder
+from projects.encode_scheduler import LengthBucketedEncoder
+from projects.matcher import FreelancerMatcher, preload_matcher, start_matcher_warmup
+from projects.metrics import registry
+from projects.model_registry import current_version, load_bundle, publish_models
+from projects.project_fit import FIT_WEIGHTS, ProjectFitIndex
+from projects.models import Project, ProjectApplication
+from projects.scoring import CandidateBatch, COMPONENT_NAMES, weighted_scores
+from projects.skills import skill_breakdown, skill_filter_mask, skill_vocabulary
+from projects.tree_ensemble import CompiledEnsemble, compile_ensemble
+from projects.vector_index import IVFIndex
+
+
+class HashEmbedder:
+    """Deterministic stand-in for SentenceTransformer: one pseudo-random vector per text."""
+    name = 'hash-embedder'
+
+    def __init__(self, dim=16):
+        self.dim = dim
+        self.calls = 0
+
+    def encode(self, texts, batch_size=32, **kwargs):
+        self.calls += 1
+        single = isinstance(texts, str)
+        texts = [texts] if single else texts
+        vectors = np.stack([
+            np.random.default_rng(int(hashlib.md5(text.encode()).hexdigest()[:8], 16))
+            .standard_normal(self.dim).astype(np.float32)
+            for text in texts
+        ])
+        return vectors[0] if single else vectors
+
+
+class FakeSupabaseQuery:
+    """The slice of the supabase-py query builder the scoring code uses, over in-memory rows."""
+
+    def __init__(self, rows):
+        self.rows = rows
+        self.filters = []
+        self.values = None
+
+    def select(self, *columns):
+        return self
+
+    def update(self, values):
+        self.values = values
+        return self
+
+    def eq(self, column, value):
+        self.filters.append(lambda row: row.get(column) == value)
+        return self
+
+    def in_(self, column, values):
+        self.filters.append(lambda row: row.get(column) in values)
+        return self
+
+    def is_(self, column, value):
+        self.filters.append(lambda row: row.get(column) is None)
+        return self
+
+    def order(self, column, desc=False):
+        return self
+
+    def execute(self):
+        matched = [row for row in self.rows if all(f(row) for f in self.filters)]
+        if self.values is not None:
+            for row in matched:
+                row.update(self.values)
+        return type('Response', (), {'data': [dict(row) for row in matched]})
+
+
+class FakeSupabase:
+    def __init__(self, **tables):
+        self.tables = tables
+
+    def table(self, name):
+        return FakeSupabaseQuery(self.tables.setdefault(name, []))
+
+
+@override_settings(MATCHER_EMBEDDING_CACHE_PATH='')
+class MatcherTestCase(TestCase):
+    """Small marketplace with the edge cases the scoring formulas branch on."""
+
+    @classmethod
+    def setUpTestData(cls):
+        company = User.objects.create(username='company')
+        cls.project = Project.objects.create(
+            company=company, title='Online shop', description='Build a shop with React and Django',
+            category='web', tech_stack=['React', 'Django', ' Postgres '], complexity='medium',
+            start_date=date(2026, 1, 1), deadline=date(2026, 3, 1),
+            budget_min=Decimal('100.00'), budget_max=Decimal('300.00'), status='open',
+        )
+        cls.unbudgeted_project = Project.objects.create(
+            company=company, title='Landing page', description='Simple page', category='design',
+            tech_stack=[], complexity='simple', start_date=date(2026, 1, 1), deadline=date(2026, 2, 1),
+        )
+        profiles = [
+            # skills, years, rating, success_rate, total_projects, proposed_rate, proposal words
+            ('React, Django, postgres', 12, '4.80', '95.00', 40, '150.00', 320),
+            ('react,vue', 3, '0.00', '0.00', 0, None, 0),
+            ('Go, Rust', 0, '2.50', '60.00', 5, '1000.00', 49),
+            ('django', 7, '5.00', '100.00', 25, '250.00', 75),
+            ('', 1, '3.10', '45.50', 2, '200.00', 100),
+        ]
+        for i, (skills, years, rating, success, total, rate, words) in enumerate(profiles):
+            user = User.objects.create(username=f'dev{i}', first_name=f'Dev{i}')
+            DeveloperProfile.objects.create(
+                user=user, title='Developer', bio=f'Developer number {i}', skills=skills,
+                experience='entry', years_experience=years, rating=Decimal(rating),
+                success_rate=Decimal(success), total_projects=total,
+            )
+            for project in (cls.project, cls.unbudgeted_project):
+                ProjectApplication.objects.create(
+                    project=project, developer=user, cover_letter=' '.join(['word'] * words),
+                    proposed_rate=Decimal(rate) if rate else None, estimated_duration='2 weeks',
+                )
+
+    def setUp(self):
+        self.matcher = FreelancerMatcher(embedder=HashEmbedder())
+
+    def candidates(self, project):
+        applications = ProjectApplication.objects.filter(project=project).select_related(
+            'developer', 'developer__developerprofile'
+        ).order_by('id')
+        return [(application.developer.developerprofile, application) for application in applications]
+
+
+class ScoringEngineParityTests(MatcherTestCase):
+    """The vectorized engine must reproduce the scalar per-application path."""
+
+    def assert_parity(self, project):
+        candidates = self.candidates(project)
+        similarities = np.random.default_rng(0).uniform(-1, 1, size=(len(candidates), 3))
+        batch = CandidateBatch.from_applications(project, candidates)
+        components = batch.component_scores()
+        features = batch.feature_matrix(similarities)
+
+        for i, (developer, application) in enumerate(candidates):
+            scalar_components = self.matcher._calculate_component_scores(project, developer, application)
+            np.testing.assert_allclose(
+                components[i], [scalar_components[name] for name in COMPONENT_NAMES], rtol=1e-12
+            )
+            scalar_features = self.matcher._extract_features(
+                project, developer, application, similarities=similarities[i]
+            )
+            np.testing.assert_allclose(features[i], scalar_features, rtol=1e-12)
+
+        expected = [
+            sum(self.matcher._calculate_component_scores(project, d, a)[name] * w
+                for name, w in zip(COMPONENT_NAMES, (0.35, 0.25, 0.20, 0.15, 0.05)))
+            for d, a in candidates
+        ]
+        np.testing.assert_allclose(weighted_scores(components), expected, rtol=1e-12)
+
+    def test_budgeted_project(self):
+        self.assert_parity(self.project)
+
+    def test_project_without_skills_or_budget(self):
+        self.assert_parity(self.unbudgeted_project)
+
+    def test_feature_matrix_shape(self):
+        candidates = self.candidates(self.project)
+        batch = CandidateBatch.from_applications(self.project, candidates)
+        self.assertEqual(batch.feature_matrix(np.zeros((len(candidates), 3))).shape, (len(candidates), 14))
+
+
+class ApplyScoringTests(MatcherTestCase):
+    """Supabase rows scored at apply time must agree with ranking the same data through the ORM."""
+
+    def test_records_score_like_orm_ranking(self):
+        ranked = {r['application_id']: r for r in self.matcher.rank_freelancers(self.project, top_n=10)}
+        project = project_record({
+            'title': self.project.title, 'description': self.project.description,
+            'tech_stack': self.project.tech_stack, 'budget_min': '100.00', 'budget_max': '300.00',
+        })
+        orm_candidates = self.candidates(self.project)
+        candidates = [
+            (
+                developer_record({
+                    'user_id': 'uuid', 'title': developer.title, 'bio': developer.bio, 'skills': developer.skills,
+                    'years_experience': developer.years_experience, 'rating': str(developer.rating),
+                    'success_rate': str(developer.success_rate), 'total_projects': developer.total_projects,
+                }),
+                application_record({
+                    'cover_letter': application.cover_letter,
+                    'proposed_rate': str(application.proposed_rate) if application.proposed_rate else None,
+                }),
+            )
+            for developer, application in orm_candidates
+        ]
+        results = self.matcher.score_candidates(project, candidates, [''] * len(candidates))
+
+        for (_, application), result in zip(orm_candidates, results):
+            self.assertEqual(result['overall_score'], ranked[application.id]['overall_score'])
+            self.assertEqual(result['component_scores'], ranked[application.id]['component_scores'])
+
+            update = score_update(result)
+            self.assertEqual(update['match_score'], result['overall_score'])
+            self.assertTrue(update['ai_reasoning'].startswith(f"Overall match: {result['overall_score']}%."))
+
+    def test_fingerprint_ignores_non_scoring_columns(self):
+        row = {'title': 'Shop', 'description': 'Build it', 'tech_stack': ['React'], 'budget_min': 100, 'budget_max': 150}
+        self.assertEqual(project_fingerprint(row), project_fingerprint(dict(row, estimated_duration='6 weeks')))
+        self.assertEqual(project_fingerprint(row), project_fingerprint(dict(row, budget_min='100.00')))
+        self.assertNotEqual(project_fingerprint(row), project_fingerprint(dict(row, tech_stack=['React', 'Go'])))
+
+    def test_project_change_keeps_manual_override_scores(self):
+        developer = {'user_id': 'dev', 'title': 'Developer', 'bio': 'Django work', 'skills': 'django'}
+        supabase = FakeSupabase(
+            projects=[{'id': 'p1', 'title': 'Shop', 'description': 'Build it', 'tech_stack': ['Django']}],
+            developer_profiles=[developer, dict(developer, user_id='dev2')],
+            project_applications=[
+                {'id': 'a1', 'project_id': 'p1', 'developer_id': 'dev', 'status': 'pending',
+                 'cover_letter': 'hello', 'match_score': 99, 'manual_override': True},
+                {'id': 'a2', 'project_id': 'p1', 'developer_id': 'dev2', 'status': 'pending',
+                 'cover_letter': 'hello', 'match_score': None, 'manual_override': False},
+            ],
+        )
+        scoring_queue = ApplicationScoringQueue(supabase_factory=lambda: supabase)
+        with patch('projects.apply_scoring._scoring_queue', scoring_queue), \
+                patch('projects.matcher.get_matcher', return_value=self.matcher):
+            notify_project_changed('p1')
+            scoring_queue.join()
+        overridden, rescored = supabase.tables['project_applications']
+        self.assertEqual(overridden['match_score'], 99)
+        self.assertIsNotNone(rescored['match_score'])
+        self.assertEqual(scoring_queue.scored, 1)
+
+    def test_override_set_during_scoring_is_kept(self):
+        developer = {'user_id': 'dev', 'title': 'Developer', 'bio': 'Django work', 'skills': 'django'}
+        application = {'id': 'a1', 'project_id': 'p1', 'developer_id': 'dev', 'status': 'pending',
+                       'cover_letter': 'hello', 'match_score': None, 'manual_override': False}
+        supabase = FakeSupabase(
+            projects=[{'id': 'p1', 'title': 'Shop', 'description': 'Build it', 'tech_stack': ['Django']}],
+            developer_profiles=[developer],
+            # The company overrides the score after the worker read the row
+            project_applications=[dict(application, match_score=99, manual_override=True)],
+        )
+        updates = score_applications(ScoringInputs(supabase), [application], matcher=self.matcher)
+        self.assertEqual(updates, {})
+        self.assertEqual(supabase.tables['project_applications'][0]['match_score'], 99)
+
+    def test_developer_change_updates_search_index(self):
+        developer = {'user_id': 'dev', 'title': 'Developer', 'bio': 'Django work', 'skills': 'django'}
+        supabase = FakeSupabase(developer_profiles=[developer], project_applications=[])
+        embedder = HashEmbedder()
+        with tempfile.TemporaryDirectory() as tmp:
+            index = DeveloperIndex(f'{tmp}/developers.npz', encode_fn=embedder.encode)
+            index.upsert_profiles([developer, dict(developer, user_id='gone')])
+            supabase.tables['developer_profiles'][0]['bio'] = 'Now mostly Rust'
+            scoring_queue = ApplicationScoringQueue(supabase_factory=lambda: supabase,
+                                                    developer_index_factory=lambda: index)
+            with patch('projects.apply_scoring._scoring_queue', scoring_queue):
+                notify_developer_changed('dev')
+                notify_developer_changed('gone')
+                scoring_queue.join()
+
+            self.assertEqual(index.index.ids, ['dev'])
+            edited = embedder.encode([profile_text(supabase.tables['developer_profiles'][0])])[0]
+            self.assertEqual(index.search_vector(edited, k=1)[0][0], 'dev')
+            self.assertAlmostEqual(index.search_vector(edited, k=1)[0][1], 1.0, places=5)
+
+
+class PastProjectsTests(MatcherTestCase):
+    def developer_ids(self):
+        return list(User.objects.filter(username__startswith='dev').order_by('id').values_list('id', flat=True))
+
+    def select(self, developer_id, project):
+        # A queryset update sends no post_save, like a write from another worker or Supabase
+        ProjectApplication.objects.filter(project=project, developer_id=developer_id).update(
+            status='selected', updated_at=timezone.now())
+
+    def test_cached_texts_cost_one_stamp_query(self):
+        ids = self.developer_ids()
+        self.select(ids[3], self.unbudgeted_project)
+        with self.assertNumQueries(2):
+            texts = self.matcher._get_past_projects_texts(ids)
+        self.assertEqual(texts[ids[3]], self.unbudgeted_project.description)
+        with self.assertNumQueries(1):
+            self.assertEqual(self.matcher._get_past_projects_texts(ids), texts)
+
+    def test_ranking_reads_stamps_once(self):
+        self.select(self.developer_ids()[3], self.unbudgeted_project)
+        self.matcher.rank_freelancers(self.project, top_n=5)
+        for clear in (self.matcher.result_cache.clear, lambda: None):
+            clear()
+            with CaptureQueriesContext(connection) as queries:
+                self.matcher.rank_freelancers(self.project, top_n=5)
+            past_project_queries = [q['sql'] for q in queries.captured_queries if "'selected'" in q['sql']]
+            self.assertEqual(len(past_project_queries), 1)
+
+    def test_ranking_version_follows_database(self):
+        version = self.matcher.rank_freelancers_page(self.project)['version']
+        self.select(self.developer_ids()[3], self.unbudgeted_project)
+        self.assertNotEqual(self.matcher.rank_freelancers_page(self.project)['version'], version)
+
+    def test_selected_application_invalidates_cache(self):
+        developer_id = self.developer_ids()[3]
+        self.assertEqual(self.matcher._get_past_projects_texts([developer_id]), {developer_id: ''})
+
+        application = ProjectApplication.objects.get(project=self.unbudgeted_project, developer_id=developer_id)
+        application.status = 'selected'
+        with patch('projects.matcher._matcher_instance', self.matcher):
+            application.save()
+        self.assertEqual(self.matcher._get_past_projects_texts([developer_id]),
+                         {developer_id: self.unbudgeted_project.description})
+
+    def test_changes_from_other_processes_are_picked_up(self):
+        developer_id = self.developer_ids()[3]
+        self.assertEqual(self.matcher._get_past_projects_texts([developer_id]), {developer_id: ''})
+
+        self.select(developer_id, self.unbudgeted_project)
+        self.assertEqual(self.matcher._get_past_projects_texts([developer_id]),
+                         {developer_id: self.unbudgeted_project.description})
+
+        Project.objects.filter(id=self.unbudgeted_project.id).update(
+            description='Rebuilt landing page', updated_at=timezone.now() + timedelta(seconds=1))
+        self.assertEqual(self.matcher._get_past_projects_texts([developer_id]),
+                         {developer_id: 'Rebuilt landing page'})
+
+
+class ResultCacheTests(MatcherTestCase):
+    def test_unchanged_ranking_is_reused(self):
+        first = self.matcher.rank_freelancers(self.project, top_n=10)
+        self.assertEqual(self.matcher.rank_freelancers(self.project, top_n=2), first[:2])
+        self.assertEqual(self.matcher.result_cache.stats()['hits'], 1)
+
+    def test_pages_follow_full_ranking(self):
+        full = self.matcher.rank_freelancers_page(self.project, limit=100)['results']
+        self.assertEqual(
+            [r['overall_score'] for r in full], sorted((r['overall_score'] for r in full), reverse=True)
+        )
+        pages = [self.matcher.rank_freelancers_page(self.project, limit=2, offset=offset) for offset in (0, 2, 4)]
+        self.assertEqual([r for page in pages for r in page['results']], full)
+        self.assertEqual(pages[0]['total'], len(full))
+
+    def test_profile_and_status_changes_invalidate(self):
+        first = {r['application_id']: r for r in self.matcher.rank_freelancers(self.project, top_n=10)}
+        developer, application = self.candidates(self.project)[1]
+        developer.skills = 'react, django, postgres'
+        developer.save()
+        updated = {r['application_id']: r for r in self.matcher.rank_freelancers(self.project, top_n=10)}
+        self.assertAlmostEqual(first[application.id]['component_scores']['skill_match'], 100 / 3)
+        self.assertEqual(updated[application.id]['component_scores']['skill_match'], 100.0)
+
+        application.status = 'rejected'
+        application.save()
+        self.assertNotIn(application.id, [r['application_id'] for r in self.matcher.rank_freelancers(self.project)])
+        self.assertEqual(self.matcher.result_cache.stats()['hits'], 0)
+
+    def test_bulk_analysis_matches_single_analyses(self):
+        applications = [application for _, application in self.candidates(self.project)]
+        other = self.candidates(self.unbudgeted_project)[0][1]
+        bulk = self.matcher.get_match_details_bulk(self.project, [a.id for a in applications] + [other.id])
+        self.assertEqual(sorted(bulk), [a.id for a in applications])
+        self.assertEqual(self.matcher.embedder.calls, 2)
+
+        single = FreelancerMatcher(embedder=HashEmbedder())
+        for application in applications:
+            self.assertEqual(bulk[application.id], single.get_match_details(application))
+            # Bulk results fill the cache single analyses read from
+            self.assertIs(self.matcher.get_match_details(application), bulk[application.id])
+
+
+class BatchRankingTests(MatcherTestCase):
+    def test_batch_ranking_matches_single_rankings(self):
+        projects = [self.project.id, self.unbudgeted_project.id]
+        expected = {project_id: self.matcher.rank_freelancers(Project.objects.get(id=project_id), top_n=10)
+                    for project_id in projects}
+        matcher = FreelancerMatcher(embedder=HashEmbedder())
+        self.assertEqual(matcher.rank_projects(projects + [0], top_n=10), {**expected, 0: []})
+        # Both projects' texts, developer profiles shared between them included, go out in one call
+        self.assertEqual(matcher.embedder.calls, 1)
+
+    def test_process_pool_scores_like_in_process(self):
+        matcher = FreelancerMatcher(embedder=HashEmbedder())
+        with patch('projects.matcher.score_projects', wraps=score_projects) as scoring:
+            matcher.rank_projects([self.project.id, self.unbudgeted_project.id])
+        embeddings, project_tasks, predictor, _ = scoring.call_args.args
+        pooled = score_projects(embeddings, project_tasks, predictor, workers=2, min_parallel_candidates=0)
+        for (scores, components, _), task in zip(pooled, project_tasks):
+            expected_scores, expected_components, _ = score_task(embeddings, task, predictor)
+            np.testing.assert_array_equal(scores, expected_scores)
+            np.testing.assert_array_equal(components, expected_components)
+
+
+class MetricsTests(MatcherTestCase):
+    def test_ranking_records_stage_spans(self):
+        items = registry.counter('matcher_stage_items_total', '')
+        before = {stage: items.value((('stage', stage),)) for stage in ('feature_extraction', 'prediction')}
+        self.matcher.rank_freelancers(self.project)
+        self.matcher.rank_freelancers(self.project)
+        for stage, count in before.items():
+            self.assertEqual(items.value((('stage', stage),)), count + 5)
+
+        text = self.client.get('/metrics/').content.decode()
+        self.assertIn('matcher_stage_seconds_count{stage="encoding"}', text)
+        self.assertIn('matcher_result_cache_total{kind="ranking",result="hit"}', text)
+
+
+class ReadinessTests(MatcherTestCase):
+    def setUp(self):
+        super().setUp()
+        for target, value in (('_matcher_instance', None), ('_warmup_thread', None)):
+            patcher = patch(f'projects.matcher.{target}', value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch.dict('projects.matcher._warmup_state', {'status': 'idle', 'error': None, 'seconds': None})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_not_ready_until_warm_up_completes(self):
+        loaded = threading.Event()
+
+        def build_matcher():
+            loaded.wait(5)
+            return self.matcher
+
+        with patch('projects.matcher.FreelancerMatcher', side_effect=build_matcher):
+            first = self.client.get('/ready/')
+            self.assertEqual((first.status_code, first.json()['status']), (503, 'idle'))
+            second = self.client.get('/ready/')
+            self.assertEqual((second.status_code, second.json()['status']), (503, 'loading'))
+
+            loaded.set()
+            # Returns the running warm-up thread rather than starting another
+            start_matcher_warmup().join(5)
+        ready = self.client.get('/ready/')
+        self.assertEqual(ready.status_code, 200)
+        self.assertTrue(ready.json()['embedder_loaded'])
+        self.assertEqual(ready.json()['model_version'], self.matcher.model_version)
+
+    def test_preloaded_matcher_is_ready(self):
+        with patch('projects.matcher.FreelancerMatcher', return_value=self.matcher), \
+                patch('gc.disable') as disable, patch('gc.collect') as collect, patch('gc.freeze') as freeze:
+            preload_matcher()
+        disable.assert_called_once()
+        freeze.assert_called_once()
+        # A collection right before freezing would punch holes in the pages the workers share
+        collect.assert_not_called()
+        response = self.client.get('/ready/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['status'], 'ready')
+
+
+def train_tiny_models(seed, n_features=14):
+    """Small GB/RF classifiers and scaler on random data, for registry and parity tests."""
+    from sklearn.ensemble import GradientBoostingClassifier, RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.default_rng(seed)
+    features = rng.standard_normal((200, n_features)) * rng.uniform(0.5, 50, n_features)
+    bins = rng.integers(0, 4, 200)
+    scaler = StandardScaler().fit(features)
+    scaled = scaler.transform(features)
+    gb = GradientBoostingClassifier(n_estimators=5, max_depth=3, random_state=seed).fit(scaled, bins)
+    rf = RandomForestClassifier(n_estimators=5, max_depth=4, random_state=seed).fit(scaled, bins)
+    return gb, rf, scaler
+
+
+class ModelRegistryTests(MatcherTestCase):
+    def test_published_version_is_hot_swapped(self):
+        with tempfile.TemporaryDirectory() as root, override_settings(MATCHER_MODEL_REGISTRY=root):
+            publish_models(root, 'v1', *train_tiny_models(1))
+            matcher = FreelancerMatcher(embedder=HashEmbedder())
+            self.assertEqual(matcher.models.version, 'v1')
+            first = matcher.rank_freelancers(self.project)
+            self.assertEqual({r['model_version'] for r in first}, {'v1/hash-embedder'})
+
+            publish_models(root, 'v2', *train_tiny_models(2))
+            self.assertEqual(current_version(root), 'v2')
+            matcher._next_model_check = 0  # poll interval elapsed
+            matcher._check_model_update()
+            matcher._model_reload_thread.join()
+            second = matcher.rank_freelancers(self.project)
+            self.assertEqual({r['model_version'] for r in second}, {'v2/hash-embedder'})
+            self.assertEqual(matcher.result_cache.stats()['hits'], 0)
+
+    @override_settings(MATCHER_ENCODE_COALESCE_MS=0)
+    def test_embedder_follows_model_metadata(self):
+        def build(model_name):
+            embedder = HashEmbedder()
+            embedder.name, embedder.backend = model_name, 'hash'
+            return embedder
+
+        with tempfile.TemporaryDirectory() as root, override_settings(MATCHER_MODEL_REGISTRY=root), \
+                patch('projects.matcher.build_embedder', side_effect=build):
+            publish_models(root, 'v1', *train_tiny_models(1), metadata={'embedding_model_name': 'encoder-a'})
+            matcher = FreelancerMatcher()
+            self.assertEqual(matcher.embedder_name, 'encoder-a')
+
+            publish_models(root, 'v2', *train_tiny_models(2), metadata={'embedding_model_name': 'encoder-b'})
+            matcher._next_model_check = 0
+            matcher._check_model_update()
+            matcher._model_reload_thread.join()
+            self.assertEqual(matcher.model_version, 'v2/encoder-b')
+
+    def test_reload_swaps_embedder_and_models_together(self):
+        def build(model_name):
+            embedder = HashEmbedder()
+            embedder.name, embedder.backend = model_name, 'hash'
+            return embedder
+
+        with tempfile.TemporaryDirectory() as root, override_settings(MATCHER_MODEL_REGISTRY=root), \
+                patch('projects.matcher.build_embedder', side_effect=build):
+            publish_models(root, 'v1', *train_tiny_models(1), metadata={'embedding_model_name': 'encoder-a'})
+            matcher = FreelancerMatcher()
+            old = matcher.serving
+            matcher.embed_texts(['start the dispatcher'])
+
+            publish_models(root, 'v2', *train_tiny_models(2), metadata={'embedding_model_name': 'encoder-b'})
+            matcher._next_model_check = 0
+            matcher._check_model_update()
+            matcher._model_reload_thread.join()
+            self.assertEqual((matcher.serving.models.version, matcher.serving.embedder_name), ('v2', 'encoder-b'))
+            # The replaced embedder's dispatcher thread exits, releasing its model
+            old.embedder._dispatcher.join(5)
+            self.assertFalse(old.embedder._dispatcher.is_alive())
+            # A request that read the old pair still scores with it
+            self.assertEqual(old.version, 'v1/encoder-a')
+            self.assertEqual(old.embedder.encode(['late']).shape, (1, 16))
+
+
+class TreeEnsembleTests(SimpleTestCase):
+    def test_compiled_ensemble_is_bit_exact(self):
+        rng = np.random.default_rng(7)
+        features = rng.standard_normal((3000, 14)) * rng.uniform(0.5, 50, 14)
+        for seed in (1, 2):
+            gb, rf, scaler = train_tiny_models(seed)
+            compiled = compile_ensemble(gb, rf, scaler)
+            scaled = scaler.transform(features)
+            gb_raw, rf_proba = compiled.raw_scores(features)
+            np.testing.assert_array_equal(gb_raw, gb.decision_function(scaled))
+            np.testing.assert_array_equal(rf_proba, rf.predict_proba(scaled))
+            gb_bins, rf_bins = compiled.predict(features)
+            np.testing.assert_array_equal(gb_bins, gb.predict(scaled))
+            np.testing.assert_array_equal(rf_bins, rf.predict(scaled))
+
+    def test_registry_serves_compiled_arrays(self):
+        gb, rf, scaler = train_tiny_models(3)
+        features = np.random.default_rng(0).standard_normal((50, 14))
+        with tempfile.TemporaryDirectory() as root:
+            publish_models(root, 'v1', gb, rf, scaler)
+            bundle = load_bundle(root, 'v1')
+            self.assertIsInstance(bundle.predictor, CompiledEnsemble)
+            self.assertIsInstance(bundle.predictor.threshold, np.memmap)
+            gb_bins, rf_bins = bundle.predict(features)
+        np.testing.assert_array_equal(gb_bins, gb.predict(scaler.transform(features)))
+        np.testing.assert_array_equal(rf_bins, rf.predict(scaler.transform(features)))
+
+
+def whitespace_offsets(texts):
+    offsets = []
+    for text in texts:
+        spans, pos = [], 0
+        for word in text.split():
+            start = text.index(word, pos)
+            pos = start + len(word)
+            spans.append((start, pos))
+        offsets.append(spans)
+    return offsets
+
+
+class EncodeSchedulerTests(SimpleTestCase):
+    def test_buckets_by_length_and_pools_long_texts(self):
+        batches = []
+
+        def encode_batch(texts):
+            batches.append([len(text.split()) for text in texts])
+            # Each window encodes as (its first word's number, 1)
+            return np.array([[float(text.split()[0]), 1.0] for text in texts])
+
+        encoder = LengthBucketedEncoder(whitespace_offsets, encode_batch, max_tokens=20, token_budget=40)
+        long_text = ' '.join(str(i) for i in range(25))  # windows of 10 words: 0-9, 10-19, 20-24
+        texts = ['7 a', long_text, '3 b c d e f', '5']
+        vectors = encoder.encode(texts, max_batch=8)
+
+        np.testing.assert_allclose(vectors[:, 1], 1.0)
+        np.testing.assert_allclose(vectors[[0, 2, 3], 0], [7, 3, 5])
+        np.testing.assert_allclose(vectors[1, 0], (0 * 10 + 10 * 10 + 20 * 5) / 25)
+        for batch in batches:
+            self.assertLessEqual(len(batch) * (max(batch) + encoder.special_tokens), 40)
+            self.assertEqual(batch, sorted(batch, reverse=True))
+        self.assertEqual(sorted(n for batch in batches for n in batch), [1, 2, 5, 6, 10, 10])
+
+
+class CoalescingEmbedderTests(SimpleTestCase):
+    def test_concurrent_submissions_share_batches(self):
+        calls = []
+
+        class RecordingEmbedder:
+            name = 'recording'
+
+            def encode(self, texts, batch_size=32, **kwargs):
+                calls.append(list(texts))
+                return np.array([[float(text.split('-')[1])] for text in texts])
+
+        coalescer = CoalescingEmbedder(RecordingEmbedder(), max_batch=16, max_wait_ms=50)
+        futures = [coalescer.submit([f'r{i}-{i}', 'shared-0']) for i in range(1, 13)]
+        for i, future in enumerate(futures, start=1):
+            np.testing.assert_array_equal(future.result(timeout=5), [[i], [0]])
+        # 12 submissions of 2 texts, each batch capped at 16 texts, 'shared-0' encoded once per batch
+        self.assertLessEqual(len(calls), 3)
+        self.assertTrue(all(len(call) <= 16 and call.count('shared-0') == 1 for call in calls))
+
+    def test_close_stops_dispatcher_after_queued_texts(self):
+        embedder = HashEmbedder()
+        coalescer = CoalescingEmbedder(embedder, max_batch=16, max_wait_ms=50)
+        queued = coalescer.submit(['queued'])
+        coalescer.close()
+        np.testing.assert_array_equal(queued.result(timeout=5), embedder.encode(['queued']))
+        coalescer._dispatcher.join(5)
+        self.assertFalse(coalescer._dispatcher.is_alive())
+        # A request still holding the closed embedder encodes on its own thread
+        np.testing.assert_array_equal(coalescer.encode(['late']), embedder.encode(['late']))
+
+
+class ProjectFitIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.embedder = HashEmbedder()
+        self.fit = ProjectFitIndex(encode_fn=self.embedder.encode)
+        self.projects = [
+            {'id': i, 'title': f'Project {i}', 'description': f'Build feature {i}', 'tech_stack': stack,
+             'budget_min': 40, 'budget_max': 60, 'updated_at': '2026-01-01'}
+            for i, stack in enumerate([['Python', 'Django'], ['React'], [], ['Go', 'Python']])
+        ]
+        self.developer = {'title': 'Backend dev', 'bio': 'APIs', 'skills': 'python,django', 'hourly_rate': 70}
+
+    def expected(self, projects):
+        developer = self.embedder.encode([profile_text(self.developer)])[0]
+        expected = []
+        for project, skill_match in zip(projects, [100, 0, 50, 50]):
+            vector = self.embedder.encode([project_record_text(project)])[0]
+            cosine = developer @ vector / np.linalg.norm(developer) / np.linalg.norm(vector)
+            # Rate 70 against a midpoint of 50: 40% over budget
+            expected.append(np.array([skill_match, np.clip(cosine, 0, 1) * 100, 60]) @ FIT_WEIGHTS)
+        return expected
+
+    def test_scores_match_component_formulas(self):
+        np.testing.assert_allclose(self.fit.score(self.developer, self.projects), self.expected(self.projects),
+                                   rtol=1e-5)
+
+    def test_sync_encodes_only_changed_projects(self):
+        self.fit.sync(self.projects)
+        calls = self.embedder.calls
+        self.fit.sync(self.projects)
+        self.assertEqual(self.embedder.calls, calls)
+
+        changed = dict(self.projects[1], description='Rewrite the frontend', updated_at='2026-02-01')
+        encoded = []
+        self.fit._encode_fn = lambda texts: encoded.append(texts) or self.embedder.encode(texts)
+        self.fit.sync([self.projects[0], changed])
+        self.assertEqual(len(encoded), 1)
+        self.assertEqual(len(encoded[0]), 1)
+
+    def test_retain_compacts_closed_projects(self):
+        self.fit.sync(self.projects)
+        self.fit.retain(['0', '3'])
+        self.assertEqual(len(self.fit.index), 2)
+        # Half the rows were tombstones, past MAX_DEAD_FRACTION
+        self.assertEqual(self.fit.index.tombstones, 0)
+        open_projects = [self.projects[3], self.projects[0]]
+        expected = self.expected(self.projects)
+        np.testing.assert_allclose(self.fit.score(self.developer, open_projects), [expected[3], expected[0]],
+                                   rtol=1e-5)
+
+
+class ProjectBrowseTests(SimpleTestCase):
+    def test_skill_filter_keeps_other_open_projects_indexed(self):
+        embedder = HashEmbedder()
+        fit = ProjectFitIndex(encode_fn=embedder.encode)
+        projects = [
+            {'id': i, 'title': f'Project {i}', 'description': 'Build it', 'tech_stack': stack, 'status': 'open',
+             'budget_min': 10, 'budget_max': 20, 'category': 'web', 'complexity': 'simple',
+             'estimated_duration': '1 week', 'created_at': '2026-01-01', 'updated_at': '2026-01-01',
+             'company_id': 'company'}
+            for i, stack in enumerate([['React'], ['Django'], ['Go']])
+        ]
+        developer = {'user_id': 'dev', 'title': 'Dev', 'bio': 'React', 'skills': 'react', 'hourly_rate': 15}
+        with patch('accounts.views.get_supabase_client', return_value=FakeSupabase(projects=projects)), \
+                patch('accounts.views._get_browsing_developer_profile', return_value=developer), \
+                patch('projects.project_fit.get_project_fit_index', return_value=fit):
+            self.client.get('/api/auth/projects/')
+            calls = embedder.calls
+            filtered = self.client.get('/api/auth/projects/?skills=react').json()
+            self.assertEqual([p['id'] for p in filtered['projects']], [0])
+            self.assertEqual(sorted(fit.index.ids), ['0', '1', '2'])
+            self.client.get('/api/auth/projects/')
+        # Only the developer profile is encoded again, never the projects
+        self.assertEqual(embedder.calls, calls + 2)
+
+
+class IVFIndexTests(SimpleTestCase):
+    def test_similarities_by_row_and_compaction_threshold(self):
+        vectors = np.random.default_rng(0).standard_normal((10, 8)).astype(np.float32)
+        index = IVFIndex(dim=8)
+        index.upsert([str(i) for i in range(10)], vectors)
+        query = vectors[0]
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        np.testing.assert_allclose(index.similarities_by_row(query, index.rows(['3', '7'])),
+                                   unit[[3, 7]] @ (query / np.linalg.norm(query)), rtol=1e-5)
+
+        index.remove(['1', '2'])
+        self.assertFalse(index.compact())
+        index.remove(['4'])
+        self.assertTrue(index.compact())
+        self.assertEqual(index.tombstones, 0)
+        self.assertEqual(sorted(index.ids), ['0', '3', '5', '6', '7', '8', '9'])
+        np.testing.assert_allclose(index.get('7'), unit[7], rtol=1e-5)
+
+
+class DeveloperIndexTests(SimpleTestCase):
+    def setUp(self):
+        self.embedder = HashEmbedder()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.path = f'{tmp.name}/developers.npz'
+        self.profiles = [
+            {'user_id': f'dev{i}', 'title': f'Developer {i}', 'bio': f'Bio {i}', 'skills': 'python'}
+            for i in range(6)
+        ]
+
+    def open_index(self):
+        return DeveloperIndex(self.path, encode_fn=self.embedder.encode)
+
+    def vector(self, profile):
+        return self.embedder.encode([profile_text(profile)])[0]
+
+    def test_ivf_recall_against_exact_search(self):
+        rng = np.random.default_rng(0)
+        centers = rng.standard_normal((64, 32))
+        vectors = (centers[rng.integers(0, 64, 6000)] + 0.3 * rng.standard_normal((6000, 32))).astype(np.float32)
+        index = IVFIndex(dim=32, nprobe=8)
+        index.upsert([str(i) for i in range(len(vectors))], vectors)
+        index.train()
+        self.assertIsNotNone(index.centroids)
+
+        unit = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        queries = vectors[rng.choice(len(vectors), 50, replace=False)] + 0.1 * rng.standard_normal((50, 32))
+        found = 0
+        for query in queries:
+            exact = np.argsort(-(unit @ (query / np.linalg.norm(query))))[:10]
+            found += len({str(i) for i in exact} & {item_id for item_id, _ in index.search(query, k=10)})
+        self.assertGreaterEqual(found / (10 * len(queries)), 0.9)
+
+    def test_incremental_upsert_and_remove(self):
+        index = self.open_index()
+        self.assertEqual(index.upsert_profiles(self.profiles), 6)
+        calls = self.embedder.calls
+        self.assertEqual(index.upsert_profiles(self.profiles), 0)
+        self.assertEqual(self.embedder.calls, calls)
+
+        edited = dict(self.profiles[2], bio='Rust and embedded systems')
+        self.assertEqual(index.upsert_profiles([edited]), 1)
+        self.assertEqual(index.search_vector(self.vector(edited), k=1), [('dev2', ANY)])
+        vector = self.vector(edited)
+        np.testing.assert_allclose(index.index.get('dev2'), vector / np.linalg.norm(vector), rtol=1e-5)
+
+        index.remove(['dev0', 'dev4'])
+        self.assertEqual(len(index), 4)
+        self.assertNotIn('dev0', [item_id for item_id, _ in index.search_vector(self.vector(self.profiles[0]), k=6)])
+
+    def test_journal_replays_after_restart(self):
+        writer = self.open_index()
+        writer.rebuild(self.profiles[:4])
+        reader = self.open_index()
+        writer.upsert_profiles(self.profiles[4:])
+        writer.remove(['dev1'])
+
+        # An open index picks up the other worker's writes on its next search, a new one on load
+        for index in (reader, self.open_index()):
+            self.assertEqual(index.search_vector(self.vector(self.profiles[5]), k=1)[0][0], 'dev5')
+            self.assertEqual(sorted(index.index.ids), ['dev0', 'dev2', 'dev3', 'dev4', 'dev5'])
+            self.assertEqual(index.fingerprints.keys(), writer.fingerprints.keys())
+
+        writer.rebuild(self.profiles[:2])
+        # The rotated journal is folded into the snapshot; nothing was appended since
+        self.assertFalse(os.path.exists(writer.journal_path))
+        self.assertFalse(os.path.exists(writer.rotated_journal_path))
+        reader.refresh()
+        self.assertEqual(sorted(reader.index.ids), ['dev0', 'dev1'])
+
+    def test_records_appended_during_rebuild_survive(self):
+        writer, other = self.open_index(), self.open_index()
+        writer.rebuild(self.profiles[:3])
+        reader = self.open_index()
+        other.upsert_profiles([self.profiles[3]])
+        reader.refresh()
+        self.assertIn('dev3', reader.index.ids)
+
+        def profiles():
+            # Another worker writes while the rebuild is still reading profiles
+            yield from self.profiles[:2]
+            other.upsert_profiles([self.profiles[4]])
+            other.remove(['dev0'])
+            # Other workers follow the new journal before the new snapshot lands
+            reader.refresh()
+            self.assertEqual(sorted(reader.index.ids), ['dev1', 'dev2', 'dev3', 'dev4'])
+            yield from self.profiles[2:3]
+
+        writer.rebuild(profiles())
+        for index in (writer, reader, self.open_index()):
+            index.refresh()
+            self.assertEqual(sorted(index.index.ids), ['dev1', 'dev2', 'dev4'])
+            np.testing.assert_allclose(index.index.get('dev4'), self.vector(self.profiles[4]) /
+                                       np.linalg.norm(self.vector(self.profiles[4])), rtol=1e-5)
+
+
+class EmbeddingSidecarTests(SimpleTestCase):
+    def start_server(self, embedder):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        server = EmbeddingServer(f'{tmp.name}/embed.sock', embedder, max_batch=8, max_wait_ms=1)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return server
+
+    def test_socket_protocol_round_trip(self):
+        embedder = HashEmbedder()
+        server = self.start_server(embedder)
+        client = EmbeddingClient(server.socket_path, timeout=5)
+
+        self.assertEqual(client.info()['name'], 'hash-embedder')
+        texts = ['first text', 'second text', 'first text']
+        np.testing.assert_array_equal(client.encode(texts), embedder.encode(texts))
+        # The connection is reused for the next request, including an empty one
+        self.assertEqual(client.encode([]).shape, (0, 0))
+        np.testing.assert_array_equal(client.encode(['third']), embedder.encode(['third']))
+        self.assertEqual(client.info()['texts_encoded'], 3)
+
+        sidecar = SidecarEmbedder(client, 'hash-embedder', fallback_factory=self.fail)
+        np.testing.assert_array_equal(sidecar.encode('third'), embedder.encode('third'))
+        self.assertEqual((sidecar.remote_calls, sidecar.fallback_calls), (1, 0))
+
+    def test_falls_back_and_backs_off_while_server_is_down(self):
+        class DownClient:
+            calls = 0
+
+            def info(self):
+                DownClient.calls += 1
+                raise ConnectionRefusedError('no server')
+
+        fallback = HashEmbedder()
+        sidecar = SidecarEmbedder(DownClient(), 'hash-embedder', fallback_factory=lambda: fallback, retry_initial=60)
+        with self.assertLogs('projects.embedding_server', 'WARNING'):
+            np.testing.assert_array_equal(sidecar.encode(['a', 'b']), fallback.encode(['a', 'b']))
+        sidecar.encode(['c'])
+        # The second call doesn't wait on the server again inside the backoff window
+        self.assertEqual(DownClient.calls, 1)
+        self.assertEqual((sidecar.remote_calls, sidecar.fallback_calls), (0, 2))
+
+    def test_rejects_server_with_another_model(self):
+        server = self.start_server(HashEmbedder())
+        fallback = HashEmbedder(dim=8)
+        sidecar = SidecarEmbedder(EmbeddingClient(server.socket_path), 'other-model',
+                                  fallback_factory=lambda: fallback)
+        with self.assertLogs('projects.embedding_server', 'WARNING') as logs:
+            self.assertEqual(sidecar.encode(['a']).shape, (1, 8))
+        self.assertIn("'hash-embedder'", logs.output[0])
+        self.assertEqual(sidecar.remote_calls, 0)
+
+    @skipUnless(importlib.util.find_spec('tokenizers'), 'tokenizers is not installed')
+    def test_server_down_at_boot_keeps_fallback_lazy(self):
+        from tokenizers import Tokenizer, models, processors
+
+        model_dir = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, model_dir)
+        tokenizer = Tokenizer(models.WordLevel({'[UNK]': 0, '[CLS]': 1, '[SEP]': 2}, unk_token='[UNK]'))
+        tokenizer.post_processor = processors.TemplateProcessing(
+            single='[CLS] $A [SEP]', special_tokens=[('[CLS]', 1), ('[SEP]', 2)])
+        tokenizer.save(os.path.join(model_dir, 'tokenizer.json'))
+        with open(os.path.join(model_dir, 'sentence_bert_config.json'), 'w') as f:
+            json.dump({'max_seq_length': 128}, f)
+
+        with override_settings(MATCHER_EMBEDDING_SOCKET=os.path.join(model_dir, 'missing.sock')), \
+                patch('projects.embedders.TorchEmbedder', side_effect=AssertionError('model loaded')):
+            with self.assertLogs('projects.embedders', 'WARNING'):
+                sidecar = build_embedder(model_dir, 'torch')
+        # 128 tokens less [CLS], [SEP] and the scheduler's margin
+        self.assertEqual(sidecar.name, windowed_embedder_name(model_dir, 118))
+        self.assertIsNone(sidecar._fallback)
+
+
+def build_tiny_sentence_transformer(directory):
+    """Randomly initialised 2-layer BERT with mean pooling, saved as a local SentenceTransformer."""
+    import torch
+    from sentence_transformers import SentenceTransformer, models
+    from transformers import BertConfig, BertModel, BertTokenizerFast
+
+    base = os.path.join(directory, 'bert')
+    os.makedirs(base)
+    words = ('build web mobile app design data project developer senior full stack python django react '
+             'swift stores tests the a and with in for i have can').split()
+    characters = list('abcdefghijklmnopqrstuvwxyz0123456789.,-/')
+    vocab = ['[PAD]', '[UNK]', '[CLS]', '[SEP]', '[MASK]'] + words + characters + ['##' + c for c in characters]
+    with open(os.path.join(base, 'vocab.txt'), 'w') as f:
+        f.write('\n'.join(vocab))
+    torch.manual_seed(0)
+    config = BertConfig(vocab_size=len(vocab), hidden_size=32, num_hidden_layers=2, num_attention_heads=2,
+                        intermediate_size=64, max_position_embeddings=64)
+    BertModel(config).save_pretrained(base)
+    BertTokenizerFast(vocab_file=os.path.join(base, 'vocab.txt')).save_pretrained(base)
+
+    path = os.path.join(directory, 'tiny-encoder')
+    transformer = models.Transformer(base, max_seq_length=32)
+    SentenceTransformer(modules=[transformer, models.Pooling(32, 'mean'), models.Normalize()]).save(path)
+    return path
+
+
+@skipUnless(all(importlib.util.find_spec(m) for m in ('torch', 'onnxruntime', 'onnx', 'sentence_transformers')),
+            'ONNX export needs torch, onnx, onnxruntime and sentence-transformers')
+class OnnxExportParityTests(SimpleTestCase):
+    def test_int8_export_matches_torch(self):
+        from projects.embedders import (
+            ONNX_CONFIG_FILE, OnnxEmbedder, TorchEmbedder, configured_embedder_name, embedding_parity,
+        )
+        from projects.management.commands.export_onnx_embedder import SAMPLE_TEXTS
+
+        with tempfile.TemporaryDirectory() as tmp, override_settings(MATCHER_ONNX_DIR=os.path.join(tmp, 'onnx')):
+            model_path = build_tiny_sentence_transformer(tmp)
+            call_command('export_onnx_embedder', '--model', model_path, '--tolerance', '0.02', stdout=StringIO())
+
+            onnx = OnnxEmbedder(model_path)
+            with open(os.path.join(onnx.model_dir, ONNX_CONFIG_FILE)) as f:
+                self.assertTrue(json.load(f)['parity_passed'])
+            torch_embedder = TorchEmbedder(model_path)
+            parity = embedding_parity(torch_embedder, onnx, SAMPLE_TEXTS)
+            self.assertLessEqual(parity['max_similarity_error'], 0.02)
+            self.assertGreaterEqual(parity['min_self_cosine'], 0.99)
+
+            # The sidecar's cache key when it can't load the model
+            self.assertEqual(configured_embedder_name(model_path, 'torch'), torch_embedder.name)
+            self.assertEqual(configured_embedder_name(model_path, 'onnx'), onnx.name)
+
+
+class EmbeddingCacheTests(SimpleTestCase):
+    def setUp(self):
+        self.embedder = HashEmbedder()
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.disk_path = os.path.join(tmp.name, 'embeddings.sqlite3')
+
+    def test_repeated_encode_skips_encoder(self):
+        cache = EmbeddingCache(max_bytes=1 << 20)
+        texts = ['bio one', 'bio two', 'bio one']
+        first = cache.encode(texts, 'model', self.embedder.encode)
+        self.assertEqual(self.embedder.calls, 1)
+        np.testing.assert_array_equal(cache.encode(texts, 'model', self.embedder.encode), first)
+        self.assertEqual(self.embedder.calls, 1)
+        self.assertEqual((cache.misses, cache.memory_hits), (2, 2))
+
+    def test_cached_vectors_own_their_memory(self):
+        cache = EmbeddingCache(max_bytes=1 << 20)
+        cache.encode(['one', 'two', 'three'], 'model', self.embedder.encode)
+        for vector in cache.memory.get_many(list(cache.memory._entries)).values():
+            self.assertIsNone(vector.base)
+
+    def test_lru_evicts_least_recently_used(self):
+        vector = np.zeros(4, dtype=np.float32)
+        lru = LRUEmbeddingCache(max_bytes=3 * vector.nbytes)
+        lru.put_many({'a': vector, 'b': vector, 'c': vector})
+        lru.get_many(['a'])
+        lru.put_many({'d': vector})
+        self.assertEqual(set(lru.get_many(['a', 'b', 'c', 'd'])), {'a', 'c', 'd'})
+        self.assertEqual(lru.current_bytes, 3 * vector.nbytes)
+
+    def test_disk_store_persists_across_instances(self):
+        texts = ['project text', 'cover letter']
+        first = EmbeddingCache(max_bytes=1 << 20, disk_path=self.disk_path).encode(
+            texts, 'model', self.embedder.encode)
+
+        restarted = EmbeddingCache(max_bytes=1 << 20, disk_path=self.disk_path)
+        np.testing.assert_array_equal(restarted.encode(texts, 'model', self.fail), first)
+        self.assertEqual((restarted.disk_hits, restarted.misses), (2, 0))
+
+    def test_keys_are_separate_per_model(self):
+        cache = EmbeddingCache(max_bytes=1 << 20, disk_path=self.disk_path)
+        cache.encode(['same text'], 'model-a', self.embedder.encode)
+        other = cache.encode(['same text'], 'model-b', lambda texts: np.ones((len(texts), 16)))
+        self.assertEqual(self.embedder.calls, 1)
+        self.assertEqual(cache.misses, 2)
+        np.testing.assert_array_equal(other, np.ones((1, 16)))
+
+
+class SkillIndexTests(TestCase):
+    def test_breakdown_matches_set_arithmetic(self):
+        required = skill_vocabulary.project_skills(['React', 'Django', ' Postgres '])
+        offered = skill_vocabulary.developer_skills('react, vue,postgres')
+        self.assertEqual(skill_breakdown(required, offered), (['postgres', 'react'], ['django'], ['vue']))
+
+    def test_filter_mask(self):
+        rows = [skill_vocabulary.developer_skills(skills) for skills in ('react,django', 'go', 'django', '')]
+        np.testing.assert_array_equal(skill_filter_mask(rows, ['django', 'go']), [True, True, True, False])
+        np.testing.assert_array_equal(skill_filter_mask(rows, ['django', 'react'], 'all'), [True, False, False, False])
+        np.testing.assert_array_equal(skill_filter_mask(rows, ['cobol']), [False] * 4)
+
+
+class StartupImportTests(SimpleTestCase):
+    def test_url_conf_does_not_import_ml_stack(self):
+        script = (
+            "import os, sys, django\n"
+            "os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'devconnect.settings')\n"
+            "os.environ['MATCHER_WARMUP'] = 'False'\n"
+            "django.setup()\n"
+            "import devconnect.urls\n"
+            "print('ML:' + ','.join(m for m in ('torch', 'sentence_transformers', 'sklearn') if m in sys.modules))\n"
+        )
+        result = subprocess.run([sys.executable, '-c', script], cwd=settings.BASE_DIR,
+                                capture_output=True, text=True)
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self.assertIn('ML:\n', result.stdout)
@@ -44,6 +44,26 @@ def analyze_application(application_id: int) -> Optional[Dict]:
     return matcher.get_match_details(application)
 
 
+def analyze_applications(project_id: int, application_ids: List[int]) -> Dict[int, Dict]:
+    """
+    Get detailed match analyses for many applications to one project.
+    
+    Args:
+        project_id: ID of the project
+        application_ids: IDs of the project's applications
+    
+    Returns:
+        Dict mapping application ID to its analysis; IDs that are not
+        applications to the project are left out
+    
+    Raises:
+        Project.DoesNotExist: If project not found
+    """
+    project = Project.objects.get(id=project_id)
+    matcher = get_matcher()
+    return matcher.get_match_details_bulk(project, application_ids)
+
+
 def shortlist_freelancer(application_id: int) -> bool:
     """
     Shortlist a freelancer for a project.
@@ -114,25 +134,21 @@ def batch_rank_projects(project_ids: List[int], top_n: int = 5) -> Dict[int, Lis
     """
     Rank freelancers for multiple projects.
     
+    Texts shared between projects are encoded once and the projects are
+    scored in parallel (see ``FreelancerMatcher.rank_projects``).
+    
     Args:
         project_ids: List of project IDs
         top_n: Number of top freelancers per project
     
     Returns:
-        Dict mapping project_id to ranked freelancers
+        Dict mapping project_id to ranked freelancers (empty for unknown projects)
     """
-    results = {}
-    
-    for project_id in project_ids:
-        try:
-            results[project_id] = get_top_freelancers(project_id, top_n=top_n)
-        except Project.DoesNotExist:
-            results[project_id] = []
-        except Exception as e:
-            print(f"Error ranking project {project_id}: {e}")
-            results[project_id] = []
-    
-    return results
+    try:
+        return get_matcher().rank_projects(project_ids, top_n=top_n)
+    except Exception as e:
+        print(f"Error ranking {len(project_ids)} projects: {e}")
+        return {project_id: [] for project_id in project_ids}
 
 
 def get_freelancer_stats(application_id: int) -> Optional[Dict]:
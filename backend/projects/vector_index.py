@@ -0,0 +1,254 @@
+"""
+In-process approximate nearest-neighbour index over embedding vectors.
+
+An inverted-file (IVF) index in pure NumPy: vectors are L2-normalised and
+partitioned by a spherical k-means coarse quantizer, and a query scans only
+the ``nprobe`` partitions whose centroids are closest to it. Rows can be
+added, updated and deleted incrementally; deleted rows are tombstoned and
+dropped at the next ``train``, or by ``compact`` once they take up too much
+of the storage. Until the index is trained (or while it is small) searches
+fall back to an exact scan, which is one matrix-vector product.
+"""
+
+import json
+import os
+import tempfile
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return np.divide(vectors, norms, out=np.zeros_like(vectors), where=norms != 0)
+
+
+class IVFIndex:
+    """Cosine-similarity IVF index keyed by string ids."""
+
+    # Below this many live vectors an exact scan is as fast as probing
+    MIN_TRAIN_SIZE = 4096
+    # ``compact`` rewrites storage once this share of its rows are tombstones
+    MAX_DEAD_FRACTION = 0.25
+
+    def __init__(self, dim: int, nprobe: int = 8):
+        self.dim = dim
+        self.nprobe = nprobe
+        self.centroids: Optional[np.ndarray] = None
+        self.trained_size = 0
+        self._vectors = np.zeros((0, dim), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._assign = np.zeros(0, dtype=np.int32)
+        self._ids: List[Optional[str]] = []
+        self._rows: Dict[str, int] = {}
+        # Inverted lists as CSR (rows sorted by partition), rebuilt lazily after writes
+        self._list_rows: Optional[np.ndarray] = None
+        self._list_offsets: Optional[np.ndarray] = None
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __contains__(self, item_id: str) -> bool:
+        return item_id in self._rows
+
+    @property
+    def ids(self) -> List[str]:
+        return list(self._rows)
+
+    @property
+    def tombstones(self) -> int:
+        return len(self._ids) - len(self._rows)
+
+    def _reserve(self, extra: int):
+        size = len(self._ids)
+        capacity = len(self._vectors)
+        if size + extra <= capacity:
+            return
+        new_capacity = max(size + extra, capacity * 2, 1024)
+        for name, fill in (('_vectors', 0), ('_alive', False), ('_assign', -1)):
+            old = getattr(self, name)
+            grown = np.full((new_capacity,) + old.shape[1:], fill, dtype=old.dtype)
+            grown[:size] = old[:size]
+            setattr(self, name, grown)
+
+    def _nearest_centroids(self, vectors: np.ndarray) -> np.ndarray:
+        if self.centroids is None:
+            return np.full(len(vectors), -1, dtype=np.int32)
+        return np.argmax(vectors @ self.centroids.T, axis=1).astype(np.int32)
+
+    def upsert(self, ids: Sequence[str], vectors: np.ndarray):
+        """Add new ids or replace the vectors of existing ones."""
+        if not len(ids):
+            return
+        vectors = normalize_rows(vectors).reshape(len(ids), self.dim)
+        assign = self._nearest_centroids(vectors)
+        new_ids = [item_id for item_id in dict.fromkeys(ids) if item_id not in self._rows]
+        self._reserve(len(new_ids))
+        for item_id in new_ids:
+            self._rows[item_id] = len(self._ids)
+            self._ids.append(item_id)
+        rows = np.array([self._rows[item_id] for item_id in ids], dtype=np.int64)
+        self._vectors[rows] = vectors
+        self._assign[rows] = assign
+        self._alive[rows] = True
+        self._list_rows = None
+
+    def remove(self, ids: Sequence[str]):
+        for item_id in ids:
+            row = self._rows.pop(item_id, None)
+            if row is not None:
+                self._alive[row] = False
+                self._ids[row] = None
+        self._list_rows = None
+
+    def get(self, item_id: str) -> Optional[np.ndarray]:
+        row = self._rows.get(item_id)
+        return None if row is None else self._vectors[row]
+
+    def _compact(self):
+        """Drop tombstoned rows so live vectors are contiguous."""
+        live = np.flatnonzero(self._alive[:len(self._ids)])
+        self._vectors = self._vectors[live].copy()
+        self._assign = self._assign[live].copy()
+        self._alive = np.ones(len(live), dtype=bool)
+        self._ids = [self._ids[row] for row in live]
+        self._rows = {item_id: row for row, item_id in enumerate(self._ids)}
+        self._list_rows = None
+
+    def compact(self, max_dead_fraction: Optional[float] = None) -> bool:
+        """
+        Drop tombstoned rows if they exceed ``max_dead_fraction`` of storage
+        (default ``MAX_DEAD_FRACTION``). Returns whether storage was rewritten,
+        which moves rows.
+        """
+        threshold = self.MAX_DEAD_FRACTION if max_dead_fraction is None else max_dead_fraction
+        if not self.tombstones or self.tombstones <= threshold * len(self._ids):
+            return False
+        self._compact()
+        return True
+
+    def _inverted_lists(self) -> Tuple[np.ndarray, np.ndarray]:
+        if self._list_rows is None:
+            assign = self._assign[:len(self._ids)]
+            self._list_rows = np.argsort(assign, kind='stable')
+            self._list_offsets = np.searchsorted(assign[self._list_rows], np.arange(len(self.centroids) + 1))
+        return self._list_rows, self._list_offsets
+
+    def train(self, nlist: Optional[int] = None, iterations: int = 10, seed: int = 0):
+        """
+        Fit the coarse quantizer with spherical k-means and reassign all rows.
+
+        Small indexes (fewer than ``MIN_TRAIN_SIZE`` live vectors) are left
+        untrained and searched exactly.
+        """
+        self._compact()
+        n = len(self._ids)
+        if n < self.MIN_TRAIN_SIZE:
+            self.centroids = None
+            self._assign[:] = -1
+            self.trained_size = 0
+            return
+
+        nlist = nlist or int(np.clip(np.sqrt(n), 16, 4096))
+        rng = np.random.default_rng(seed)
+        sample_size = min(n, nlist * 64)
+        sample = self._vectors[rng.choice(n, sample_size, replace=False)]
+        centroids = sample[rng.choice(sample_size, nlist, replace=False)].copy()
+
+        for _ in range(iterations):
+            labels = np.argmax(sample @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, labels, sample)
+            counts = np.bincount(labels, minlength=nlist)
+            empty = counts == 0
+            if empty.any():
+                sums[empty] = sample[rng.choice(sample_size, int(empty.sum()), replace=False)]
+            centroids = normalize_rows(sums)
+
+        self.centroids = centroids
+        self.trained_size = n
+        for start in range(0, n, 65536):
+            self._assign[start:start + 65536] = self._nearest_centroids(self._vectors[start:start + 65536])
+        self._list_rows = None
+
+    def _candidate_rows(self, query: np.ndarray, nprobe: int) -> np.ndarray:
+        size = len(self._ids)
+        alive = self._alive[:size]
+        if self.centroids is None:
+            return np.flatnonzero(alive)
+        nprobe = min(nprobe, len(self.centroids))
+        closeness = self.centroids @ query
+        probe = np.argpartition(-closeness, nprobe - 1)[:nprobe]
+        list_rows, offsets = self._inverted_lists()
+        rows = np.concatenate([list_rows[offsets[p]:offsets[p + 1]] for p in probe])
+        return rows[alive[rows]]
+
+    def search(self, query: np.ndarray, k: int = 10, nprobe: Optional[int] = None,
+               exclude: Sequence[str] = ()) -> List[Tuple[str, float]]:
+        """Return up to ``k`` ``(id, cosine similarity)`` pairs, best first."""
+        if not self._rows:
+            return []
+        query = normalize_rows(query).reshape(self.dim)
+        rows = self._candidate_rows(query, nprobe or self.nprobe)
+        if exclude:
+            excluded = [self._rows[item_id] for item_id in exclude if item_id in self._rows]
+            rows = rows[~np.isin(rows, excluded)]
+        if not len(rows):
+            return []
+        scores = self._vectors[rows] @ query
+        k = min(k, len(rows))
+        top = np.argpartition(-scores, k - 1)[:k]
+        top = top[np.argsort(-scores[top], kind='stable')]
+        return [(self._ids[rows[i]], float(scores[i])) for i in top]
+
+    def rows(self, ids: Sequence[str]) -> np.ndarray:
+        """Storage rows of ``ids`` (all must be present); valid until the next ``train`` or compaction."""
+        return np.fromiter((self._rows[item_id] for item_id in ids), dtype=np.int64, count=len(ids))
+
+    def similarities_by_row(self, query: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        """Exact cosine similarity of ``query`` to the vectors stored at ``rows``."""
+        query = normalize_rows(query).reshape(self.dim)
+        return self._vectors[rows] @ query
+
+    def save(self, path: str, metadata: Optional[Dict] = None):
+        """Write a compacted snapshot to a single ``.npz`` file, replaced atomically."""
+        self._compact()
+        directory = os.path.dirname(path) or '.'
+        os.makedirs(directory, exist_ok=True)
+        header = {
+            'dim': self.dim,
+            'nprobe': self.nprobe,
+            'trained_size': self.trained_size,
+            'metadata': metadata or {},
+        }
+        arrays = {
+            'header': np.array(json.dumps(header)),
+            'ids': np.array(self._ids, dtype=str),
+            'vectors': self._vectors,
+            'assign': self._assign,
+        }
+        if self.centroids is not None:
+            arrays['centroids'] = self.centroids
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.npz')
+        with os.fdopen(fd, 'wb') as f:
+            np.savez(f, **arrays)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> Tuple[Optional['IVFIndex'], Dict]:
+        """Load a snapshot written by ``save``; returns ``(None, {})`` if there is none."""
+        if not os.path.exists(path):
+            return None, {}
+        with np.load(path, allow_pickle=False) as data:
+            header = json.loads(str(data['header']))
+            index = cls(dim=header['dim'], nprobe=header.get('nprobe', 8))
+            index._ids = [str(item_id) for item_id in data['ids']]
+            index._vectors = data['vectors']
+            index._assign = data['assign']
+            if 'centroids' in data:
+                index.centroids = data['centroids']
+                index.trained_size = header.get('trained_size', len(index._ids))
+        index._rows = {item_id: row for row, item_id in enumerate(index._ids)}
+        index._alive = np.ones(len(index._ids), dtype=bool)
+        return index, header.get('metadata', {})
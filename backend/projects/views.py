@@ -1,5 +1,5 @@
 from django.shortcuts import render
-from django.http import JsonResponse
+from django.http import HttpResponse, JsonResponse
 
 def project_list(request):
     return JsonResponse({'message': 'Project list endpoint'})
@@ -14,4 +14,20 @@ def project_apply(request, pk):
     return JsonResponse({'message': f'Apply to project {pk} endpoint'})
 
 def project_submissions(request, pk):
-    return JsonResponse({'message': f'Project {pk} submissions endpoint'})
\ No newline at end of file
+    return JsonResponse({'message': f'Project {pk} submissions endpoint'})
+
+def readiness(request):
+    """Load-balancer readiness probe: 200 once the matcher is warmed up, else 503."""
+    from projects.matcher import matcher_readiness, start_matcher_warmup
+
+    state = matcher_readiness()
+    if state['status'] == 'idle':
+        # Warm-up at boot is disabled or this server wasn't recognised; start it now
+        start_matcher_warmup()
+    return JsonResponse(state, status=200 if state['ready'] else 503)
+
+def metrics(request):
+    """Matcher stage timings and cache counters of this worker, in Prometheus text format."""
+    from projects.metrics import registry
+
+    return HttpResponse(registry.render(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -0,0 +1,138 @@
+"""
+Report per-worker memory of a gunicorn server, with and without matcher preloading.
+
+Unique set size (USS: private clean + private dirty pages) is the memory a
+worker would free if it exited, i.e. what each extra worker really costs.
+
+Usage (from backend/, Linux only):
+    # Start gunicorn twice (MATCHER_PRELOAD off, then on) and compare
+    python scripts/measure_worker_memory.py --compare --workers 4
+
+    # Measure a server that is already running
+    python scripts/measure_worker_memory.py --pid <gunicorn master pid>
+"""
+
+import argparse
+import os
+import signal
+import socket
+import subprocess
+import sys
+import time
+import urllib.error
+import urllib.request
+from typing import Dict, List
+
+
+def memory(pid: int) -> Dict[str, int]:
+    """RSS, PSS, USS and shared memory of a process in kB, from /proc/<pid>/smaps_rollup."""
+    fields = {}
+    with open(f'/proc/{pid}/smaps_rollup') as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) >= 2 and parts[0].endswith(':') and parts[1].isdigit():
+                fields[parts[0][:-1]] = int(parts[1])
+    return {
+        'rss': fields.get('Rss', 0),
+        'pss': fields.get('Pss', 0),
+        'uss': fields.get('Private_Clean', 0) + fields.get('Private_Dirty', 0),
+        'shared': fields.get('Shared_Clean', 0) + fields.get('Shared_Dirty', 0),
+    }
+
+
+def worker_pids(master_pid: int) -> List[int]:
+    pids = []
+    for entry in os.listdir('/proc'):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f'/proc/{entry}/stat') as f:
+                # The command name may contain spaces; ppid follows the closing paren
+                ppid = int(f.read().rsplit(')', 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        if ppid == master_pid:
+            pids.append(int(entry))
+    return sorted(pids)
+
+
+def report(master_pid: int, label: str) -> Dict[str, int]:
+    rows = [('master', master_pid, memory(master_pid))]
+    rows += [(f'worker {i}', pid, memory(pid)) for i, pid in enumerate(worker_pids(master_pid))]
+
+    print(f'\n{label}')
+    print(f"{'process':10s} {'pid':>8s} {'RSS MB':>9s} {'PSS MB':>9s} {'USS MB':>9s} {'shared MB':>10s}")
+    for name, pid, mem in rows:
+        print(f"{name:10s} {pid:8d} {mem['rss'] / 1024:9.1f} {mem['pss'] / 1024:9.1f} "
+              f"{mem['uss'] / 1024:9.1f} {mem['shared'] / 1024:10.1f}")
+
+    workers = [mem for name, _, mem in rows if name != 'master']
+    totals = {
+        'workers': len(workers),
+        'mean_worker_uss': sum(m['uss'] for m in workers) // max(len(workers), 1),
+        'total_pss': sum(mem['pss'] for _, _, mem in rows),
+    }
+    print(f"mean worker USS {totals['mean_worker_uss'] / 1024:.1f} MB, "
+          f"total PSS {totals['total_pss'] / 1024:.1f} MB")
+    return totals
+
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_until_ready(port: int, workers: int, timeout: float):
+    """Poll /ready/ until enough consecutive 200s that every worker has likely answered."""
+    deadline = time.monotonic() + timeout
+    streak = 0
+    while streak < workers * 3:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f'Server on port {port} was not ready after {timeout:.0f}s')
+        try:
+            with urllib.request.urlopen(f'http://127.0.0.1:{port}/ready/', timeout=5) as response:
+                streak = streak + 1 if response.status == 200 else 0
+        except (urllib.error.URLError, ConnectionError, socket.timeout):
+            streak = 0
+            time.sleep(0.5)
+
+
+def run_server(preload: bool, workers: int, timeout: float) -> Dict[str, int]:
+    port = free_port()
+    env = dict(os.environ, MATCHER_PRELOAD=str(preload), MATCHER_WARMUP='True',
+               GUNICORN_BIND=f'127.0.0.1:{port}', GUNICORN_WORKERS=str(workers))
+    server = subprocess.Popen([sys.executable, '-m', 'gunicorn', 'devconnect.wsgi', '-c', 'gunicorn.conf.py'],
+                              env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    try:
+        wait_until_ready(port, workers, timeout)
+        time.sleep(2)
+        return report(server.pid, f"MATCHER_PRELOAD={'true' if preload else 'false'} ({workers} workers)")
+    finally:
+        server.send_signal(signal.SIGTERM)
+        server.wait(timeout=30)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pid', type=int, help='Master pid of a running gunicorn')
+    parser.add_argument('--compare', action='store_true', help='Launch gunicorn without and with preloading')
+    parser.add_argument('--workers', type=int, default=4)
+    parser.add_argument('--timeout', type=float, default=300, help='Seconds to wait for warm-up')
+    args = parser.parse_args()
+
+    if args.pid:
+        report(args.pid, f'gunicorn master {args.pid}')
+    elif args.compare:
+        before = run_server(False, args.workers, args.timeout)
+        after = run_server(True, args.workers, args.timeout)
+        saved = before['mean_worker_uss'] - after['mean_worker_uss']
+        print(f"\nPer-worker USS: {before['mean_worker_uss'] / 1024:.1f} MB -> "
+              f"{after['mean_worker_uss'] / 1024:.1f} MB ({saved / 1024:.1f} MB saved per worker)")
+        print(f"Total PSS: {before['total_pss'] / 1024:.1f} MB -> {after['total_pss'] / 1024:.1f} MB")
+    else:
+        parser.error('pass --pid or --compare')
+
+
+if __name__ == '__main__':
+    main()